@@ -6,12 +6,14 @@ import logging
 import random
 import re
 import urllib.request
-from time import sleep
+from datetime import timedelta
+from time import perf_counter, sleep
 
 import nextcord
 import requests
 from nextcord import (
     Emoji,
+    HTTPException,
     Interaction,
     Member,
     Message,
@@ -24,7 +26,6 @@ from nextcord import (
 )
 from nextcord.ext.commands import Bot, Cog
 from nextcord.ui import StringSelect, View, select
-from PIL import Image
 
 from domain import (
     ID,
@@ -35,9 +36,18 @@ from domain import (
     Standby,
     ValidTextChannel,
 )
+from postgres.setup import POOL_CONFIG
+from utils import profiler
 from utils import util_functions as uf
+from utils.guild_config import SETTINGS, guild_config
+from utils.outbox import Priority, outbox
+from utils.purge import Purge, PurgeFilter, PurgeProgress
 
 logger = logging.getLogger(__name__)
+
+MAX_CLEAR = 1000
+DEFAULT_CLEAR_SCAN = 500
+MAX_CLEAR_SCAN = 10000
 french_map = {
     "getting-started": "commencer",
     "introductions": "présentations",
@@ -99,6 +109,138 @@ class Admin(Cog):
         logger.info("Pinging")
         await interaction.send("Ponguu!")
 
+    @slash_command(
+        description="Debugging tools",
+        default_member_permissions=Permissions.MODS_ONLY,
+    )
+    async def debug(self, interaction: Interaction) -> None:
+        """Command group for debugging the running bot."""
+
+    @debug.subcommand(description="Profile the bot for a number of seconds")
+    async def profile(
+        self,
+        interaction: Interaction,
+        seconds: int = SlashOption(
+            description="How long to profile for",
+            min_value=1,
+            max_value=profiler.MAX_DURATION,
+            default=10,
+        ),
+    ) -> None:
+        """Run a sampling profiler and send the results.
+
+        The results are sent as a file in the collapsed stack format,
+        which can be turned into a flame graph with tools like
+        speedscope or flamegraph.pl.
+
+        Args:
+            interaction (Interaction): Invoking interaction
+            seconds (int): Duration of the profile
+        """
+        await interaction.response.defer(ephemeral=True)
+        logger.info(f"Profiling for {seconds} seconds")
+        result = await profiler.profile(seconds)
+        samples = sum(result.samples.values())
+        await interaction.send(
+            f"Collected {samples} samples over {seconds} seconds.",
+            file=nextcord.File(
+                io.BytesIO(result.collapsed().encode()),
+                filename="profile.collapsed.txt",
+            ),
+            ephemeral=True,
+        )
+
+    @debug.subcommand(description="Show the state of the database pool")
+    async def pool(self, interaction: Interaction) -> None:
+        """Show database pool saturation and query round trip time.
+
+        Args:
+            interaction (Interaction): Invoking interaction
+        """
+        stats = self.standby.pg_pool.stats()
+        start = perf_counter()
+        await self.standby.pg_pool.fetchval("SELECT 1")
+        round_trip = (perf_counter() - start) * 1000
+        await interaction.send(
+            f"Connections: {stats.in_use} in use, {stats.idle} idle, "
+            f"{stats.max_size} max\n"
+            f"Waiting for a connection: {stats.waiting}"
+            f"{' (saturated)' if stats.saturated else ''}\n"
+            f"Round trip: {round_trip:.1f}ms\n"
+            f"Slow query threshold: {POOL_CONFIG.slow_query_threshold}s, "
+            f"command timeout: {POOL_CONFIG.command_timeout}s",
+            ephemeral=True,
+        )
+
+    @slash_command(
+        description="Settings of this server",
+        default_member_permissions=Permissions.MODS_ONLY,
+    )
+    async def config(self, interaction: Interaction) -> None:
+        """Command group for the settings of a guild."""
+
+    @config.subcommand(description="Show the settings of this server")
+    async def show(self, interaction: Interaction) -> None:
+        """List every setting of the guild with its current value.
+
+        Args:
+            interaction (Interaction): Invoking interaction
+        """
+        guild_id = interaction.guild.id
+        configured = guild_config.values.get(guild_id, {})
+        lines = []
+        for key, setting in SETTINGS.items():
+            if isinstance(setting, ID):
+                value = guild_config.get_id(guild_id, setting)
+            else:
+                value = guild_config.get_channel_name(guild_id, setting)
+            origin = "" if key in configured else " (default)"
+            lines.append(f"`{key}`: {value}{origin}")
+        await interaction.send("\n".join(lines), ephemeral=True)
+
+    @config.subcommand(description="Change a setting of this server")
+    async def set(
+        self,
+        interaction: Interaction,
+        setting: str = SlashOption(
+            description="The setting to change",
+            choices=list(SETTINGS),
+        ),
+        value: str = SlashOption(description="The new value"),
+    ) -> None:
+        """Store a setting for the guild.
+
+        Args:
+            interaction (Interaction): Invoking interaction
+            setting (str): Name of the setting
+            value (str): New value, which must be an ID for ID settings
+        """
+        if isinstance(SETTINGS[setting], ID) and not value.isdigit():
+            await interaction.send(f"`{setting}` must be an ID.", ephemeral=True)
+            return
+        logger.info(f"Setting {setting} of guild {interaction.guild.id} to {value}")
+        await guild_config.set(interaction.guild.id, SETTINGS[setting], value)
+        await interaction.send(f"Set `{setting}` to {value}.", ephemeral=True)
+
+    @config.subcommand(description="Return a setting of this server to its default")
+    async def reset(
+        self,
+        interaction: Interaction,
+        setting: str = SlashOption(
+            description="The setting to reset",
+            choices=list(SETTINGS),
+        ),
+    ) -> None:
+        """Remove the stored value of a setting for the guild.
+
+        Args:
+            interaction (Interaction): Invoking interaction
+            setting (str): Name of the setting
+        """
+        logger.info(f"Resetting {setting} of guild {interaction.guild.id}")
+        await guild_config.reset(interaction.guild.id, SETTINGS[setting])
+        await interaction.send(f"Reset `{setting}` to its default.", ephemeral=True)
+
     @slash_command(
         description="Sends a message through the bot to a chosen channel",
         default_member_permissions=Permissions.MODS_AND_GUIDES,
@@ -132,7 +274,12 @@ class Admin(Cog):
                 )
                 return
 
-        await channel.send(message, reference=reply_message)
+        await outbox.send(
+            channel,
+            message,
+            reference=reply_message,
+            priority=Priority.INTERACTION,
+        )
         await interaction.send(
             f"Message successfully sent in {channel.mention}.",
             ephemeral=True,
@@ -297,9 +444,13 @@ class Admin(Cog):
         ]
         await interaction.send("Punishment in progress", ephemeral=True)
         for ch in ch_list:
-            channel = uf.get_channel(ch)
+            channel = uf.get_channel(ch, interaction.guild)
             if channel:
-                ping = await channel.send(user.mention)
+                ping = await outbox.send(
+                    channel,
+                    user.mention,
+                    priority=Priority.INTERACTION,
+                )
                 await ping.delete()
                 await asyncio.sleep(2)
             else:
@@ -308,9 +459,13 @@ class Admin(Cog):
         await asyncio.sleep(45)
 
         for ch in ch_list:
-            channel = uf.get_channel(ch)
+            channel = uf.get_channel(ch, interaction.guild)
             if channel:
-                ping = await channel.send(user.mention)
+                ping = await outbox.send(
+                    channel,
+                    user.mention,
+                    priority=Priority.INTERACTION,
+                )
                 await ping.delete()
                 await asyncio.sleep(2)
             else:
@@ -392,44 +547,104 @@ class Admin(Cog):
         number: int = SlashOption(
             description="Number of messages to delete",
             min_value=1,
-            max_value=20,
+            max_value=MAX_CLEAR,
         ),
         user: Member = SlashOption(
             description="Only delete a certain user's messages",
             required=False,
         ),
+        pattern: str = SlashOption(
+            description="Only delete messages matching this regular expression",
+            required=False,
+        ),
+        newer_than: int = SlashOption(
+            description="Only delete messages sent in the last X minutes",
+            min_value=1,
+            required=False,
+        ),
+        older_than: int = SlashOption(
+            description="Only delete messages sent more than X minutes ago",
+            min_value=1,
+            required=False,
+        ),
+        scan: int = SlashOption(
+            description="Number of recent messages to look through",
+            min_value=1,
+            max_value=MAX_CLEAR_SCAN,
+            default=DEFAULT_CLEAR_SCAN,
+        ),
     ) -> None:
         """Clear the last messages in the channel.
 
+        Messages younger than 14 days are bulk deleted 100 at a time,
+        older ones are deleted one by one.
+
         Args:
             interaction (Interaction): Invoking interaction
-            number (int): Number of messages to delete (1-20)
+            number (int): Number of messages to delete
             user (Member, optional): Only delete message from
                 the provided user
+            pattern (str, optional): Only delete messages whose content
+                matches this regular expression
+            newer_than (int, optional): Only delete messages sent in
+                the last X minutes
+            older_than (int, optional): Only delete messages sent more
+                than X minutes ago
+            scan (int): Number of recent messages to look through
         """
-        deleted = 0
+        try:
+            compiled = re.compile(pattern, re.IGNORECASE) if pattern else None
+        except re.error:
+            await interaction.send("Invalid regular expression", ephemeral=True)
+            return
+
+        now = uf.utcnow()
         await interaction.send(
             f"Working (0/{number})... Do not dismiss this message",
             ephemeral=True,
         )
         response = await interaction.original_message()
 
-        async for msg in interaction.channel.history(limit=25):
-            if msg.id == response.id:
-                continue
-            if user == msg.author or user is None:
-                await msg.delete()
-                deleted += 1
-                if deleted == number:
-                    break
-                await interaction.edit_original_message(
-                    content=f"Working ({deleted}/{number})... "
-                    "Do not dismiss this message",
-                )
+        async def show_progress(progress: PurgeProgress) -> None:
+            if progress.finished:
+                return
+            await interaction.edit_original_message(
+                content=f"Working ({progress.deleted}/{number}, "
+                f"{progress.scanned} messages checked)... "
+                "Do not dismiss this message",
+            )
 
-        await interaction.edit_original_message(
-            content=f"✅ Deleted the last {deleted} messages! ✅",
+        purge = Purge(
+            interaction.channel,
+            PurgeFilter(
+                author_id=user.id if user else None,
+                pattern=compiled,
+                after=now - timedelta(minutes=newer_than) if newer_than else None,
+                before=now - timedelta(minutes=older_than) if older_than else None,
+                skip_ids={response.id},
+            ),
+            limit=number,
+            scan_limit=scan,
+            on_progress=show_progress,
         )
+        progress = await purge.run()
+
+        content = f"✅ Deleted the last {progress.deleted} messages! ✅"
+        if progress.failed:
+            content += f"\n{progress.failed} messages could not be deleted."
+        try:
+            await interaction.edit_original_message(content=content)
+        except HTTPException:
+            # Deleting many old messages can outlast the interaction
+            logger.info("Clear outlasted its interaction, reporting by DM")
+            try:
+                await outbox.send(
+                    interaction.user,
+                    f"In {interaction.channel.mention}: {content}",
+                    priority=Priority.INTERACTION,
+                )
+            except HTTPException:
+                logger.exception("Could not report the result of a clear")
 
     @slash_command(
         description="Move a post from one channel to another",
@@ -501,7 +716,7 @@ class Admin(Cog):
             interaction (Interaction): Invoking interaction
             channel (ValidTextChannel): Channel to post in
         """
-        maint = uf.get_channel(ChannelName.ERRORS)
+        maint = uf.get_channel(ChannelName.ERRORS, interaction.guild)
         if not maint:
             logger.error("Could not find maintenance channel")
             await interaction.send("Could not find maintenance channel", ephemeral=True)
@@ -509,7 +724,11 @@ class Admin(Cog):
 
         async for msg in maint.history(limit=6):
             if is_leave_message(msg):
-                await channel.send(embed=msg.embeds[0])
+                await outbox.send(
+                    channel,
+                    embed=msg.embeds[0],
+                    priority=Priority.INTERACTION,
+                )
                 await interaction.send("Obit sent", ephemeral=True)
                 return
 
@@ -545,9 +764,9 @@ class Admin(Cog):
             )
             return
 
-        jailed_role = uf.get_role("Jailed")
-        muted_role = uf.get_role("Muted")
-        jail_channel = uf.get_channel("jail")
+        jailed_role = uf.get_role("Jailed", interaction.guild)
+        muted_role = uf.get_role("Muted", interaction.guild)
+        jail_channel = uf.get_channel("jail", interaction.guild)
         if jailed_role and muted_role:
             await offender.add_roles(jailed_role, muted_role)
             if jail_channel:
@@ -559,10 +778,16 @@ class Admin(Cog):
                     "I'll take any stolen memes you have.",
                 ]
                 await interaction.send(URL.GITHUB_STATIC + "/images/stop.jpg")
-                await interaction.channel.send(random.choice(public_lines))
-                await jail_channel.send(
+                await outbox.send(
+                    interaction.channel,
+                    random.choice(public_lines),
+                    priority=Priority.INTERACTION,
+                )
+                await outbox.send(
+                    jail_channel,
                     f"Serve your time peaceably, {offender.mention}, "
                     "and pay your debt to the void.",
+                    priority=Priority.INTERACTION,
                 )
                 await interaction.send(
                     f"{offender.mention} has been jailed successfully",
@@ -592,8 +817,8 @@ class Admin(Cog):
             interaction (Interaction): Invoking interaction
             prisoner (Member): The user to release
         """
-        jailed_role = uf.get_role("Jailed")
-        muted_role = uf.get_role("Muted")
+        jailed_role = uf.get_role("Jailed", interaction.guild)
+        muted_role = uf.get_role("Muted", interaction.guild)
         if jailed_role and muted_role and jailed_role in prisoner.roles:
             await prisoner.remove_roles(jailed_role, muted_role)
             await interaction.send(
@@ -638,6 +863,8 @@ class Admin(Cog):
             )
             return
 
+        from PIL import Image  # noqa: PLC0415
+
         avatar_url = target.display_avatar.url if target.display_avatar else ""
         avatar = Image.open(requests.get(avatar_url, stream=True).raw)
         avatar = avatar.convert("RGBA")
@@ -735,7 +962,7 @@ class Admin(Cog):
         else:
             name = emoji
 
-        if not (old_emoji := uf.get_emoji(name)):
+        if not (old_emoji := uf.get_emoji(name, interaction.guild)):
             await interaction.send("Invalid emoji", ephemeral=True)
             return
 
@@ -831,7 +1058,7 @@ class Admin(Cog):
     async def frenchify(self, interaction: Interaction) -> None:
         """Give all (most) channels french names."""
         await interaction.response.defer()
-        for channel in self.standby.guild.channels:
+        for channel in interaction.guild.channels:
             if channel.name in french_map:
                 try:  # noqa: SIM105
                     await channel.edit(name=french_map[channel.name], reason="Apr 1st")
@@ -848,7 +1075,7 @@ class Admin(Cog):
         """Revert to regular channel names."""
         await interaction.response.defer()
         inverse_map = {v: k for k, v in french_map.items()}
-        for channel in self.standby.guild.channels:
+        for channel in interaction.guild.channels:
             if channel.name in inverse_map:
                 try:  # noqa: SIM105
                     await channel.edit(name=inverse_map[channel.name], reason="Apr 2nd")
@@ -888,7 +1115,7 @@ async def move_or_copy_message(
 
     embed = uf.message_embed(msg, cmd, interaction.user)
 
-    await to_channel.send(embed=embed)
+    await outbox.send(to_channel, embed=embed, priority=Priority.INTERACTION)
 
     if cmd == "move":
         await msg.delete()
@@ -970,7 +1197,7 @@ async def delete_emoji(interaction: Interaction, emoji_str: str) -> Emoji | None
         name = match.group(1)
     else:
         name = emoji_str
-    emoji = uf.get_emoji(name)
+    emoji = uf.get_emoji(name, interaction.guild)
     logger.info(f"Deleting emoji {name}")
 
     try:
@@ -1,6 +1,8 @@
 """Award features."""
 
+import asyncio
 import logging
+from collections import Counter
 from enum import StrEnum
 
 from nextcord import Embed, Interaction, Member, SlashOption, slash_command
@@ -12,6 +14,8 @@ from utils import util_functions as uf
 logger = logging.getLogger(__name__)
 standby = Standby()
 
+FLUSH_INTERVAL = 10
+
 
 class Award(StrEnum):
     """Enum for award types."""
@@ -30,10 +34,121 @@ class Award(StrEnum):
         """Awards that users may give to each other."""
         return [cls.THANKS, cls.SKULL]
 
+    @classmethod
+    def simple(cls) -> list["Award"]:
+        """Awards stored as plain counters in the simple_award table."""
+        return [cls.THANKS, cls.SKULL, cls.BRAIN]
+
+
+class AwardBuffer:
+    """Simple award increments waiting to be written to the database.
+
+    Bursts of awards, such as a trivia question answered by many users
+    at once, would otherwise each run their own upsert against the same
+    rows. Increments are instead added up in memory and written in a
+    single statement per flush. Reads add the increments that have not
+    been written yet, so counts are always exact.
+    """
+
+    def __init__(self) -> None:
+        """Initialize buffer."""
+        self.pending: Counter[tuple[int, int, Award]] = Counter()
+        self.flushing: Counter[tuple[int, int, Award]] = Counter()
+        self.lock = asyncio.Lock()
+
+    def add(self, guild_id: int, user_id: int, award: Award) -> None:
+        """Buffer an increment of a member's award count."""
+        if award not in Award.simple():
+            msg = f"{award} is not a simple award"
+            raise ValueError(msg)
+        self.pending[guild_id, user_id, award] += 1
+
+    def unwritten(self, guild_id: int, award: Award) -> Counter[int]:
+        """Get the increments of an award not yet in the database."""
+        counts: Counter[int] = Counter()
+        for buffer in (self.pending, self.flushing):
+            for (buffered_guild_id, user_id, buffered_award), amount in buffer.items():
+                if buffered_guild_id == guild_id and buffered_award == award:
+                    counts[user_id] += amount
+        return counts
+
+    async def flush(self) -> None:
+        """Write all buffered increments in a single upsert.
+
+        Increments stay visible to reads until the upsert completes, and
+        are put back into the buffer if it fails.
+        """
+        async with self.lock:
+            if not self.pending:
+                return
+            self.flushing, self.pending = self.pending, Counter()
+
+            members = sorted({key[:2] for key in self.flushing})
+            columns = [
+                [
+                    self.flushing[guild_id, user_id, award]
+                    for guild_id, user_id in members
+                ]
+                for award in Award.simple()
+            ]
+            try:
+                await standby.pg_pool.execute(
+                    f"""
+                    INSERT INTO
+                        {standby.schema}.simple_award (
+                            guild_id,
+                            user_id,
+                            thanks,
+                            skulls,
+                            brains
+                        )
+                    SELECT
+                        *
+                    FROM
+                        UNNEST(
+                            $1::BIGINT[],
+                            $2::BIGINT[],
+                            $3::INT[],
+                            $4::INT[],
+                            $5::INT[]
+                        )
+                    ON CONFLICT (guild_id, user_id) DO UPDATE
+                    SET
+                        thanks = COALESCE(simple_award.thanks, 0) + EXCLUDED.thanks,
+                        skulls = COALESCE(simple_award.skulls, 0) + EXCLUDED.skulls,
+                        brains = COALESCE(simple_award.brains, 0) + EXCLUDED.brains
+                    """,
+                    [guild_id for guild_id, _ in members],
+                    [user_id for _, user_id in members],
+                    *columns,
+                )
+            except Exception:
+                self.pending.update(self.flushing)
+                raise
+            finally:
+                self.flushing = Counter()
+            logger.debug(f"Wrote award increments for {len(members)} members")
+
+
+award_buffer = AwardBuffer()
+
 
 class Awards(Cog):
     def __init__(self) -> None:
         self.standby = Standby()
+        self.flush_awards.start()
+        self.standby.bot.shutdown_hooks.append(award_buffer.flush)
+
+    @uf.delayed_loop(seconds=FLUSH_INTERVAL, leader_only=False)
+    async def flush_awards(self) -> None:
+        """Periodically write buffered award increments.
+
+        Failed writes are retried on the next iteration.
+        """
+        try:
+            await award_buffer.flush()
+        except Exception:
+            logger.exception("Could not write award increments")
 
     @slash_command()
     async def award(self, interaction: Interaction) -> None:
@@ -89,7 +204,7 @@ class Awards(Cog):
         ),
     ) -> None:
         """Reply with a leaderboard for the requested award."""
-        stats = await get_all_award_counts(award)
+        stats = await get_all_award_counts(interaction.guild_id, award)
         embed = create_leaderboard_embed(award, stats, interaction.user.id)
         await interaction.send(embed=embed)
 
@@ -140,25 +255,33 @@ def create_leaderboard_embed(
     return embed
 
 
-async def get_all_award_counts(award: Award) -> dict[int, int]:
-    """Get dict of user IDs and award counts."""
-    records = await standby.pg_pool.fetch(f"""
+async def get_all_award_counts(guild_id: int, award: Award) -> dict[int, int]:
+    """Get dict of user IDs and award counts in a guild."""
+    records = await standby.pg_pool.fetch(
+        f"""
         SELECT
             user_id, {award}
         FROM
             {standby.schema}.award
+        WHERE
+            guild_id = $1
         ORDER BY
             {award} DESC
-        """)
+        """,
+        guild_id,
+    )
 
     out = {record["user_id"]: record[award] or 0 for record in records}
+    if award in Award.simple():
+        for user_id, amount in award_buffer.unwritten(guild_id, award).items():
+            out[user_id] = out.get(user_id, 0) + amount
     out = {k: out[k] for k in sorted(out, key=out.get, reverse=True)}
     return out
 
 
 async def get_award_count(user: Member, award: Award) -> int:
-    """Check award count for a user and award type."""
-    counts = await get_all_award_counts(award)
+    """Check award count for a member and award type."""
+    counts = await get_all_award_counts(user.guild.id, award)
     return counts.get(user.id, 0)
 
 
@@ -175,7 +298,7 @@ async def give_award(
     if award == Award.SKULL and giver.id != ID.JORM:
         await channel.send(
             file=uf.simpsons_error_image(
-                dad=Standby().guild.me,
+                dad=giver.guild.me,
                 son=giver,
                 text="You're not Jorm!",
                 filename="jormonly.png",
@@ -202,18 +325,12 @@ async def give_award(
 
 
 async def increment_award_count(user: Member, award: Award) -> None:
-    """Increase award count for a user."""
-    await standby.pg_pool.execute(f"""
-        INSERT INTO
-            {standby.schema}.simple_award (user_id, {award})
-        VALUES
-            ({user.id}, 1)
-        ON CONFLICT ON CONSTRAINT award_pkey DO UPDATE
-        SET
-            {award} = simple_award.{award} + 1
-        WHERE
-            simple_award.user_id = {user.id}
-        """)
+    """Increase award count for a member.
+
+    Only simple awards are counted here, the rest are derived from
+    other tables.
+    """
+    award_buffer.add(user.guild.id, user.id, award)
 
 
 def setup(bot: Bot) -> None:
@@ -1,143 +1,201 @@
 """Play Bingo in a channel (legacy)."""
 
 import asyncio
+import logging
 import random
 from typing import Literal
 
-from nextcord import Interaction, Member, SlashOption, slash_command
+from nextcord import HTTPException, Interaction, Member, SlashOption, slash_command
 from nextcord.ext.commands import Bot, Cog
 
 from domain import Standby, ValidTextChannel
 from utils import util_functions as uf
+from utils.outbox import outbox
+from utils.sessions import SessionManager
+
+logger = logging.getLogger(__name__)
+
+
+GRID_SIZE = 5
+FREE_CELL = 2 * GRID_SIZE + 2
+DM_CONCURRENCY = 5
+
+
+def line_mask(cells: list[tuple[int, int]]) -> int:
+    """Get the bitmask covering a list of (row, column) cells."""
+    mask = 0
+    for row, col in cells:
+        mask |= 1 << (row * GRID_SIZE + col)
+    return mask
+
+
+WIN_MASKS = (
+    *(line_mask([(row, col) for col in range(GRID_SIZE)]) for row in range(GRID_SIZE)),
+    *(line_mask([(row, col) for row in range(GRID_SIZE)]) for col in range(GRID_SIZE)),
+    line_mask([(i, i) for i in range(GRID_SIZE)]),
+    line_mask([(i, GRID_SIZE - 1 - i) for i in range(GRID_SIZE)]),
+)
+dm_semaphore = asyncio.Semaphore(DM_CONCURRENCY)
 
 
 class BingoCard:
+    """Bingo card stored as a 25-bit mask of marked cells.
+
+    Bit row * 5 + col is set once that cell has been marked. Column n
+    holds numbers from 15n + 1 to 15n + 15, and the free center cell
+    starts out marked.
+    """
+
+    __slots__ = ("marked", "numbers", "positions")
+
     def __init__(self) -> None:
-        self.grid = [random.sample(range(i, i + 15), 5) for i in range(1, 76, 15)]
-        self.grid[2][2] = "Free"
+        """Initialize card."""
+        columns = [random.sample(range(i, i + 15), 5) for i in range(1, 76, 15)]
+        self.numbers = [
+            columns[col][row] for row in range(GRID_SIZE) for col in range(GRID_SIZE)
+        ]
+        self.positions = {
+            number: cell
+            for cell, number in enumerate(self.numbers)
+            if cell != FREE_CELL
+        }
+        self.marked = 1 << FREE_CELL
 
     def __str__(self) -> str:
         """Human readable representation of the bingo numbers."""
         printout = "```\n" + 16 * "_" + "\n\n"
-        for i in range(5):
-            for j in range(5):
+        for i in range(GRID_SIZE):
+            for j in range(GRID_SIZE):
+                cell = i * GRID_SIZE + j
+                if cell == FREE_CELL:
+                    text = "Free"
+                elif self.marked >> cell & 1:
+                    text = " X"
+                else:
+                    text = str(self.numbers[cell]).zfill(2)
                 if i == 2 or j != 2:  # noqa: PLR2004
-                    printout += str(self.grid[j][i]).zfill(2) + " "
+                    printout += text + " "
                 else:
-                    printout += " " + str(self.grid[j][i]).zfill(2) + "  "
+                    printout += " " + text + "  "
             printout += "\n" + 16 * "_" + "\n\n"
         printout += "```"
         return printout
 
     def mark(self, number: int) -> Literal["Hit", "Miss"]:
         """Mark off a number on the card."""
-        col = int((number - 1) / 15)
-        if number in self.grid[col]:
-            res = "Hit"
-            self.grid[col][self.grid[col].index(number)] = " X"
-        else:
-            res = "Miss"
-        return res
+        cell = self.positions.get(number)
+        if cell is None:
+            return "Miss"
+        self.marked |= 1 << cell
+        return "Hit"
 
     def check(self) -> bool:
         """Check whether the card has Bingo."""
-        patterns = []
-        for i in range(5):
-            row = []
-            col = []
-            for j in range(5):
-                col.append((i, j))
-                row.append((j, i))
-            patterns.append(row)
-            patterns.append(col)
-        diag1 = [(i, i) for i in range(5)]
-        diag2 = [(i, 4 - i) for i in range(5)]
-        patterns.append(diag1)
-        patterns.append(diag2)
-
-        for pattern in patterns:
-            bingo = True
-            for coords in pattern:
-                if isinstance(self.grid[coords[0]][coords[1]], int):
-                    bingo = False
-                    break
-            if bingo:
-                return True
-        return False
+        return any(self.marked & mask == mask for mask in WIN_MASKS)
 
 
 class BingoGame:
+    __slots__ = (
+        "autodraw",
+        "cards",
+        "channel",
+        "draws",
+        "host_id",
+        "messages",
+        "players",
+        "status",
+        "winners",
+    )
+
     def __init__(self) -> None:
-        self.status = "Inactive"
+        self.status = "Lobby open"
         self.players = []
         self.cards = {}
         self.messages = {}
         self.winners = []
-        self.lock = asyncio.Lock()
         self.autodraw = False
-        self.host = None
+        self.host_id = None
         self.channel = None
         self.draws = []
 
     def setup(self, host: Member, channel: ValidTextChannel) -> None:
         """Setup the lobby."""
-        self.status = "Lobby open"
-        self.host = host
+        self.host_id = host.id
         self.channel = channel
 
+    def can_manage(self, user: Member) -> bool:
+        """Check whether a user may start, stop and draw in the game."""
+        return (
+            user.id == self.host_id
+            or uf.get_role("Moderator", user.guild) in user.roles
+            or uf.get_role("Guides of the Void", user.guild) in user.roles
+        )
+
     async def draw(self) -> None:
         """Draw a number for this card."""
         if len(self.draws) == 0:
-            await self.channel.send(
+            await outbox.send(
+                self.channel,
                 "All numbers have been drawn - please check your cards.",
             )
             self.autodraw = False
         else:
             num = self.draws.pop()
-            await self.channel.send(f"The number {num} has been drawn.")
-            for player in self.players:
-                result = self.cards[player].mark(num)
-                if result == "Hit":
-                    await player.send(f"{num} is a hit! Your card has been updated.")
-                    await self.messages[player].edit(content=self.cards[player])
+            await outbox.send(self.channel, f"The number {num} has been drawn.")
+            hits = [
+                player
+                for player in self.players
+                if self.cards[player.id].mark(num) == "Hit"
+            ]
+            await asyncio.gather(
+                *(self.notify_hit(player, num) for player in hits),
+            )
+
+    async def notify_hit(self, player: Member, num: int) -> None:
+        """Tell a player about a hit and update their card."""
+        async with dm_semaphore:
+            try:
+                await outbox.send(
+                    player,
+                    f"{num} is a hit! Your card has been updated.",
+                )
+                await self.messages[player.id].edit(content=self.cards[player.id])
+            except HTTPException:
+                logger.exception(f"Could not update bingo card for {player}")
+
+    async def deal(self, player: Member) -> None:
+        """Send a player their card."""
+        async with dm_semaphore:
+            await outbox.send(player, "Welcome to Void Bingo! Here is your card.")
+            self.messages[player.id] = await outbox.send(player, self.cards[player.id])
 
     async def start(self) -> None:
         """Start the game."""
         for player in self.players:
-            self.cards[player] = BingoCard()
-            await player.send("Welcome to Void Bingo! Here is your card.")
-            msg = await player.send(self.cards[player])
-            self.messages[player] = msg
+            self.cards[player.id] = BingoCard()
+        await asyncio.gather(*(self.deal(player) for player in self.players))
         self.status = "Active"
         self.draws = list(range(1, 76))
-        random.shuffle(game.draws)
-
-    async def bingo(self, winner: Member) -> None:
-        """Declare a winner."""
-        await self.lock.acquire()
-        if len(self.winners) == 0:
-            self.winners.append(winner.mention)
-            self.lock.release()
-            await self.channel.send(
-                "Check your cards one last time - the game will finish in 30 seconds.",
-            )
-            await asyncio.sleep(15)
-            await self.channel.send("15 seconds remaining.")
-            await asyncio.sleep(15)
-            await self.channel.send("The game has finished!")
-            if len(self.winners) == 1:
-                await self.channel.send(f"The winner is {self.winners[0]}.")
-            else:
-                await self.channel.send(
-                    f"The winners are {', '.join(self.winners[:-1])} "
-                    f"and {self.winners[-1]}",
-                )
+        random.shuffle(self.draws)
+
+    async def finish(self) -> None:
+        """Count down and announce the winners."""
+        await outbox.send(
+            self.channel,
+            "Check your cards one last time - the game will finish in 30 seconds.",
+        )
+        await asyncio.sleep(15)
+        await outbox.send(self.channel, "15 seconds remaining.")
+        await asyncio.sleep(15)
+        await outbox.send(self.channel, "The game has finished!")
+        if len(self.winners) == 1:
+            await outbox.send(self.channel, f"The winner is {self.winners[0]}.")
         else:
-            self.winners.append(winner.mention)
-            self.lock.release()
-
-
-game = BingoGame()
+            await outbox.send(
+                self.channel,
+                f"The winners are {', '.join(self.winners[:-1])} "
+                f"and {self.winners[-1]}",
+            )
 
 
 class Bingo(
@@ -148,26 +206,30 @@ class Bingo(
 ):
     def __init__(self) -> None:
         self.standby = Standby()
+        self.games = SessionManager(BingoGame)
 
     async def create(self, interaction: Interaction) -> None:
         """Create the lobby."""
-        if game.status == "Lobby open":
+        game = self.games.get(interaction.channel.id)
+        if game is None:
+            game = self.games.create(interaction.channel.id)
+            game.setup(host=interaction.user, channel=interaction.channel)
+            await interaction.send("Lobby created, use `/bingo` to join.")
+        elif game.status == "Lobby open":
             await interaction.send(
                 "A lobby is already open, use `/bingo` to join.",
                 ephemeral=True,
             )
-        elif game.status == "Active":
+        else:
             await interaction.send(
                 "A game is already running, please wait for the next one.",
                 ephemeral=True,
             )
-        else:
-            game.setup(host=interaction.user, channel=interaction.channel)
-            await interaction.send("Lobby created, use `/bingo` to join.")
 
     async def join(self, interaction: Interaction) -> None:
         """Join the game."""
-        if game.status == "Inactive":
+        game = self.games.get(interaction.channel.id)
+        if game is None:
             await interaction.send(
                 "No open lobby found - use `/bingo` to create one.",
                 ephemeral=True,
@@ -177,11 +239,6 @@ class Bingo(
                 "A game is already running, please wait for the next one.",
                 ephemeral=True,
             )
-        elif game.channel != interaction.channel:
-            await interaction.send(
-                f"Please head over to {game.channel.mention} to join the lobby.",
-                ephemeral=True,
-            )
         elif interaction.user in game.players:
             await interaction.send("You're already in this lobby.", ephemeral=True)
         else:
@@ -194,7 +251,8 @@ class Bingo(
 
     async def start(self, interaction: Interaction) -> None:
         """Start a game instance."""
-        if game.status == "Inactive":
+        game = self.games.get(interaction.channel.id)
+        if game is None:
             await interaction.send(
                 "No open lobby found - use `/bingo` to create one.",
                 ephemeral=True,
@@ -204,20 +262,11 @@ class Bingo(
                 "A game is already running, please wait for the next one.",
                 ephemeral=True,
             )
-        elif (
-            game.host != interaction.user
-            and (uf.get_role("Moderator") not in interaction.user.roles)
-            and (uf.get_role("Guides of the Void") not in interaction.user.roles)
-        ):
+        elif not game.can_manage(interaction.user):
             await interaction.send(
                 "Only the person who created the lobby can start the game.",
                 ephemeral=True,
             )
-        elif game.channel != interaction.channel:
-            await interaction.send(
-                f"Please head over to {game.channel.mention} to start the game.",
-                ephemeral=True,
-            )
         elif len(game.players) == 0:
             await interaction.send("The lobby is empty, use `/bingo` to join.")
         else:
@@ -229,15 +278,10 @@ class Bingo(
 
     async def stop(self, interaction: Interaction) -> None:
         """Abort a running game."""
-        global game  # noqa: PLW0603
-
-        if game.status != "Active":
+        game = self.games.get(interaction.channel.id)
+        if game is None or game.status != "Active":
             await interaction.send("No active game found.", ephemeral=True)
-        elif (
-            game.host != interaction.user
-            and (uf.get_role("Moderator") not in interaction.user.roles)
-            and (uf.get_role("Guides of the Void") not in interaction.user.roles)
-        ):
+        elif not game.can_manage(interaction.user):
             await interaction.send(
                 "Only the person who started the game can stop it.",
                 ephemeral=True,
@@ -249,28 +293,23 @@ class Bingo(
                 ephemeral=True,
             )
         else:
-            game = BingoGame()
+            game.autodraw = False
+            self.games.end(interaction.channel.id)
             await interaction.send("Game stopped. Use `/bingo` to start a new one")
 
-    async def draw(self, interaction: Interaction) -> None:
-        """Draw a number."""
-        if game.status != "Active":
+    async def check_drawable(
+        self,
+        interaction: Interaction,
+        game: BingoGame | None,
+    ) -> bool:
+        """Check whether a user may draw a number, explaining if not."""
+        if game is None or game.status != "Active":
             await interaction.send("No active game found.", ephemeral=True)
-        elif (
-            interaction.user != game.host
-            and (uf.get_role("Moderator") not in interaction.user.roles)
-            and (uf.get_role("Guides of the Void") not in interaction.user.roles)
-        ):
+        elif not game.can_manage(interaction.user):
             await interaction.send(
                 "Only the person who started the game can draw numbers.",
                 ephemeral=True,
             )
-        elif game.channel != interaction.channel:
-            await interaction.send(
-                f"Numbers may only be drawn in the current game's channel, "
-                f"please head over to {game.channel.mention}.",
-                ephemeral=True,
-            )
         elif len(game.winners) > 0:
             await interaction.send(
                 "One or more players have Bingo, no more numbers may be drawn.",
@@ -281,66 +320,72 @@ class Bingo(
                 "All numbers have already been drawn - please check your cards.",
             )
         else:
+            return True
+        return False
+
+    async def draw(self, interaction: Interaction) -> None:
+        """Draw a number."""
+        game = self.games.get(interaction.channel.id)
+        if await self.check_drawable(interaction, game):
             await game.draw()
 
     async def autodraw(self, interaction: Interaction) -> None:
         """Start autodrawing numbers."""
-        if game.status != "Active":
-            await interaction.send("No active game found.", ephemeral=True)
-        elif (
-            interaction.user != game.host
-            and (uf.get_role("Moderator") not in interaction.user.roles)
-            and (uf.get_role("Guides of the Void") not in interaction.user.roles)
-        ):
-            await interaction.send(
-                "Only the person who started the game can draw numbers.",
-                ephemeral=True,
-            )
-        elif game.channel != interaction.channel:
-            await interaction.send(
-                f"Numbers may only be drawn in the current game's channel, "
-                f"please head over to {game.channel.mention}.",
-                ephemeral=True,
-            )
-        elif len(game.winners) > 0:
-            await interaction.send(
-                "One or more players have Bingo, no more numbers may be drawn.",
-                ephemeral=True,
-            )
-        elif len(game.draws) == 0:
-            await interaction.send(
-                "All numbers have already been drawn - please check your cards.",
-            )
-        else:
+        channel_id = interaction.channel.id
+        async with self.games.lock(channel_id):
+            game = self.games.get(channel_id)
+            if not await self.check_drawable(interaction, game):
+                return
             game.autodraw = not game.autodraw
             if game.autodraw:
                 await interaction.send("Automatic drawing started.")
             else:
                 await interaction.send("Automatic drawing stopped.")
-            while game.autodraw:
+                return
+
+        while game.autodraw and self.games.get(channel_id) is game:
+            async with self.games.lock(channel_id):
+                if game.winners:
+                    break
                 await game.draw()
-                await asyncio.sleep(15)
+            await asyncio.sleep(15)
 
     async def declare(self, interaction: Interaction) -> None:
         """Declare Bingo."""
-        global game  # noqa: PLW0603
+        channel_id = interaction.channel.id
+        async with self.games.lock(channel_id):
+            game = self.games.get(channel_id)
+            if (
+                game is None
+                or game.status != "Active"
+                or interaction.user not in game.players
+            ):
+                await interaction.send(
+                    "You are not currently in a game in this channel.",
+                    ephemeral=True,
+                )
+                return
+            if not game.cards[interaction.user.id].check():
+                await interaction.send(
+                    "You don't have Void Bingo - check your card again.",
+                    ephemeral=True,
+                )
+                return
+            if interaction.user.mention in game.winners:
+                await interaction.send(
+                    "You have already declared Void Bingo.",
+                    ephemeral=True,
+                )
+                return
 
-        if game.status != "Active" or interaction.user not in game.players:
-            await interaction.send("You are not currently in a game.", ephemeral=True)
-        elif not game.cards[interaction.user].check():
-            await interaction.send(
-                "You don't have Void Bingo - check your card again.",
-                ephemeral=True,
-            )
-        elif interaction.user.mention in game.winners:
-            await interaction.send(
-                "You have already declared Void Bingo.",
-                ephemeral=True,
-            )
-        else:
             await interaction.send("VOID BINGO!")
-            await game.bingo(winner=interaction.user)
-            game = BingoGame()
+            game.winners.append(interaction.user.mention)
+            if len(game.winners) > 1:
+                return
+            game.autodraw = False
+
+        await game.finish()
+        self.games.end(channel_id)
 
     @slash_command(description="Play Void Bingo")
     async def bingo(
@@ -376,7 +421,12 @@ class Bingo(
             "declare": self.declare,
         }
         cmd = cmd_dict[action]
-        await cmd(interaction)
+        if action in {"autodraw", "declare"}:
+            # These manage the lock themselves since they keep running
+            await cmd(interaction)
+            return
+        async with self.games.lock(interaction.channel.id):
+            await cmd(interaction)
 
 
 def setup(bot: Bot) -> None:
@@ -4,11 +4,13 @@ import logging
 from datetime import date, datetime
 
 from asyncpg.exceptions import UniqueViolationError
-from nextcord import Interaction, Member, SlashOption, slash_command
+from nextcord import Guild, Interaction, Member, Role, SlashOption, slash_command
 from nextcord.ext.commands import Bot, Cog
 
 from domain import RoleName, SQLResult, Standby
 from utils import util_functions as uf
+from utils.outbox import Priority, outbox
+from utils.resolver import resolver
 
 logger = logging.getLogger(__name__)
 
@@ -113,7 +115,8 @@ class Birthdays(Cog):
     async def check_bdays(self) -> None:
         """Loop that checks whether it is any user's birthday.
 
-        Triggers once a day between 8 and 9 AM (bot time)
+        Triggers once a day between 8 and 9 AM (bot time), in every
+        guild that has a birthday role.
         """
         now = uf.now()
 
@@ -121,35 +124,49 @@ class Birthdays(Cog):
             return
 
         logger.debug("Checking birthdays")
-        birthday_role = uf.get_role(RoleName.BIRTHDAY)
+        for guild in self.standby.bot.guilds:
+            birthday_role = uf.get_role(RoleName.BIRTHDAY, guild)
+            if birthday_role is not None:
+                await congratulate(guild, birthday_role)
 
-        async for member in self.standby.guild.fetch_members():
-            if birthday_role in member.roles:
-                await member.remove_roles(birthday_role)
 
-        birthday_haver_ids = await get_birthday_havers()
+async def congratulate(guild: Guild, birthday_role: Role) -> None:
+    """Give today's birthday havers in a guild the birthday role."""
+    await resolver.chunk(guild)
 
-        if not birthday_haver_ids:
-            logger.info("No birthdays today")
-            return
+    for member in birthday_role.members:
+        await member.remove_roles(birthday_role)
 
-        mentions = []
-        for user_id in birthday_haver_ids:
-            member = await self.standby.guild.fetch_member(user_id)
+    birthday_haver_ids = await get_birthday_havers(guild.id)
 
-            logger.info(f"Adding birthday role to {member}")
-            await member.add_roles(birthday_role)
+    if not birthday_haver_ids:
+        logger.info(f"No birthdays today in {guild}")
+        return
 
-            mentions.append(member.mention)
+    members = await resolver.members(birthday_haver_ids, guild)
+    mentions = []
+    for member in members.values():
+        logger.info(f"Adding birthday role to {member}")
+        await member.add_roles(birthday_role)
 
-        if len(mentions) > 1:
-            congrats = ", ".join(mentions[:-1]) + " and " + str(mentions[-1])
-        else:
-            congrats = mentions[0]
+        mentions.append(member.mention)
+
+    if not mentions:
+        logger.info(f"No birthday havers are in {guild}")
+        return
+
+    if len(mentions) > 1:
+        congrats = ", ".join(mentions[:-1]) + " and " + str(mentions[-1])
+    else:
+        congrats = mentions[0]
 
-        general = uf.get_channel("general")
-        await general.send("🎂🎂🎂")
-        await general.send(f"Happy Birthday {congrats}!")
+    general = uf.get_channel("general", guild)
+    await outbox.send(general, "🎂🎂🎂", priority=Priority.BACKGROUND)
+    await outbox.send(
+        general,
+        f"Happy Birthday {congrats}!",
+        priority=Priority.BACKGROUND,
+    )
 
 
 async def set_user_birthday(user: Member, birthday: date) -> SQLResult:
@@ -159,9 +176,9 @@ async def set_user_birthday(user: Member, birthday: date) -> SQLResult:
     try:
         await pg_pool.execute(f"""
             INSERT INTO
-                {schema}.birthday (user_id, birth_date)
+                {schema}.birthday (guild_id, user_id, birth_date)
             VALUES
-                ({user.id}, '{birthday}')
+                ({user.guild.id}, {user.id}, '{birthday}')
             """)
         return SQLResult.INSERT
     except UniqueViolationError:
@@ -170,7 +187,8 @@ async def set_user_birthday(user: Member, birthday: date) -> SQLResult:
             SET
                 birth_date = '{birthday}'
             WHERE
-                user_id = {user.id}
+                guild_id = {user.guild.id}
+                AND user_id = {user.id}
             """)
         return SQLResult.UPDATE
     except Exception:
@@ -184,7 +202,8 @@ async def remove_user_birthday(user: Member) -> SQLResult:
     status = await pg_pool.execute(f"""
         DELETE FROM {schema}.birthday
         WHERE
-            user_id = {user.id}
+            guild_id = {user.guild.id}
+            AND user_id = {user.id}
         """)
     if status == "DELETE 0":
         return SQLResult.NONE
@@ -201,15 +220,16 @@ async def get_user_birthday(user: Member) -> datetime | None:
         FROM
             {schema}.birthday
         WHERE
-            user_id = {user.id}
+            guild_id = {user.guild.id}
+            AND user_id = {user.id}
         """)
     if record:
         return record["birth_date"]
     return None
 
 
-async def get_birthday_havers() -> list[int]:
-    """Get today's birthday havers."""
+async def get_birthday_havers(guild_id: int) -> list[int]:
+    """Get today's birthday havers in a guild."""
     pg_pool = Standby().pg_pool
     schema = Standby().schema
     today_2000 = datetime.today().date().replace(year=2000)
@@ -219,7 +239,8 @@ async def get_birthday_havers() -> list[int]:
         FROM
             {schema}.birthday
         WHERE
-            birth_date = '{today_2000}'
+            guild_id = {guild_id}
+            AND birth_date = '{today_2000}'
         """)
     if records:
         return [record["user_id"] for record in records]
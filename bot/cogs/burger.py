@@ -7,8 +7,10 @@ from random import randint
 
 from nextcord import (
     ButtonStyle,
+    Guild,
     Interaction,
     Member,
+    Role,
     SlashOption,
     slash_command,
     user_command,
@@ -17,12 +19,13 @@ from nextcord.ext.commands import Bot, Cog
 from nextcord.ui import Button
 
 from domain import (
-    ID,
     URL,
     RoleName,
     Standby,
 )
 from utils import util_functions as uf
+from utils.outbox import Priority, outbox
+from utils.resolver import resolver
 
 logger = logging.getLogger(__name__)
 
@@ -44,7 +47,10 @@ class Burger(Cog):
         """Burger another user."""
         user = interaction.user
         logger.info(f"{user} is attempting to burger {target}")
-        burgered = uf.get_role("Burgered") or interaction.guild.create_role("Burgered")
+        burgered = uf.get_role("Burgered", interaction.guild)
+        if burgered is None:
+            burgered = await interaction.guild.create_role(name="Burgered")
+        await resolver.chunk(interaction.guild)
 
         if user not in burgered.members:
             if burgered.members:
@@ -55,7 +61,7 @@ class Burger(Cog):
                 )
                 return
 
-            general = uf.get_channel("general")
+            general = uf.get_channel("general", interaction.guild)
             await interaction.send(
                 "The burger is currently free for the taking - to burger others, you "
                 f"must first claim it by answering the question in {general.mention}.",
@@ -66,7 +72,11 @@ class Burger(Cog):
         if target == interaction.user:
             if randint(1, 2) == 1:
                 await interaction.send("You can't burger yourself!")
-                await interaction.channel.send(URL.GITHUB_STATIC + "/images/obama.jpg")
+                await outbox.send(
+                    interaction.channel,
+                    URL.GITHUB_STATIC + "/images/obama.jpg",
+                    priority=Priority.INTERACTION,
+                )
             else:
                 await interaction.send(
                     file=uf.simpsons_error_image(
@@ -91,8 +101,10 @@ class Burger(Cog):
         await target.add_roles(burgered)
 
         await interaction.response.send_message(target.mention)
-        await interaction.channel.send(
+        await outbox.send(
+            interaction.channel,
             URL.GITHUB_STATIC + "/images/burgered.png",
+            priority=Priority.INTERACTION,
         )
 
     @user_command(name="Burger")
@@ -105,9 +117,10 @@ class Burger(Cog):
         """Yoink the burger. Limited to one yoink per month."""
         logger.info(f"{interaction.user} is attempting to yoink the burger")
 
-        burgered_role = uf.get_role("Burgered")
+        burgered_role = uf.get_role("Burgered", interaction.guild)
+        await resolver.chunk(interaction.guild)
         if not burgered_role.members:
-            general = uf.get_channel("general")
+            general = uf.get_channel("general", interaction.guild)
             await interaction.send(
                 "The burger is currently free for the taking - to burger others, you "
                 f"must first claim it by answering the question in {general.mention}.",
@@ -117,7 +130,7 @@ class Burger(Cog):
 
         current_holder = burgered_role.members[0]
 
-        birthday_role = uf.get_role(RoleName.BIRTHDAY)
+        birthday_role = uf.get_role(RoleName.BIRTHDAY, interaction.guild)
         if birthday_role in current_holder.roles:
             await interaction.send(
                 f"{interaction.user.mention} has shamelessly attempted to yoink the "
@@ -128,6 +141,7 @@ class Burger(Cog):
             return
 
         last_yoink = await get_last_transfer_time(
+            interaction.guild_id,
             to=interaction.user,
             reason=TransferReason.YOINK,
         )
@@ -158,7 +172,7 @@ class Burger(Cog):
     )
     async def history(self, interaction: Interaction) -> None:
         """H."""
-        holders = await get_last_holders(n=10)
+        holders = await get_last_holders(interaction.guild_id, n=10)
         holder_string = " -> ".join(holder.mention for holder in reversed(holders))
         await interaction.send(
             f"The last people to hold the burger are {holder_string}",
@@ -167,10 +181,19 @@ class Burger(Cog):
 
     @uf.delayed_loop(minutes=1)
     async def check_burger(self) -> None:
-        """Check whether the burger holding period has expired."""
-        logger.debug("Checking burger")
+        """Check whether the burger holding period has expired.
 
-        last_transfer = await get_last_transfer_time()
+        Every guild with a Burgered role has a burger of its own.
+        """
+        logger.debug("Checking burger")
+        for guild in self.standby.bot.guilds:
+            burgered = uf.get_role("Burgered", guild)
+            if burgered is not None:
+                await self.expire_burger(guild, burgered)
+
+    async def expire_burger(self, guild: Guild, burgered: Role) -> None:
+        """Free the burger of a guild once its holding period is up."""
+        last_transfer = await get_last_transfer_time(guild.id)
         if last_transfer is None:
             return
 
@@ -179,13 +202,13 @@ class Burger(Cog):
         if expiration > uf.now():
             return
 
-        logger.info("Burger has expired")
+        logger.info(f"Burger has expired in {guild}")
 
-        already_sent = await check_if_already_sent()
+        already_sent = await check_if_already_sent(guild.id)
         if already_sent:
             return
 
-        burgered = uf.get_role("Burgered")
+        await resolver.chunk(guild)
         holder = None
         for holder in burgered.members:
             await holder.remove_roles(burgered)
@@ -193,7 +216,7 @@ class Burger(Cog):
         params = uf.get_trivia_question()
         params["attempted"] = []
 
-        general = await self.standby.guild.fetch_channel(ID.GENERAL)
+        general = uf.get_channel("general", guild)
 
         if holder:
             await record_burger_transfer(
@@ -206,7 +229,8 @@ class Burger(Cog):
 
             mold_count = await get_mold_count(holder)
 
-            message = await general.send(
+            message = await outbox.send(
+                general,
                 f"After its {mold_count}{uf.ordinal_suffix(mold_count)} bout of "
                 f"fending off the mold in {holder.mention}'s fridge for a full week, "
                 f"the burger yearns for freedom!\n"
@@ -219,7 +243,8 @@ class Burger(Cog):
 
             view = BurgerView(params)
 
-            message = await general.send(
+            message = await outbox.send(
+                general,
                 "Somehow, the burger was lost and is now looking for a new owner.\n"
                 "To claim it, answer the following question:\n \n"
                 f"{params['question']}",
@@ -273,7 +298,7 @@ class BurgerView(uf.PersistentView):
 
             await interaction.response.defer()
 
-            burgered = uf.get_role("Burgered")
+            burgered = uf.get_role("Burgered", interaction.guild)
             await interaction.user.add_roles(burgered)
 
             from cogs.burger import TransferReason, record_burger_transfer
@@ -315,15 +340,17 @@ async def record_burger_transfer(
     """
     pg_pool = Standby().pg_pool
     schema = Standby().schema
+    guild_id = (from_ or to).guild.id
     giver_id = from_.id if from_ else None
     recipient_id = to.id if to else None
     await pg_pool.execute(
         f"""
         INSERT INTO
-            {schema}.burger (giver_id, recipient_id, transferred_at, reason)
+            {schema}.burger (guild_id, giver_id, recipient_id, transferred_at, reason)
         VALUES
-            ($1, $2, $3, $4)
+            ($1, $2, $3, $4, $5)
         """,
+        guild_id,
         giver_id,
         recipient_id,
         uf.now(),
@@ -332,12 +359,13 @@ async def record_burger_transfer(
 
 
 async def get_last_transfer_time(
+    guild_id: int,
     *,
     from_: Member | None = None,
     to: Member | None = None,
     reason: TransferReason | None = None,
 ) -> datetime | None:
-    """Get the last time the burger was transferred.
+    """Get the last time the burger of a guild was transferred.
 
     Provided keyword arguments will filter the selection.
     """
@@ -350,6 +378,7 @@ async def get_last_transfer_time(
         FROM
             {schema}.burger
         WHERE recipient_id IS NOT NULL
+        AND guild_id = {guild_id}
         """
 
     if from_:
@@ -372,12 +401,13 @@ async def get_mold_count(user: Member) -> int:
         FROM
             {schema}.burger
         WHERE
-            giver_id = {user.id}
+            guild_id = {user.guild.id}
+            AND giver_id = {user.id}
             AND reason = '{TransferReason.MOLD}'
         """)
 
 
-async def check_if_already_sent() -> bool:
+async def check_if_already_sent(guild_id: int) -> bool:
     """C."""
     pg_pool = Standby().pg_pool
     schema = Standby().schema
@@ -388,12 +418,13 @@ async def check_if_already_sent() -> bool:
         FROM
             {schema}.view
         WHERE
-            class = 'BurgerView'
+            guild_id = {guild_id}
+            AND class = 'BurgerView'
         """)
     return view is not None
 
 
-async def get_last_holders(n: int = 10) -> list[Member]:
+async def get_last_holders(guild_id: int, n: int = 10) -> list[Member]:
     """G."""
     standby = Standby()
     records = await standby.pg_pool.fetch(f"""
@@ -402,18 +433,17 @@ async def get_last_holders(n: int = 10) -> list[Member]:
         FROM
             {standby.schema}.burger
         WHERE
-            recipient_id IS NOT NULL
+            guild_id = {guild_id}
+            AND recipient_id IS NOT NULL
         ORDER BY
             transferred_at DESC
         LIMIT
             {n}
         """)
 
-    users = []
-    for record in records:
-        user = await standby.bot.fetch_user(record["recipient_id"])
-        users.append(user)
-    return users
+    user_ids = [record["recipient_id"] for record in records]
+    users = await resolver.users(user_ids)
+    return [users[user_id] for user_id in user_ids if user_id in users]
 
 
 def setup(bot: Bot) -> None:
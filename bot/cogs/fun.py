@@ -4,8 +4,7 @@ import io
 import logging
 import random
 import re
-from itertools import permutations
-from pathlib import Path
+from concurrent.futures.process import BrokenProcessPool
 from urllib.parse import quote
 
 import nextcord
@@ -21,16 +20,16 @@ from nextcord import (
 )
 from nextcord.ext.commands import Bot, Cog
 from nextcord.ui import Button, Select, View, button, select
-from PIL import Image, ImageDraw, ImageFont
-from transliterate import translit
-from transliterate.base import TranslitLanguagePack, registry
 
 from domain import (
     ID,
     URL,
     Standby,
 )
+from utils import number_solver
 from utils import util_functions as uf
+from utils.meme_catalog import MemeCatalog
+from utils.outbox import Priority, outbox
 
 logger = logging.getLogger(__name__)
 
@@ -69,97 +68,12 @@ YEEE = """
 ░░░░░░░░░█░░░░░░░░░░░░█░░░░
 """
 
-ALL_MEMES = []
-for file in Path("static/images/memes").iterdir():
-    ending_brackets = r" \[.+\]$"
-    ALL_MEMES.append(re.sub(ending_brackets, "", file.stem))
-ALL_MEMES = sorted(set(ALL_MEMES), key=str.casefold)
-
-
-def add(lhs: int, rhs: int, pstr: str) -> tuple[int, str]:
-    """Support function for the fabricate_number command."""
-    return lhs + rhs, pstr + "+" + str(rhs)
-
-
-def sub(lhs: int, rhs: int, pstr: str) -> tuple[int, str]:
-    """Support function for the fabricate_number command."""
-    return lhs - rhs, pstr + "-" + str(rhs)
-
-
-def mult(lhs: int, rhs: int, pstr: str) -> tuple[int, str]:
-    """Support function for the fabricate_number command."""
-    if rhs == 0:
-        return 0, ""
-    return lhs * rhs, "(" + pstr + ")*" + str(rhs)
-
-
-def div(lhs: int, rhs: int, pstr: str) -> tuple[float, str]:
-    """Support function for the fabricate_number command."""
-    return lhs / rhs, "(" + pstr + ")/" + str(rhs)
-
-
-operations = [add, sub, mult, div]
-
-
-def create_concat_combinations(digits: list[int]) -> list[list[int]]:
-    """Support function for the fabricate_number command."""
-    combs = [digits.copy()]
-    for tupling_sz in range(2, len(digits) + 1):
-        for num_tupling in range(1, int(len(digits) / tupling_sz) + 1):
-            perms = permutations(digits)
-            for perm in perms:
-                out = list(perm).copy()
-                coupled = []
-                for i in range(num_tupling):
-                    to_merge = perm[i * tupling_sz : i * tupling_sz + tupling_sz]
-                    merged = int("".join(map(str, to_merge)))
-                    coupled.append(merged)
-                    out = out[i * tupling_sz + tupling_sz :]
-                out.extend(coupled)
-                combs.append(out)
-
-    for i in range(len(combs)):
-        combs[i] = sorted(combs[i])
-
-    filtered_combs = []
-    for comb in combs:
-        if comb not in filtered_combs:
-            filtered_combs.append(comb)
-    return filtered_combs
-
-
-async def dfs(
-    target: int,
-    current_target: int,
-    current_digits: list[int],
-    current_str: str,
-) -> str:
-    """Support function for the fabricate_number command."""
-    if current_target == target:
-        return current_str
-
-    if not current_digits:
-        return ""
-
-    for dig in current_digits:
-        new_digits = current_digits.copy()
-        new_digits.remove(dig)
-        for op in operations:
-            if op == div and dig == 0:
-                continue
-            new_target, new_str = op(current_target, dig, current_str)
-            if op == div and not new_target.is_integer():
-                continue
-            res = await dfs(target, int(new_target), new_digits, new_str)
-            if res:
-                return res
-
-    return ""
-
 
 class Fun(Cog):
     def __init__(self) -> None:
         self.standby = Standby()
+        self.memes = MemeCatalog()
+        self.reload_memes.start()
 
     @slash_command(description="YEE")
     async def yee(self, interaction: Interaction) -> None:
@@ -186,7 +100,11 @@ class Fun(Cog):
             )
             hug = uf.get_emoji("BlobReachAndHug")
             if hug:
-                await interaction.channel.send(hug)
+                await outbox.send(
+                    interaction.channel,
+                    hug,
+                    priority=Priority.INTERACTION,
+                )
 
     @user_command(name="Hug")
     async def hug_context(self, interaction: Interaction, user: Member) -> None:
@@ -226,6 +144,11 @@ class Fun(Cog):
         rip = await interaction.original_message()
         await rip.add_reaction("🇫")
 
+    @uf.delayed_loop(minutes=1, leader_only=False)
+    async def reload_memes(self) -> None:
+        """Pick up memes added to or removed from the meme directory."""
+        self.memes.reload()
+
     @slash_command(description="Posts a meme.")
     async def meme(
         self,
@@ -242,18 +165,17 @@ class Fun(Cog):
             meme (str): Meme to send.
         """
         if meme == "list":
-            help_text = f"```Currently available memes:\n{'\n'.join(ALL_MEMES)}```"
+            help_text = (
+                f"```Currently available memes:\n{'\n'.join(self.memes.names)}```"
+            )
             await interaction.response.send_message(help_text, ephemeral=True)
             return
 
         if "horny" in meme.lower() and interaction.user.id == ID.JORM:
             link = URL.GITHUB_STATIC + "/images/memes/Horny [DD].png"
             await interaction.response.send_message(quote(link, safe=":/"))
-        elif meme in ALL_MEMES:
-            meme_dir = Path(URL.LOCAL_STATIC) / "images/memes"
-            matches = list(meme_dir.glob(f"{meme}*"))
-            file = random.choice(matches)
-            link = URL.GITHUB_STATIC + "/images/memes/" + file.name
+        elif file_name := self.memes.pick(meme):
+            link = URL.GITHUB_STATIC + "/images/memes/" + file_name
             await interaction.response.send_message(quote(link, safe=":/"))
         else:
             await interaction.response.send_message(
@@ -277,12 +199,8 @@ class Fun(Cog):
             user_input (str | None): Currently entered text
         """
         if user_input:
-            matches = sorted(
-                (meme for meme in ALL_MEMES if user_input.lower() in meme.lower()),
-                key=lambda meme: meme.lower().startswith(user_input.lower()),
-                reverse=True,
-            )
-            await interaction.response.send_autocomplete(matches[:25])
+            matches = self.memes.suggest(user_input)
+            await interaction.response.send_autocomplete(list(matches))
         else:
             await interaction.response.send_autocomplete(["list"])
 
@@ -298,6 +216,8 @@ class Fun(Cog):
             interaction (Interaction): Invoking interaction
             text (str): Text to convert.
         """
+        from transliterate import translit  # noqa: PLC0415
+        from transliterate.base import TranslitLanguagePack, registry  # noqa: PLC0415
 
         class ExampleLanguagePack(TranslitLanguagePack):
             language_code = "custom"
@@ -368,7 +288,7 @@ class Fun(Cog):
             interaction (Interaction): Invoking interaction
         """
         view = self.VanityView(interaction.user)
-        vanity_roles = uf.get_roles_by_type("Vanity")
+        vanity_roles = uf.get_roles_by_type("Vanity", interaction.guild)
         for role in vanity_roles:
             view.children[0].add_option(label=role.name)
         view.children[0].add_option(label="Remove my vanity role", value="remove")
@@ -380,7 +300,7 @@ class Fun(Cog):
             text = "Your vanity role has been removed."
             if view.value != "remove":
                 logger.info(f"Adding vanity role {role.name} to {interaction.user}")
-                role = uf.get_role(view.value)
+                role = uf.get_role(view.value, interaction.guild)
                 await interaction.user.add_roles(role)
                 text = f"You are now (a) {role.name}."
             msg = await interaction.original_message()
@@ -411,6 +331,7 @@ class Fun(Cog):
             query, font_size, align = "Megamind no bitches", 125, "top"
 
         logger.info(f"Captioning {template=} for {interaction.user}")
+        from PIL import Image, ImageDraw, ImageFont  # noqa: PLC0415
 
         logger.info("Fetching base image")
         img = Image.open(
@@ -513,45 +434,50 @@ class Fun(Cog):
             await interaction.send(f"Bad input {e}")
             return
 
-        if not digits or target == 0:
+        if not digits or target == 0 or any(digit < 0 for digit in digits):
             await interaction.send(
-                "Bad input - target must be non-zero and "
-                "at least one digit must be provided",
+                "Bad input - target must be non-zero and at least one "
+                "non-negative digit must be provided",
+            )
+            return
+
+        if len(digits) > number_solver.MAX_NUMBERS:
+            await interaction.send(
+                f"Bad input - at most {number_solver.MAX_NUMBERS} digits "
+                "can be provided",
             )
             return
 
         await interaction.response.defer()
 
-        concatenations = create_concat_combinations(digits)
-        num_digit_combinations = len(concatenations)
-        did_cut = False
-        attempt_limit = 50000
-        if (
-            num_digit_combinations > attempt_limit
-        ):  # make sure someone doesn't super bomb it
-            concatenations = concatenations[:attempt_limit]
-            did_cut = True
-
-        for concat_digits in concatenations:
-            for dig in concat_digits:
-                new_digits = concat_digits.copy()
-                new_digits.remove(dig)
-                res = await dfs(target, dig, new_digits, str(dig))
-                if res:
-                    msg = (
-                        f"`{target}` from `{digits}` can be 'mathed' out "
-                        f"this way:`{res}`"
-                    )
-                    await interaction.send(msg)
-                    return
-
-        if did_cut:
+        try:
+            res = await number_solver.fabricate_number(
+                target,
+                digits,
+                interaction.guild_id,
+            )
+        except TimeoutError:
+            await interaction.send(
+                f"Nothing found within {number_solver.TIME_BUDGET} seconds",
+            )
+            return
+        except number_solver.SolverBusyError:
+            await interaction.send(
+                "Too many numbers are being fabricated right now, try again in a bit",
+            )
+            return
+        except BrokenProcessPool:
+            logger.exception("Number fabrication failed")
+            await interaction.send("Something went wrong, try again in a bit")
+            return
+
+        if res:
             await interaction.send(
-                f"Nothing found in {attempt_limit}/{num_digit_combinations} combinations",  # noqa: E501
+                f"`{target}` from `{digits}` can be 'mathed' out this way:`{res}`",
             )
         else:
             await interaction.send(
-                f"Nothing found in {num_digit_combinations} combinations",
+                f"`{target}` can't be 'mathed' out from `{digits}`",
             )
 
 
@@ -1,14 +1,15 @@
 """Play hangman in a channel (legacy)."""
 
-import asyncio
 import re
 from typing import Literal
 
 from nextcord import Embed, Interaction, Member, SlashOption, slash_command
 from nextcord.ext.commands import Bot, Cog
 
-from domain import URL, Color, Standby, ValidTextChannel
+from domain import URL, Color, Standby
 from utils import util_functions as uf
+from utils.outbox import Priority, outbox
+from utils.sessions import SessionManager
 
 IMAGE_LINKS = [URL.GITHUB_STATIC + f"/images/Hangman-{num}.png" for num in range(7)]
 MAX_PHRASE_LENGTH = 85
@@ -16,15 +17,13 @@ MAX_WRONG_GUESSES = 6
 
 
 class HangmanGame:
+    __slots__ = ("host_id", "progress", "word", "wrong_guesses")
+
     def __init__(self) -> None:
-        self.status = "Inactive"
-        self.lock = asyncio.Lock()
         self.word = None
         self.progress = None
         self.wrong_guesses = None
-        self.host = None
-        self.channel = None
-        self.embed = None
+        self.host_id = None
 
     def create_embed(self) -> Embed:
         """Create an embed for the game."""
@@ -55,30 +54,23 @@ class HangmanGame:
         )
         return embed
 
-    def setup(self, word: str, host: Member, channel: ValidTextChannel) -> None:
+    def setup(self, word: str, host: Member) -> None:
         """Setup the game."""
-        self.status = "Active"
         self.word = word.upper()
         self.progress = re.sub(r"\w", "_", self.word)
         self.wrong_guesses = []
-        self.host = host
-        self.channel = channel
-        self.embed = self.create_embed()
+        self.host_id = host.id
 
     def check_letter(self, letter: str) -> bool:
         """Check if the word contains a letter."""
         letter = letter.upper()
         if letter in self.word:
-            for match in re.finditer(letter, self.word):
-                self.progress = (
-                    self.progress[: match.start()]
-                    + letter
-                    + self.progress[match.start() + 1 :]
-                )
-            self.embed = self.create_embed()
+            self.progress = "".join(
+                char if char == letter else shown
+                for char, shown in zip(self.word, self.progress, strict=True)
+            )
             return True
         self.wrong_guesses.append(letter)
-        self.embed = self.create_embed()
         return False
 
     def check_word(self, word: str) -> bool:
@@ -86,10 +78,8 @@ class HangmanGame:
         word = word.upper()
         if word == self.word:
             self.progress = word
-            self.embed = self.create_embed()
             return True
         self.wrong_guesses.append(word)
-        self.embed = self.create_embed()
         return False
 
     def state(self) -> Literal["Game Over", "Game Won", "Still guessing"]:
@@ -101,12 +91,10 @@ class HangmanGame:
         return "Still guessing"
 
 
-game = HangmanGame()
-
-
 class Hangman(Cog, name="Void Hangman"):
     def __init__(self) -> None:
         self.standby = Standby()
+        self.games = SessionManager(HangmanGame)
 
     @slash_command(description="Commands for running games of hangman")
     async def hangman(self, interaction: Interaction) -> None:
@@ -121,10 +109,6 @@ class Hangman(Cog, name="Void Hangman"):
         ),
     ) -> None:
         """Start a game of Hangman."""
-        if game.status != "Inactive":
-            await interaction.send("A game is already running.", ephemeral=True)
-            return
-
         if len(phrase) > MAX_PHRASE_LENGTH:
             await interaction.send(
                 "Phrase is too long, please try again",
@@ -151,18 +135,34 @@ class Hangman(Cog, name="Void Hangman"):
         except ValueError:
             pass
 
-        await game.lock.acquire()
-        await interaction.send(
-            "Phrase accepted - game is starting!",
-            ephemeral=True,
-        )
-        await interaction.channel.send("Void Hangman has begun!")
-        game.setup(phrase, interaction.user, interaction.channel)
-        await interaction.channel.send(embed=game.embed)
-        game.lock.release()
+        channel_id = interaction.channel.id
+        async with self.games.lock(channel_id):
+            if self.games.get(channel_id):
+                await interaction.send(
+                    "A game is already running in this channel.",
+                    ephemeral=True,
+                )
+                return
+
+            game = self.games.create(channel_id)
+            game.setup(phrase, interaction.user)
+            await interaction.send(
+                "Phrase accepted - game is starting!",
+                ephemeral=True,
+            )
+            await outbox.send(
+                interaction.channel,
+                "Void Hangman has begun!",
+                priority=Priority.INTERACTION,
+            )
+            await outbox.send(
+                interaction.channel,
+                embed=game.create_embed(),
+                priority=Priority.INTERACTION,
+            )
 
     @hangman.subcommand(description="Attempt a guess")
-    async def guess(  # noqa: C901, PLR0912
+    async def guess(
         self,
         interaction: Interaction,
         guess: str = SlashOption(
@@ -170,19 +170,21 @@ class Hangman(Cog, name="Void Hangman"):
         ),
     ) -> None:
         """Guess a letter."""
-        global game  # noqa: PLW0603
+        channel_id = interaction.channel.id
+        async with self.games.lock(channel_id):
+            game = self.games.get(channel_id)
+
+            if game is None:
+                await interaction.send(
+                    "No active game found in this channel.",
+                    ephemeral=True,
+                )
+                return
+
+            if game.host_id == interaction.user.id:
+                await interaction.send("Hey, no cheating!", ephemeral=True)
+                return
 
-        if game.status == "Inactive":
-            await interaction.send("No active game found.", ephemeral=True)
-        elif game.channel != interaction.channel:
-            await interaction.send(
-                "You can only make guesses in the current game's channel, "
-                f"please head over to {game.channel.mention}.",
-                ephemeral=True,
-            )
-        elif game.host == interaction.user:
-            await interaction.send("Hey, no cheating!", ephemeral=True)
-        else:
             guess = guess.upper()
 
             if guess in game.progress or guess in game.wrong_guesses:
@@ -208,36 +210,48 @@ class Hangman(Cog, name="Void Hangman"):
             if game.state() == "Game Over":
                 await interaction.send(
                     "Game Over - better luck next time!",
-                    embed=game.embed,
+                    embed=game.create_embed(),
                 )
-                game = HangmanGame()
+                self.games.end(channel_id)
             elif game.state() == "Game Won":
                 await interaction.send(
                     "Winner winner chicken dinner!",
-                    embed=game.embed,
+                    embed=game.create_embed(),
                 )
-                game = HangmanGame()
+                self.games.end(channel_id)
             else:
-                await interaction.channel.send(embed=game.embed)
+                await outbox.send(
+                    interaction.channel,
+                    embed=game.create_embed(),
+                    priority=Priority.INTERACTION,
+                )
 
     @hangman.subcommand(description="Abort the current game of Void Hangman")
     async def abort(self, interaction: Interaction) -> None:
         """Abort the current game."""
-        global game  # noqa: PLW0603
-
-        if game.status != "Active":
-            await interaction.send("No active game found.", ephemeral=True)
-        elif (
-            interaction.user != game.host
-            or uf.get_role("Moderator") not in interaction.user.roles
-        ):
-            await interaction.send(
-                "Only the person who started the game can stop it.",
-                ephemeral=True,
-            )
-        else:
-            await interaction.send("Game aborted. Use `/hangman` to start a new one.")
-            game = HangmanGame()
+        channel_id = interaction.channel.id
+        async with self.games.lock(channel_id):
+            game = self.games.get(channel_id)
+
+            if game is None:
+                await interaction.send(
+                    "No active game found in this channel.",
+                    ephemeral=True,
+                )
+            elif (
+                interaction.user.id != game.host_id
+                and uf.get_role("Moderator", interaction.guild)
+                not in interaction.user.roles
+            ):
+                await interaction.send(
+                    "Only the person who started the game can stop it.",
+                    ephemeral=True,
+                )
+            else:
+                self.games.end(channel_id)
+                await interaction.send(
+                    "Game aborted. Use `/hangman` to start a new one.",
+                )
 
 
 def setup(bot: Bot) -> None:
@@ -21,6 +21,8 @@ from nextcord.ext.commands import Bot, Cog
 
 from domain import EMPTY_STRING, ChannelName, Color, Standby
 from utils import util_functions as uf
+from utils.outbox import Priority, outbox
+from utils.resolver import resolver
 
 EMBED_DESCRIPTION_LIMIT = 950
 
@@ -39,15 +41,24 @@ class Logs(Cog):
         """
         channel = self.standby.bot.get_channel(payload.channel_id)
         logger.info(f"Message deleted in {channel.name}")
-        if channel.name == ChannelName.LOGS:
+        logs = uf.get_channel(ChannelName.LOGS, getattr(channel, "guild", None))
+        if channel == logs:
             return
         embed, files = await deleted_embed(payload)
-        if embed:
-            logs = uf.get_channel(ChannelName.LOGS)
-            if logs:
-                main = await logs.send(embed=embed)
-                for file in files:
-                    await logs.send(file=file, reference=main)
+        if embed and logs:
+            main = await outbox.send(
+                logs,
+                embed=embed,
+                priority=Priority.LOG,
+                mergeable=not files,
+            )
+            for file in files:
+                await outbox.send(
+                    logs,
+                    file=file,
+                    reference=main,
+                    priority=Priority.LOG,
+                )
 
     @Cog.listener()
     async def on_raw_message_edit(self, payload: RawMessageUpdateEvent) -> None:
@@ -56,10 +67,18 @@ class Logs(Cog):
         Called any time a user edits a message.
         """
         embed = await edited_embed(payload)
-        logs = uf.get_channel(ChannelName.LOGS)
+        logs = uf.get_channel(
+            ChannelName.LOGS,
+            self.standby.bot.get_guild(payload.guild_id),
+        )
 
         if embed and logs:
-            await logs.send(embed=embed)
+            await outbox.send(
+                logs,
+                embed=embed,
+                priority=Priority.LOG,
+                mergeable=True,
+            )
 
     @Cog.listener()
     async def on_voice_state_update(
@@ -77,9 +96,14 @@ class Logs(Cog):
         logger.debug(f"{member} has changed voice channels")
         embed = await voice_embed(member, before.channel, after.channel)
 
-        logs = uf.get_channel(ChannelName.LOGS)
+        logs = uf.get_channel(ChannelName.LOGS, member.guild)
         if logs:
-            await logs.send(embed=embed)
+            await outbox.send(
+                logs,
+                embed=embed,
+                priority=Priority.LOG,
+                mergeable=True,
+            )
 
     @Cog.listener()
     async def on_interaction(self, interaction: Interaction) -> None:
@@ -91,7 +115,7 @@ class Logs(Cog):
 
         Called any time a user interaction is detected.
         """
-        logs = uf.get_channel(ChannelName.LOGS)
+        logs = uf.get_channel(ChannelName.LOGS, interaction.guild)
 
         if not logs:
             logger.error("Log channel not found")
@@ -99,10 +123,20 @@ class Logs(Cog):
 
         if interaction.type == InteractionType.application_command:
             embed = await command_embed(interaction)
-            await logs.send(embed=embed)
+            await outbox.send(
+                logs,
+                embed=embed,
+                priority=Priority.LOG,
+                mergeable=True,
+            )
         elif interaction.type == InteractionType.component:
             embed = await component_embed(interaction)
-            await logs.send(embed=embed)
+            await outbox.send(
+                logs,
+                embed=embed,
+                priority=Priority.LOG,
+                mergeable=True,
+            )
         elif interaction.type == InteractionType.application_command_autocomplete:
             pass
         else:
@@ -110,7 +144,11 @@ class Logs(Cog):
                 f"Unknown interaction in {interaction.channel.name} "
                 f"with {interaction.type=}",
             )
-            await logs.send(f"Unknown interaction in {interaction.channel.mention}.")
+            await outbox.send(
+                logs,
+                f"Unknown interaction in {interaction.channel.mention}.",
+                priority=Priority.LOG,
+            )
 
 
 async def deleted_embed(payload: RawMessageDeleteEvent) -> tuple[Embed, list[File]]:
@@ -202,8 +240,8 @@ async def edited_embed(payload: RawMessageUpdateEvent) -> Embed:  # noqa: C901,
         message_id = after["id"]
 
         standby = Standby()
-        author = await standby.guild.fetch_member(author_id)
-        if author.bot or not author:
+        author = await resolver.member(int(author_id))
+        if author is None or author.bot:
             return None
         channel = await standby.bot.fetch_channel(channel_id)
         message = await channel.fetch_message(message_id)
@@ -9,6 +9,7 @@ from nextcord.ext.commands import Bot, Cog
 
 from domain import URL, ChannelName, Color, Standby
 from utils import util_functions as uf
+from utils.outbox import Priority, outbox
 
 logger = logging.getLogger(__name__)
 
@@ -40,8 +41,8 @@ async def welcome_message(member: Member) -> None:
         member (Member): The new member
     """
     logger.info(f"{member} has joined the guild")
-    general = uf.get_channel(ChannelName.GENERAL)
-    rules_ch = uf.get_channel(ChannelName.RULES)
+    general = uf.get_channel(ChannelName.GENERAL, member.guild)
+    rules_ch = uf.get_channel(ChannelName.RULES, member.guild)
     rules_text = rules_ch.mention if rules_ch else f"#{ChannelName.Rules}"
     if not general:
         logger.error("Could not find general channel")
@@ -53,16 +54,17 @@ async def welcome_message(member: Member) -> None:
         "https://www.youtube.com/watch?v=67h8GyNgEmA"
     )
 
-    await general.send(message)
+    await outbox.send(general, message)
     await asyncio.sleep(30 * 60)
     if (
         not member.bot
         and member.guild.get_member(member.id)
-        and (uf.get_role("Alliance") not in member.roles)
-        and (uf.get_role("Community") not in member.roles)
+        and (uf.get_role("Alliance", member.guild) not in member.roles)
+        and (uf.get_role("Community", member.guild) not in member.roles)
     ):
         logger.info(f"Sending reminder to {member}")
-        await general.send(
+        await outbox.send(
+            general,
             f"Hey {member.mention} - I see you still haven't unlocked "
             f"the full server. Make sure you read {rules_ch.mention} "
             "and use the buttons so you can access all of our channels!",
@@ -75,7 +77,7 @@ async def leave_message(member: Member) -> None:
     Args:
         member (Member): The user who left
     """
-    channel = uf.get_channel(ChannelName.ERRORS)
+    channel = uf.get_channel(ChannelName.ERRORS, member.guild)
     if not channel:
         logger.error("Could not find error channel")
         return
@@ -100,7 +102,7 @@ async def leave_message(member: Member) -> None:
         "Critical paper cut",
         "Executed by the ICC for their numerous war crimes in Albania",
     ]
-    animu = uf.get_channel("animu")
+    animu = uf.get_channel("animu", member.guild)
     if animu:
         causes.append(f"Too much time spent in {animu.mention}")
     embed.add_field(name="Time of death", value=time)
@@ -108,7 +110,7 @@ async def leave_message(member: Member) -> None:
         name="Cause of death",
         value=causes[random.randint(1, len(causes)) - 1],
     )
-    await channel.send(embed=embed)
+    await outbox.send(channel, embed=embed, priority=Priority.LOG, mergeable=True)
 
 
 async def level3_handler(before: Member, after: Member) -> None:
@@ -121,11 +123,11 @@ async def level3_handler(before: Member, after: Member) -> None:
     if len(after.roles) - len(before.roles) != 1:
         return
 
-    lv3 = uf.get_role("Level 3")
-    alliance = uf.get_role("Alliance")
+    lv3 = uf.get_role("Level 3", after.guild)
+    alliance = uf.get_role("Alliance", after.guild)
 
     if lv3 not in before.roles and lv3 in after.roles and alliance in after.roles:
-        giveaways = uf.get_role("Giveaways")
+        giveaways = uf.get_role("Giveaways", after.guild)
         await after.add_roles(giveaways)
 
 
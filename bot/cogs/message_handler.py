@@ -1,6 +1,7 @@
 """Monitor messages sent in the server."""
 
 import logging
+import os
 import re
 from collections.abc import Callable
 from datetime import datetime as dt
@@ -9,15 +10,20 @@ from nextcord import Message
 from nextcord.ext.commands import Bot, Cog
 
 from domain import ChannelName, Standby, ValidTextChannel
+from utils.outbox import Priority, outbox
 from utils.regex import (
     RegexResponse,
     WednesdayResponse,
     regex_responses,
     wednesday_responses,
 )
+from utils.repeats import RepeatDetector
 
 logger = logging.getLogger(__name__)
-last_messages = {}
+
+# Number of different people who must send the same message in a row
+# before the bot joins in
+REPEAT_STREAK_LENGTH = int(os.getenv("REPEAT_STREAK_LENGTH", default="2"))
 
 
 def get_response_command(message: Message) -> Callable:  # noqa: C901
@@ -51,16 +57,16 @@ def get_response_command(message: Message) -> Callable:  # noqa: C901
             ) -> None:
                 """Respond to a wednesday message."""
                 if dt.now().weekday() == resp.trigger_day:
-                    await msg.channel.send(resp.response)
+                    await outbox.send(msg.channel, resp.response)
                     scream = 10 * resp.a
                     if resp.a != resp.a.upper():
                         scream += 10 * resp.a.upper()
                     scream += "**" + 5 * resp.a.upper() + "**"
                     if resp.a == "א":
                         scream = scream[:-2] + "ה**"
-                    await msg.channel.send(scream)
+                    await outbox.send(msg.channel, scream, priority=Priority.BACKGROUND)
                 else:
-                    await msg.channel.send(resp.wrong_day_response)
+                    await outbox.send(msg.channel, resp.wrong_day_response)
 
             return resp_command
     return None
@@ -69,6 +75,7 @@ def get_response_command(message: Message) -> Callable:  # noqa: C901
 class MessageHandler(Cog):
     def __init__(self) -> None:
         self.standby = Standby()
+        self.repeats = RepeatDetector(streak_length=REPEAT_STREAK_LENGTH)
 
     @Cog.listener()
     async def on_message(self, message: Message) -> None:
@@ -99,17 +106,18 @@ class MessageHandler(Cog):
 
         # Check for repeated messages
         if (
-            last_messages.get(message.channel, (None, None))[0]
-            == message.content.lower()
+            self.repeats.observe(
+                message.channel.id,
+                message.author.id,
+                message.content,
+            )
+            and "<:BlobWave:" not in message.content
         ):
-            if (
-                "<:BlobWave:" not in message.content
-                and message.author != last_messages[message.channel][1]
-            ):
-                await message.channel.send(message.content)
-                last_messages.pop(message.channel)
-        else:
-            last_messages[message.channel] = (message.content, message.author)
+            await outbox.send(
+                message.channel,
+                message.content,
+                priority=Priority.BACKGROUND,
+            )
 
 
 def setup(bot: Bot) -> None:
@@ -16,6 +16,7 @@ from nextcord.ui import Button, button
 
 from domain import EMPTY_STRING, SQLResult, Standby
 from utils import util_functions as uf
+from utils.outbox import Priority, outbox
 
 logger = logging.getLogger(__name__)
 
@@ -57,8 +58,10 @@ class Predictions(Cog):
             return
 
         await interaction.send(f"Prediction saved with label `{label}`", ephemeral=True)
-        await interaction.channel.send(
+        await outbox.send(
+            interaction.channel,
             f"{interaction.user.mention} just made a prediction!",
+            priority=Priority.INTERACTION,
         )
 
     @prediction.subcommand(description="Reveal an active prediction")
@@ -172,7 +175,7 @@ class Predictions(Cog):
             )
             return
 
-        await delete_prediction(interaction.user.id, label)
+        await delete_prediction(interaction.guild_id, interaction.user.id, label)
 
 
 class PredictionStatus(StrEnum):
@@ -186,9 +189,23 @@ async def record_prediction(user: Member, label: str, text: str) -> SQLResult:
     standby = Standby()
     result = await standby.pg_pool.execute(f"""
         INSERT INTO
-            {standby.schema}.prediction (user_id, predicted_at, label, text, status)
+            {standby.schema}.prediction (
+                guild_id,
+                user_id,
+                predicted_at,
+                label,
+                text,
+                status
+            )
         VALUES
-            ({user.id}, '{uf.now()}', '{label}', '{text}', '{PredictionStatus.ACTIVE}')
+            (
+                {user.guild.id},
+                {user.id},
+                '{uf.now()}',
+                '{label}',
+                '{text}',
+                '{PredictionStatus.ACTIVE}'
+            )
         ON CONFLICT ON CONSTRAINT prediction_pkey
             DO NOTHING
         """)
@@ -206,7 +223,8 @@ async def get_prediction(user: Member, label: str) -> Record | None:
         FROM
             {standby.schema}.prediction
         WHERE
-            user_id = {user.id}
+            guild_id = {user.guild.id}
+            AND user_id = {user.id}
             AND label = '{label}'
         """)
 
@@ -220,7 +238,8 @@ async def get_user_predictions(user: Member) -> list[Record]:
         FROM
             {standby.schema}.prediction
         WHERE
-            user_id = {user.id}
+            guild_id = {user.guild.id}
+            AND user_id = {user.id}
         """)
 
 
@@ -235,18 +254,20 @@ def format_prediction(prediction: Record) -> str:
     )
 
 
-async def delete_prediction(user_id: int, label: str) -> None:
+async def delete_prediction(guild_id: int, user_id: int, label: str) -> None:
     """Delete prediction with the specified label."""
     standby = Standby()
     await standby.pg_pool.execute(f"""
         DELETE FROM {standby.schema}.prediction
         WHERE
-            user_id = {user_id}
+            guild_id = {guild_id}
+            AND user_id = {user_id}
             AND label = '{label}'
         """)
 
 
 async def set_prediction_status(
+    guild_id: int,
     user_id: int,
     label: str,
     status: PredictionStatus,
@@ -258,7 +279,8 @@ async def set_prediction_status(
         SET
             status = '{status}'
         WHERE
-            user_id = {user_id}
+            guild_id = {guild_id}
+            AND user_id = {user_id}
             AND label = '{label}'
         """)
 
@@ -302,6 +324,7 @@ class PredictionView(uf.PersistentView):
                 f"{uf.id_to_mention(self.owner_id)} has been awarded an orb!",
             )
             await set_prediction_status(
+                interaction.guild_id,
                 self.owner_id,
                 self.label,
                 PredictionStatus.CONFIRMED,
@@ -321,6 +344,7 @@ class PredictionView(uf.PersistentView):
         """Button to vote no."""
         if interaction.user.id == self.owner_id:
             await set_prediction_status(
+                interaction.guild_id,
                 self.owner_id,
                 self.label,
                 PredictionStatus.DEBUNKED,
@@ -352,6 +376,7 @@ class PredictionView(uf.PersistentView):
                 "unworthy of an 🔮!",
             )
             await set_prediction_status(
+                interaction.guild_id,
                 self.owner_id,
                 self.label,
                 PredictionStatus.DEBUNKED,
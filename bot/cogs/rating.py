@@ -9,6 +9,7 @@ from nextcord.ext.commands import Bot, Cog
 
 from domain import Standby
 from utils import util_functions as uf
+from utils.outbox import Priority, outbox
 
 logger = logging.getLogger(__name__)
 
@@ -77,7 +78,7 @@ class Rating(Cog):
     ) -> None:
         """Check a title's rating and reviews."""
         title = uf.titlecase(title)
-        records = await get_ratings(category, title)
+        records = await get_ratings(interaction.guild_id, category, title)
 
         if not records:
             await interaction.send(f"{title} has not been rated yet.")
@@ -93,12 +94,16 @@ class Rating(Cog):
         if not details:
             return
 
-        await interaction.channel.send(f"Reviews currently on file for {title}:")
+        await outbox.send(
+            interaction.channel,
+            f"Reviews currently on file for {title}:",
+            priority=Priority.INTERACTION,
+        )
         for rec in records:
             msg = f"{uf.id_to_mention(rec['user_id'])} rated it {rec['score']}/10"
             if rec["review"]:
                 msg += f" with the review:\n{rec['review']}"
-            await interaction.channel.send(msg)
+            await outbox.send(interaction.channel, msg, priority=Priority.INTERACTION)
 
 
 async def insert_rating(
@@ -113,14 +118,15 @@ async def insert_rating(
     await standby.pg_pool.execute(
         f"""
         INSERT INTO
-            {standby.schema}.rating (user_id, category, title, score, review)
+            {standby.schema}.rating (guild_id, user_id, category, title, score, review)
         VALUES
-            ($1, $2, $3, $4, $5)
+            ($1, $2, $3, $4, $5, $6)
         ON CONFLICT ON CONSTRAINT rating_pkey
         DO UPDATE SET
             score = excluded.score,
             review = excluded.review
         """,
+        user.guild.id,
         user.id,
         category,
         title,
@@ -129,8 +135,8 @@ async def insert_rating(
     )
 
 
-async def get_ratings(category: Category, title: str) -> list[Record]:
-    """Get all ratings for a title."""
+async def get_ratings(guild_id: int, category: Category, title: str) -> list[Record]:
+    """Get all ratings for a title in a guild."""
     standby = Standby()
     return await standby.pg_pool.fetch(f"""
         SELECT
@@ -138,7 +144,8 @@ async def get_ratings(category: Category, title: str) -> list[Record]:
         FROM
             {standby.schema}.rating
         WHERE
-            category = '{category}'
+            guild_id = {guild_id}
+            AND category = '{category}'
             AND title = '{title}'
         """)
 
@@ -0,0 +1,44 @@
+"""Forward raw reaction events to the reaction dispatcher."""
+
+from nextcord import (
+    RawReactionActionEvent,
+    RawReactionClearEmojiEvent,
+    RawReactionClearEvent,
+)
+from nextcord.ext.commands import Bot, Cog
+
+from domain import Standby
+from utils.reactions import dispatcher
+
+
+class Reactions(Cog):
+    def __init__(self) -> None:
+        self.standby = Standby()
+
+    @Cog.listener()
+    async def on_raw_reaction_add(self, event: RawReactionActionEvent) -> None:
+        """Called any time a user adds a reaction."""
+        await dispatcher.dispatch("add", event)
+
+    @Cog.listener()
+    async def on_raw_reaction_remove(self, event: RawReactionActionEvent) -> None:
+        """Called any time a user removes a reaction."""
+        await dispatcher.dispatch("remove", event)
+
+    @Cog.listener()
+    async def on_raw_reaction_clear(self, event: RawReactionClearEvent) -> None:
+        """Called when all reactions are cleared from a message."""
+        await dispatcher.dispatch("clear", event)
+
+    @Cog.listener()
+    async def on_raw_reaction_clear_emoji(
+        self,
+        event: RawReactionClearEmojiEvent,
+    ) -> None:
+        """Called when all reactions of a certain emoji are cleared."""
+        await dispatcher.dispatch("clear_emoji", event)
+
+
+def setup(bot: Bot) -> None:
+    """Automatically called during bot setup."""
+    bot.add_cog(Reactions())
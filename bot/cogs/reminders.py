@@ -10,6 +10,8 @@ from nextcord.ext.commands import Bot, Cog
 
 from domain import Standby
 from utils import util_functions as uf
+from utils.outbox import outbox
+from utils.resolver import resolver
 
 logger = logging.getLogger(__name__)
 
@@ -170,20 +172,23 @@ class Timers(Cog):
                 original_message = await channel.fetch_message(reminder["message_id"])
 
                 mention = uf.id_to_mention(reminder["user_id"])
-                await channel.send(
+                await outbox.send(
+                    channel,
                     f"Reminder for {mention}, created at {creation_time}:\n"
                     f"{reminder['message']}\n",
                     reference=original_message,
                 )
 
             if reminder["send_dm"]:
-                user = await self.standby.guild.fetch_member(reminder["user_id"])
-                await user.send(
-                    f"Your reminder, created at {creation_time}, "
-                    f"has expired:\n{reminder['message']}",
-                )
+                user = await resolver.user(reminder["user_id"])
+                if user is not None:
+                    await outbox.send(
+                        user,
+                        f"Your reminder, created at {creation_time}, "
+                        f"has expired:\n{reminder['message']}",
+                    )
 
-            await delete_reminder(reminder["reminder_id"])
+            await delete_reminder(reminder["guild_id"], reminder["reminder_id"])
 
 
 async def create_reminder(
@@ -223,6 +228,7 @@ async def create_reminder(
         f"""
         INSERT INTO
             {standby.schema}.reminder (
+                guild_id,
                 user_id,
                 created_at,
                 expires_at,
@@ -232,8 +238,9 @@ async def create_reminder(
                 send_dm
             )
         VALUES
-            ($1, $2, $3, $4, $5, $6, $7)
+            ($1, $2, $3, $4, $5, $6, $7, $8)
         """,
+        interaction.guild_id,
         interaction.user.id,
         uf.now(),
         expires,
@@ -257,14 +264,15 @@ async def get_expired_reminders() -> list[Record]:
         """)
 
 
-async def delete_reminder(reminder_id: int) -> None:
+async def delete_reminder(guild_id: int, reminder_id: int) -> None:
     """Delete a reminder from the database."""
     standby = Standby()
     return await standby.pg_pool.execute(f"""
         DELETE FROM
             {standby.schema}.reminder
         WHERE
-            reminder_id = {reminder_id}
+            guild_id = {guild_id}
+            AND reminder_id = {reminder_id}
         """)
 
 
@@ -3,11 +3,15 @@
 import logging
 from datetime import timedelta
 
+from asyncpg import Record
 from nextcord import RawReactionActionEvent
 from nextcord.ext.commands import Bot, Cog
+from nextcord.utils import snowflake_time
 
 from domain import Standby
 from utils import util_functions as uf
+from utils.reactions import ReactionRoute, dispatcher
+from utils.resolver import resolver
 
 logger = logging.getLogger(__name__)
 
@@ -21,26 +25,25 @@ class Reposts(Cog):
     def __init__(self) -> None:
         self.standby = Standby()
         self.check_reposters.start()
+        dispatcher.add_route(ReactionRoute(handler=self.ree_added, emojis={EMOJI}))
 
-    @Cog.listener()
-    async def on_raw_reaction_add(self, payload: RawReactionActionEvent) -> None:
+    async def ree_added(self, event: RawReactionActionEvent) -> None:
         """Trigger when users add a REEPOSTER emoji react."""
-        reemoji = uf.get_emoji(EMOJI)
-        reeposter = uf.get_role(ROLE)
-
-        if not (
-            isinstance(payload, RawReactionActionEvent) and payload.emoji == reemoji
-        ):
+        guild = self.standby.bot.get_guild(event.guild_id)
+        if guild is None:
+            return
+        reemoji = uf.get_emoji(EMOJI, guild)
+        if reemoji is None or event.emoji.id != reemoji.id:
             return
-        logger.info(f"Reeposter emoji added to {reeposter}'s post")
-        channel = self.standby.bot.get_channel(payload.channel_id)
-        message = await channel.fetch_message(payload.message_id)
-        message_age = uf.utcnow() - message.created_at
 
-        if message_age > DURATION / 3:
-            logger.info("Message is too old - ignoring")
+        if uf.utcnow() - snowflake_time(event.message_id) > DURATION / 3:
+            logger.debug("Message is too old - ignoring")
             return
 
+        channel = self.standby.bot.get_channel(event.channel_id)
+        message = await channel.fetch_message(event.message_id)
+        logger.info(f"Reeposter emoji added to {message.author}'s post")
+
         rees = 0
         for emoji in message.reactions:
             if emoji.emoji == reemoji:
@@ -49,6 +52,9 @@ class Reposts(Cog):
         if rees < THRESHOLD:
             return
 
+        reeposter = uf.get_role(ROLE, guild)
+        if reeposter is None:
+            return
         await message.author.add_roles(reeposter)
         expires = message.created_at + DURATION
         expires = expires.replace(microsecond=0, tzinfo=None)
@@ -56,15 +62,21 @@ class Reposts(Cog):
         await self.standby.pg_pool.execute(
             f"""
             INSERT INTO
-                {self.standby.schema}.repost (user_id, message_id, expires_at)
+                {self.standby.schema}.repost (
+                    user_id,
+                    message_id,
+                    expires_at,
+                    guild_id
+                )
             VALUES
-                ($1, $2, $3)
+                ($1, $2, $3, $4)
             ON CONFLICT ON CONSTRAINT repost_pkey
                 DO NOTHING
             """,
             message.author.id,
             message.id,
             expires,
+            guild.id,
         )
 
     @uf.delayed_loop(minutes=1)
@@ -73,24 +85,43 @@ class Reposts(Cog):
         logger.debug("Checking reposts")
         records = await self.standby.pg_pool.fetch(f"""
             SELECT
-                user_id, message_id
+                user_id, message_id, guild_id
             FROM
                 {self.standby.schema}.repost
             WHERE
                 expires_at < NOW()
                 AND NOT processed
             """)
+        by_guild: dict[int, list[Record]] = {}
+        for rec in records:
+            by_guild.setdefault(rec["guild_id"], []).append(rec)
+
+        for guild_id, guild_records in by_guild.items():
+            await self.expire(guild_id, guild_records)
+
+    async def expire(self, guild_id: int, records: list[Record]) -> None:
+        """Remove the reeposter role for expired reposts in a guild."""
+        guild = self.standby.bot.get_guild(guild_id)
+        members = {}
+        reeposter = None
+        if guild is not None:
+            members = await resolver.members(
+                (rec["user_id"] for rec in records),
+                guild,
+            )
+            reeposter = uf.get_role(ROLE, guild)
         for rec in records:
             logger.info("Repost timer expired - removing role")
-            user = await self.standby.guild.fetch_member(rec["user_id"])
-            reeposter = uf.get_role(ROLE)
-            await user.remove_roles(reeposter)
+            user = members.get(rec["user_id"])
+            if user is not None and reeposter is not None:
+                await user.remove_roles(reeposter)
             await self.standby.pg_pool.execute(f"""
                 UPDATE {self.standby.schema}.repost
                 SET
                     processed = TRUE
                 WHERE
-                    user_id = {rec["user_id"]}
+                    guild_id = {guild_id}
+                    AND user_id = {rec["user_id"]}
                     AND message_id = {rec["message_id"]}
                 """)
 
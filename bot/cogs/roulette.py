@@ -8,12 +8,14 @@ from nextcord import Interaction, Member, slash_command
 from nextcord.errors import Forbidden
 from nextcord.ext.commands import Bot, Cog
 
-from domain import Standby
+from domain import ID, Standby
 from utils import util_functions as uf
 
 logger = logging.getLogger(__name__)
 
 ROULETTE_TIMEOUT = timedelta(minutes=30)
+# All-time record of the home guild from before results were stored
+CARRIED_OVER_RECORD = 40
 
 
 class Roulette(Cog):
@@ -91,21 +93,22 @@ async def record_roulette_result(user: Member, *, win: bool) -> None:
     await standby.pg_pool.execute(
         f"""
         INSERT INTO
-            {standby.schema}.roulette (user_id, played_at, win)
+            {standby.schema}.roulette (guild_id, user_id, played_at, win)
         VALUES
-            ($1, $2, $3)
+            ($1, $2, $3, $4)
         """,
+        user.guild.id,
         user.id,
         uf.now(),
         win,
     )
 
 
-async def get_streaks(lookup_id: int) -> tuple[int, int, int, int]:
-    """Get streaks for the provided user and for the server.
+async def get_streaks(member: Member) -> tuple[int, int, int, int]:
+    """Get streaks for the provided member and for their server.
 
     Args:
-        lookup_id (int): User ID to look up
+        member (Member): Member to look up
 
     Returns:
         tuple[int, int, int, int]: Current and maximum streaks for
@@ -113,24 +116,29 @@ async def get_streaks(lookup_id: int) -> tuple[int, int, int, int]:
             for the server.
     """
     standby = Standby()
-    records = await standby.pg_pool.fetch(f"""
+    records = await standby.pg_pool.fetch(
+        f"""
         SELECT
             user_id,
             win
         FROM
             {standby.schema}.roulette
+        WHERE
+            guild_id = $1
         ORDER BY
             played_at,
             user_id
-        """)
+        """,
+        member.guild.id,
+    )
     user_current = user_max = server_current = 0
-    server_max = 40  # Carried over
+    server_max = CARRIED_OVER_RECORD if member.guild.id == ID.GUILD else 0
 
     user_ids = {record["user_id"] for record in records}
     for user_id in user_ids:
         results = [record["win"] for record in records if record["user_id"] == user_id]
         current, maximum = parse_results(results)
-        if user_id == lookup_id:
+        if user_id == member.id:
             user_current = current
             user_max = maximum
         server_current = max(server_current, current)
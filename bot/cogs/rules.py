@@ -3,17 +3,22 @@
 import asyncio
 import logging
 import re
+from datetime import datetime, timedelta
 from math import ceil
 
 from nextcord import (
     ButtonStyle,
     Embed,
+    Guild,
     Interaction,
+    Member,
+    Message,
     Role,
     SelectOption,
     SlashOption,
     slash_command,
 )
+from nextcord.errors import NotFound
 from nextcord.ext.commands import Bot, Cog
 from nextcord.ui import Button, Select, View, button
 
@@ -28,6 +33,9 @@ from domain import (
     Standby,
 )
 from utils import util_functions as uf
+from utils.guild_config import guild_config
+from utils.resolver import resolver
+from utils.outbox import Priority, outbox
 
 logger = logging.getLogger(__name__)
 
@@ -63,12 +71,15 @@ GENERAL_INFO = (
 DELIMITERS = {"clan": "Clans", "opt-in": "Opt-in", "color": "Colors"}
 
 MAX_SELECT_MENU_SIZE = 24
+INACTIVITY_LIMIT = timedelta(days=30)
+VERIFIED_ROLE_NAMES = ["Alliance", "Community"]
 
 
 # TODO: Check if this still works?
 class Rules(Cog):
     def __init__(self) -> None:
         self.standby = Standby()
+        self.unverified_synced = False
         self.kick_inactives.start()
 
     @slash_command(
@@ -97,23 +108,27 @@ class Rules(Cog):
                 separated properly.
         """
         logger.info("Creating rules channel")
-        rules_ch = uf.get_channel(ChannelName.RULES)
+        rules_ch = uf.get_channel(ChannelName.RULES, interaction.guild)
         await interaction.send(
             f"Creation process starting in {rules_ch.mention}",
             ephemeral=True,
         )
-        await rules_ch.send(URL.GITHUB_STATIC + "/images/Ginny_Welcome.png")
+        await outbox.send(
+            rules_ch,
+            URL.GITHUB_STATIC + "/images/Ginny_Welcome.png",
+            priority=Priority.INTERACTION,
+        )
         await asyncio.sleep(delay)
 
         rules_embed = Embed(color=Color.VIE_PURPLE)
         rules_embed.title = r"__RULES__"
         rules_embed.description = f"\n{EMPTY_STRING}\n".join(RULES_LIST)
-        await rules_ch.send(embed=rules_embed)
+        await outbox.send(rules_ch, embed=rules_embed, priority=Priority.INTERACTION)
 
         info_embed = Embed(color=Color.VIE_PURPLE)
         info_embed.title = r"__GENERAL INFO__"
         info_embed.description = GENERAL_INFO
-        await rules_ch.send(embed=info_embed)
+        await outbox.send(rules_ch, embed=info_embed, priority=Priority.INTERACTION)
         await asyncio.sleep(delay)
 
         alli_embed = Embed(color=Color.VIE_PURPLE)
@@ -124,11 +139,13 @@ class Rules(Cog):
         )
 
         view = StepOneView()
-        alli_msg = await rules_ch.send(
+        alli_msg = await outbox.send(
+            rules_ch,
             "__***Please carefully read the posts below "
             "or you will not gain full access to the server***__",
             embed=alli_embed,
             view=view,
+            priority=Priority.INTERACTION,
         )
         await view.record(alli_msg)
 
@@ -139,9 +156,11 @@ class Rules(Cog):
             "Step 2 - If you're part of the Warframe alliance, "
             "use the menu below to select your clan."
         )
-        params = {"role_type": "clan"}
+        params = {"role_type": "clan", "guild_id": interaction.guild_id}
         view = RoleChoiceView(params)
-        clan_msg = await rules_ch.send(embed=clan_embed, view=view)
+        clan_msg = await outbox.send(
+            rules_ch, embed=clan_embed, view=view, priority=Priority.INTERACTION
+        )
         await view.record(clan_msg)
         await asyncio.sleep(delay)
 
@@ -150,8 +169,10 @@ class Rules(Cog):
             "Step 3 - Use the menu below if you want to be notified for things like "
             "updates, events and giveaways, or to access certain opt-in channels."
         )
-        view = OptInView()
-        opt_msg = await rules_ch.send(embed=opt_embed, view=view)
+        view = OptInView({"guild_id": interaction.guild_id})
+        opt_msg = await outbox.send(
+            rules_ch, embed=opt_embed, view=view, priority=Priority.INTERACTION
+        )
         await view.record(opt_msg)
 
         color_embed = Embed(color=Color.VIE_PURPLE)
@@ -159,17 +180,21 @@ class Rules(Cog):
             "Step 4 - Use the menu below if you want a different display color "
             "than the one provided by your clan"
         )
-        params = {"role_type": "color"}
+        params = {"role_type": "color", "guild_id": interaction.guild_id}
         view = RoleChoiceView(params)
-        color_msg = await rules_ch.send(embed=color_embed, view=view)
+        color_msg = await outbox.send(
+            rules_ch, embed=color_embed, view=view, priority=Priority.INTERACTION
+        )
         await view.record(color_msg)
         await asyncio.sleep(delay)
 
-        general = uf.get_channel("general")
-        await rules_ch.send(
+        general = uf.get_channel("general", interaction.guild)
+        await outbox.send(
+            rules_ch,
             "You should now have access to all necessary channels in the server!\n"
             f"Why not pop over to {general.mention} and say hi? "
             "You probably have a few welcomes waiting already.",
+            priority=Priority.INTERACTION,
         )
 
     @rule.subcommand(description="Add a new rule to the post")
@@ -180,8 +205,7 @@ class Rules(Cog):
     ) -> None:
         """Add a rule."""
         logger.info("Adding rule")
-        rules_ch = uf.get_channel(ChannelName.RULES)
-        rules_msg = await rules_ch.fetch_message(ID.RULES_MESSAGE)
+        rules_msg = await get_rules_message(interaction.guild)
         embed = rules_msg.embeds[0]
         rules = re.split(rf"\n{EMPTY_STRING}\n", embed.description)
         rules = [re.sub(r"^\d+\. ", "", rule) for rule in rules]
@@ -215,8 +239,7 @@ class Rules(Cog):
             number (int): Number of the rule to remove
         """
         logger.info("Removing rule")
-        rules_ch = uf.get_channel(ChannelName.RULES)
-        rules_msg = await rules_ch.fetch_message(ID.RULES_MESSAGE)
+        rules_msg = await get_rules_message(interaction.guild)
         embed = rules_msg.embeds[0]
         rules = re.split(rf"\n{EMPTY_STRING}\n", embed.description)
         if number > len(rules):
@@ -242,8 +265,7 @@ class Rules(Cog):
         new_text: str = SlashOption(description="New text of the rule"),
     ) -> None:
         """Edit an existing rule."""
-        rules_ch = uf.get_channel(ChannelName.RULES)
-        rules_msg = await rules_ch.fetch_message(ID.RULES_MESSAGE)
+        rules_msg = await get_rules_message(interaction.guild)
         embed = rules_msg.embeds[0]
         rules = re.split(rf"\n{EMPTY_STRING}\n", embed.description)
 
@@ -257,31 +279,65 @@ class Rules(Cog):
         await rules_msg.edit(embed=embed)
         await interaction.send("Rule successfully edited", ephemeral=True)
 
+    @Cog.listener()
+    async def on_member_join(self, member: Member) -> None:
+        """Start tracking new members until they unlock the server."""
+        if member.guild == self.standby.guild and not member.bot:
+            await track_unverified_member(member)
+
+    @Cog.listener()
+    async def on_member_update(self, before: Member, after: Member) -> None:
+        """Update tracking when a member gains or loses access."""
+        if after.guild != self.standby.guild:
+            return
+        if after.bot or is_verified(before) == is_verified(after):
+            return
+        if is_verified(after):
+            await untrack_member(after.guild.id, after.id)
+        else:
+            await track_unverified_member(after)
+
+    @Cog.listener()
+    async def on_member_remove(self, member: Member) -> None:
+        """Stop tracking members who leave the server."""
+        if member.guild == self.standby.guild:
+            await untrack_member(member.guild.id, member.id)
+
     @uf.delayed_loop(hours=8)
     async def kick_inactives(self) -> None:
         """Kick inactive users.
 
         A user is considered inactive if they have been in the server
-        for more than 30 days without but do not have either the
-        "Alliance" or "Community" roles.
+        for more than 30 days but do not have either the "Alliance" or
+        "Community" roles. Unverified members are tracked as they join
+        and update, so only members whose deadline has passed are
+        processed here. Only the home guild has these roles, so other
+        guilds are left alone.
         """
+        guild = self.standby.guild
+        if not self.unverified_synced:
+            await sync_unverified_members(guild)
+            self.unverified_synced = True
+
         logger.debug("Checking for inactive members")
 
-        async for member in self.standby.guild.fetch_members():
-            if (
-                member.bot
-                or uf.get_role("Alliance") in member.roles
-                or (uf.get_role("Community") in member.roles)
-            ):
-                return
-            time = uf.now() - member.joined_at
-            if time.days < 30:  # noqa: PLR2004
-                return
+        overdue_ids = await get_overdue_member_ids(
+            guild.id,
+            uf.now() - INACTIVITY_LIMIT,
+        )
+        members = await resolver.members(overdue_ids, guild)
+        for user_id in overdue_ids:
+            member = members.get(user_id)
+            if member is None or member.bot or is_verified(member):
+                await untrack_member(guild.id, user_id)
+                continue
+
             discriminator = (
                 f"#{member.discriminator}" if member.discriminator != "0" else ""
             )
             try:
-                await member.send(
+                await outbox.send(
+                    member,
                     "Hi! You have been automatically kicked from the Vie for "
                     "the Void Discord as you have failed to read our rules and "
                     "unlock the full server within 30 days. If this was "
@@ -295,8 +351,10 @@ class Rules(Cog):
 
             try:
                 maint = await self.standby.bot.fetch_channel(ID.ERROR_CHANNEL)
-                await maint.send(
+                await outbox.send(
+                    maint,
                     f"{member.name}{discriminator} has been kicked due to inactivity.",
+                    priority=Priority.LOG,
                 )
             except Exception:
                 logger.exception("Error channel not found")
@@ -307,6 +365,126 @@ class Rules(Cog):
                 logger.exception(
                     f"{member.name}{discriminator} couldn't be kicked",
                 )
+            else:
+                await untrack_member(guild.id, user_id)
+
+
+async def get_rules_message(guild: Guild) -> Message:
+    """Get the message listing the rules of a guild."""
+    rules_ch = uf.get_channel(ChannelName.RULES, guild)
+    return await rules_ch.fetch_message(guild_config.get_id(guild.id, ID.RULES_MESSAGE))
+
+
+def get_view_guild(params: dict) -> Guild | None:
+    """Get the guild a view was posted in.
+
+    Views recorded before they stored their guild are all in the home
+    guild.
+    """
+    return Standby().bot.get_guild(params.get("guild_id", ID.GUILD))
+
+
+def is_verified(member: Member) -> bool:
+    """Check whether a member has unlocked the full server."""
+    return any(role.name in VERIFIED_ROLE_NAMES for role in member.roles)
+
+
+async def track_unverified_member(member: Member) -> None:
+    """Add a member to the unverified member queue."""
+    standby = Standby()
+    await standby.pg_pool.execute(
+        f"""
+        INSERT INTO
+            {standby.schema}.unverified_member (guild_id, user_id, joined_at)
+        VALUES
+            ($1, $2, $3)
+        ON CONFLICT ON CONSTRAINT unverified_member_pkey DO NOTHING
+        """,
+        member.guild.id,
+        member.id,
+        member.joined_at or uf.now(),
+    )
+
+
+async def untrack_member(guild_id: int, user_id: int) -> None:
+    """Remove a member from the unverified member queue."""
+    standby = Standby()
+    await standby.pg_pool.execute(
+        f"""
+        DELETE FROM {standby.schema}.unverified_member
+        WHERE
+            guild_id = $1
+            AND user_id = $2
+        """,
+        guild_id,
+        user_id,
+    )
+
+
+async def get_overdue_member_ids(guild_id: int, joined_before: datetime) -> list[int]:
+    """Get IDs of unverified members who joined before the cutoff."""
+    standby = Standby()
+    records = await standby.pg_pool.fetch(
+        f"""
+        SELECT
+            user_id
+        FROM
+            {standby.schema}.unverified_member
+        WHERE
+            guild_id = $1
+            AND joined_at < $2
+        ORDER BY
+            joined_at
+        """,
+        guild_id,
+        joined_before,
+    )
+    return [record["user_id"] for record in records]
+
+
+async def sync_unverified_members(guild: Guild) -> None:
+    """Reconcile the unverified member queue with the member cache.
+
+    Catches members who joined or were verified while the bot was
+    offline. Uses the gateway member cache, so no REST calls are made.
+    Stale rows are only dropped when the cache holds every member.
+    """
+    logger.info("Syncing unverified member queue")
+    standby = Standby()
+    unverified = [
+        member
+        for member in guild.members
+        if not member.bot and not is_verified(member) and member.joined_at
+    ]
+    user_ids = [member.id for member in unverified]
+
+    await standby.pg_pool.execute(
+        f"""
+        INSERT INTO
+            {standby.schema}.unverified_member (guild_id, user_id, joined_at)
+        SELECT
+            $1::BIGINT,
+            *
+        FROM
+            UNNEST($2::BIGINT[], $3::TIMESTAMPTZ[])
+        ON CONFLICT ON CONSTRAINT unverified_member_pkey DO NOTHING
+        """,
+        guild.id,
+        user_ids,
+        [member.joined_at for member in unverified],
+    )
+
+    if guild.chunked:
+        await standby.pg_pool.execute(
+            f"""
+            DELETE FROM {standby.schema}.unverified_member
+            WHERE
+                guild_id = $1
+                AND NOT user_id = ANY ($2::BIGINT[])
+            """,
+            guild.id,
+            user_ids,
+        )
 
 
 class StepOneView(uf.PersistentView):
@@ -327,8 +505,8 @@ class StepOneView(uf.PersistentView):
 
         async def callback(self, interaction: Interaction) -> None:
             """Trigger when the button is pressed."""
-            alli = uf.get_role("Alliance")
-            comm = uf.get_role("Community")
+            alli = uf.get_role("Alliance", interaction.guild)
+            comm = uf.get_role("Community", interaction.guild)
 
             await interaction.user.remove_roles(comm)
             await interaction.user.add_roles(alli)
@@ -347,12 +525,15 @@ class StepOneView(uf.PersistentView):
             """Trigger when the button is pressed."""
             await interaction.response.defer()
 
-            alli = uf.get_role("Alliance")
-            comm = uf.get_role("Community")
+            alli = uf.get_role("Alliance", interaction.guild)
+            comm = uf.get_role("Community", interaction.guild)
             await interaction.user.remove_roles(alli)
             await interaction.user.add_roles(comm)
 
-            all_clan_roles = uf.get_roles_by_type(DELIMITERS["clan"])
+            all_clan_roles = uf.get_roles_by_type(
+                DELIMITERS["clan"],
+                interaction.guild,
+            )
             await interaction.user.remove_roles(*all_clan_roles)
 
 
@@ -365,7 +546,7 @@ class RoleChoiceView(uf.PersistentView):
         self.choice = None
         role_type = params.get("role_type", "clan")
         type_delimiter = DELIMITERS[role_type]
-        all_roles = uf.get_roles_by_type(type_delimiter)
+        all_roles = uf.get_roles_by_type(type_delimiter, get_view_guild(params))
         all_roles.sort(key=uf.role_priority)
         num_groups = ceil(len(all_roles) / MAX_SELECT_MENU_SIZE)
         group_size = ceil(len(all_roles) / num_groups)
@@ -418,7 +599,7 @@ class RoleChoiceView(uf.PersistentView):
             """Trigger when the button is pressed."""
             await interaction.response.defer()
             if self.role_type == "clan" and self.view.choice != "None":
-                alli = uf.get_role("Alliance")
+                alli = uf.get_role("Alliance", interaction.guild)
                 if alli not in interaction.user.roles:
                     await interaction.send(
                         "Please confirm you're part of the Warframe alliance in Step 1 "
@@ -427,10 +608,13 @@ class RoleChoiceView(uf.PersistentView):
                     )
                     return
 
-            all_roles_of_type = uf.get_roles_by_type(DELIMITERS[self.role_type])
+            all_roles_of_type = uf.get_roles_by_type(
+                DELIMITERS[self.role_type],
+                interaction.guild,
+            )
             await interaction.user.remove_roles(*all_roles_of_type)
             if self.view.choice != "None":
-                role = uf.get_role(self.view.choice)
+                role = uf.get_role(self.view.choice, interaction.guild)
                 await interaction.user.add_roles(role)
 
 
@@ -438,8 +622,12 @@ class OptInView(uf.PersistentView):
     """Dropdown menu(s) for opt-in roles."""
 
     def __init__(self, params: dict | None = None) -> None:
-        super().__init__()
-        opt_in_roles = uf.get_roles_by_type(DELIMITERS["opt-in"])
+        params = params or {}
+        super().__init__(params)
+        opt_in_roles = uf.get_roles_by_type(
+            DELIMITERS["opt-in"],
+            get_view_guild(params),
+        )
         groups = [
             opt_in_roles[i : i + MAX_SELECT_MENU_SIZE]
             for i in range(0, len(opt_in_roles), MAX_SELECT_MENU_SIZE)
@@ -482,7 +670,7 @@ class OptInView(uf.PersistentView):
         """
         for role_list in self.selected_roles:
             for role_name in role_list:
-                role = uf.get_role(role_name)
+                role = uf.get_role(role_name, interaction.guild)
                 if role:
                     await interaction.user.add_roles(role)
 
@@ -494,7 +682,7 @@ class OptInView(uf.PersistentView):
         """
         for role_list in self.selected_roles:
             for role_name in role_list:
-                role = uf.get_role(role_name)
+                role = uf.get_role(role_name, interaction.guild)
                 if role:
                     await interaction.user.remove_roles(role)
 
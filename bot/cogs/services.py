@@ -2,6 +2,7 @@
 
 import logging
 import re
+from datetime import timedelta
 
 import aiohttp
 from nextcord import (
@@ -16,14 +17,38 @@ from nextcord import (
 from nextcord.ext.commands import Bot, Cog
 
 import utils.util_functions as uf
-from domain import ID, Color, Standby
+from domain import Color, Standby
+from utils.cache import TTLCache
+from utils.reactions import ReactionRoute, dispatcher
 
 logger = logging.getLogger(__name__)
 
+URBAN_API = "https://api.urbandictionary.com/v0/define"
+URBAN_REACTIONS = ["⬅️", "➡️", "🇽"]
+URBAN_PAGE_TTL = timedelta(days=1)
+
+urban_definitions: TTLCache[str, list[dict]] = TTLCache(
+    ttl=timedelta(hours=1),
+    maxsize=256,
+)
+URBAN_PAGE_LIMIT = 1024
+
+urban_pages: TTLCache[int, tuple[str, int]] = TTLCache(
+    ttl=URBAN_PAGE_TTL,
+    maxsize=URBAN_PAGE_LIMIT,
+)
+
 
 class Services(Cog):
     def __init__(self) -> None:
         self.standby = Standby()
+        dispatcher.add_route(
+            ReactionRoute(
+                handler=self.page_urban,
+                emojis=set(URBAN_REACTIONS),
+                messages=urban_pages,
+            ),
+        )
 
     @slash_command(description="Displays a user's profile picture.")
     async def avatar(
@@ -48,49 +73,78 @@ class Services(Cog):
         query: str = SlashOption(description="The word or phase to look up"),
     ) -> None:
         """Look up a word or phrase in Urban Dictionary."""
-        response = await urban_embed(query, 1)
-        if isinstance(response, Embed):
-            await interaction.send(embed=response)
-            message = await interaction.original_message()
-            await message.add_reaction("⬅️")
-            await message.add_reaction("➡️")
-            await message.add_reaction("🇽")
-        elif isinstance(response, str):
-            await interaction.send(response)
-
-    @Cog.listener()
-    async def on_raw_reaction_add(self, event: RawReactionActionEvent) -> None:
+        definitions = await get_definitions(query)
+        if isinstance(definitions, str):
+            await interaction.send(definitions)
+            return
+        await interaction.send(embed=definition_embed(definitions, 1))
+        message = await interaction.original_message()
+        urban_pages[message.id] = (query, 1)
+        await save_urban_page(message.id, interaction.guild_id, query, 1)
+        for reaction in URBAN_REACTIONS:
+            await message.add_reaction(reaction)
+
+    async def page_urban(self, event: RawReactionActionEvent) -> None:
         """Manipulate Urban Dictionary embeds using reactions."""
-        channel = Standby().bot.get_channel(event.channel_id)
-        try:
-            message = await channel.fetch_message(event.message_id)
-            if (
-                event.user_id != ID.BOT
-                and not event.member.bot
-                and message.embeds
-                and message.embeds[0]
-                and str(message.embeds[0].title).startswith("Page")
-                and event.emoji.name in ["⬅️", "➡️", "🇽"]
-            ):
-                if event.emoji.name == "🇽":
-                    await message.clear_reaction("⬅️")
-                    await message.clear_reaction("➡️")
-                    await message.clear_reaction("🇽")
-                else:
-                    embed = message.embeds[0]
-                    title = embed.title
-                    match = re.search(r"Page (\d+)/(\d+)", title)
-                    page, pages = int(match.group(1)), int(match.group(2))
-                    query = re.search(r"\[(.*)\]", embed.fields[0].value).group(1)
-                    user = message.guild.get_member(event.user_id)
-                    if event.emoji.name == "⬅️" and page > 1:
-                        embed = await urban_embed(query, page - 1)
-                    elif event.emoji.name == "➡️" and page < pages:
-                        embed = await urban_embed(query, page + 1)
-                    await message.remove_reaction(event.emoji, user)
-                    await message.edit(embed=embed)
-        except Exception:
-            logger.exception("Unexpected error")
+        if event.member is None or event.member.bot:
+            return
+
+        channel = self.standby.bot.get_channel(event.channel_id)
+        message = channel.get_partial_message(event.message_id)
+        if event.emoji.name == "🇽":
+            urban_pages.pop(event.message_id)
+            await delete_urban_page(event.message_id, event.guild_id)
+            for reaction in URBAN_REACTIONS:
+                await message.clear_reaction(reaction)
+            return
+
+        query, page = urban_pages.get(event.message_id)
+        await message.remove_reaction(event.emoji, event.member)
+        definitions = await get_definitions(query)
+        if isinstance(definitions, str):
+            return
+        if event.emoji.name == "⬅️" and page > 1:
+            page -= 1
+        elif event.emoji.name == "➡️" and page < len(definitions):
+            page += 1
+        else:
+            return
+        urban_pages[event.message_id] = (query, page)
+        await save_urban_page(event.message_id, event.guild_id, query, page)
+        await message.edit(embed=definition_embed(definitions, page))
+
+    async def restore_urban_pages(self) -> None:
+        """Resume paging of Urban Dictionary embeds after a restart.
+
+        Pages idle for longer than URBAN_PAGE_TTL are forgotten.
+        """
+        await self.standby.pg_pool.execute(
+            f"""
+            DELETE FROM {self.standby.schema}.urban_page
+            WHERE
+                updated_at < NOW() - $1::INTERVAL
+            """,
+            URBAN_PAGE_TTL,
+        )
+        records = await self.standby.pg_pool.fetch(
+            f"""
+            SELECT
+                message_id,
+                query,
+                page
+            FROM
+                {self.standby.schema}.urban_page
+            ORDER BY
+                updated_at DESC
+            LIMIT
+                $1
+            """,
+            URBAN_PAGE_LIMIT,
+        )
+        # Oldest first, so the most recent pages are evicted last
+        for record in reversed(records):
+            urban_pages[record["message_id"]] = (record["query"], record["page"])
+        logger.info(f"Restored {len(records)} Urban Dictionary pages")
 
 
 def avatar_embed(user: Member) -> Embed:
@@ -104,52 +158,111 @@ def avatar_embed(user: Member) -> Embed:
     return embed
 
 
-async def urban_embed(query: str, page: int) -> Embed | str:
-    """Create an embed for an Urban Dictionary definition.
+async def save_urban_page(
+    message_id: int,
+    guild_id: int,
+    query: str,
+    page: int,
+) -> None:
+    """Store the query and page of an Urban Dictionary embed."""
+    standby = Standby()
+    await standby.pg_pool.execute(
+        f"""
+        INSERT INTO
+            {standby.schema}.urban_page (guild_id, message_id, query, page)
+        VALUES
+            ($1, $2, $3, $4)
+        ON CONFLICT ON CONSTRAINT urban_page_pkey DO UPDATE
+        SET
+            page = EXCLUDED.page,
+            updated_at = NOW()
+        """,
+        guild_id,
+        message_id,
+        query,
+        page,
+    )
+
+
+async def delete_urban_page(message_id: int, guild_id: int) -> None:
+    """Stop tracking an Urban Dictionary embed."""
+    standby = Standby()
+    await standby.pg_pool.execute(
+        f"""
+        DELETE FROM {standby.schema}.urban_page
+        WHERE
+            guild_id = $1
+            AND message_id = $2
+        """,
+        guild_id,
+        message_id,
+    )
+
+
+async def get_definitions(query: str) -> list[dict] | str:
+    """Get the Urban Dictionary definitions of a word or phrase.
+
+    Results are cached for an hour, so paging through them does not
+    require any further requests.
 
     Args:
         query (str): Phrase to look up
+
+    Returns:
+        list[dict] | str: Definition entries (if found). Otherwise, an
+            error message.
+    """
+    key = query.casefold().strip()
+    if definitions := urban_definitions.get(key):
+        return definitions
+
+    async with (
+        aiohttp.ClientSession() as cs,
+        cs.get(URBAN_API, params={"term": query}) as r,
+    ):
+        data = await r.json()
+    if "error" in data:
+        return "Server is not responding, please try again later."
+    if len(data["list"]) == 0:
+        return "No definition found."
+    urban_definitions[key] = data["list"]
+    return data["list"]
+
+
+def definition_embed(entries: list[dict], page: int) -> Embed:
+    """Create an embed for a page of Urban Dictionary definitions.
+
+    Args:
+        entries (list[dict]): All definition entries for a query
         page (int): Page to display
 
     Returns:
-        Embed | str: Embed containing the definition (if found).
-            Otherwise, an error message.
+        Embed: Embed containing the definition
     """
-    async with aiohttp.ClientSession() as cs:
-        api_link = f"https://api.urbandictionary.com/v0/define?term={query}"
-        async with cs.get(api_link) as r:
-            data = await r.json()
-            if "error" in data:
-                return "Server is not responding, please try again later."
-            if len(data["list"]) > 0:
-                entries = data["list"]
-                pages = len(entries)
-                entry = entries[page - 1]
-                embed = Embed(color=Color.DARK_ORANGE)
-                embed.title = f"Page {page}/{pages}"
-                word = entry["word"]
-                web_link = f"https://www.urbandictionary.com/define.php?term={word}"
-                web_link = re.sub(" ", "%20", web_link)
-                embed.add_field(
-                    name="Word",
-                    value=f"[{word}]({web_link})",
-                    inline=False,
-                )
-                embed.add_field(
-                    name="Definition",
-                    value=entry["definition"][:1018] + " [...]",
-                    inline=False,
-                )
-                embed.add_field(name="Example", value=entry["example"], inline=False)
-                embed.add_field(name="Author", value=entry["author"], inline=False)
-                embed.add_field(
-                    name="Rating",
-                    inline=False,
-                    value=f"{entry['thumbs_up']} :thumbsup: / "
-                    f"{entry['thumbs_down']} :thumbsdown:",
-                )
-                return embed
-            return "No definition found."
+    entry = entries[page - 1]
+    embed = Embed(color=Color.DARK_ORANGE)
+    embed.title = f"Page {page}/{len(entries)}"
+    word = entry["word"]
+    web_link = f"https://www.urbandictionary.com/define.php?term={word}"
+    web_link = re.sub(" ", "%20", web_link)
+    embed.add_field(
+        name="Word",
+        value=f"[{word}]({web_link})",
+        inline=False,
+    )
+    embed.add_field(
+        name="Definition",
+        value=entry["definition"][:1018] + " [...]",
+        inline=False,
+    )
+    embed.add_field(name="Example", value=entry["example"], inline=False)
+    embed.add_field(name="Author", value=entry["author"], inline=False)
+    embed.add_field(
+        name="Rating",
+        inline=False,
+        value=f"{entry['thumbs_up']} :thumbsup: / {entry['thumbs_down']} :thumbsdown:",
+    )
+    return embed
 
 
 def setup(bot: Bot) -> None:
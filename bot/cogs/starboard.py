@@ -2,6 +2,7 @@
 
 import asyncio
 import logging
+from datetime import timedelta
 
 from nextcord import (
     Embed,
@@ -12,120 +13,143 @@ from nextcord import (
 )
 from nextcord.ext.commands import Bot, Cog
 
-from domain import ID, Color, Standby
-from utils import util_functions as uf
+from domain import ID, Color, Standby, ValidTextChannel
+from utils.cache import TTLCache
+from utils.guild_config import guild_config
+from utils.outbox import outbox
+from utils.reactions import ReactionRoute, dispatcher
 
 logger = logging.getLogger(__name__)
 
-ReactionEvent = (
-    RawReactionActionEvent | RawReactionClearEmojiEvent | RawReactionClearEvent
-)
 STARBOARD_THRESHOLD = 4
 
 starboard_lock = asyncio.Lock()
 standby = Standby()
 
+# Star counts of recently starred messages, so stars on messages far
+# from the threshold can be counted without fetching the message
+star_counts: TTLCache[int, int] = TTLCache(ttl=timedelta(days=1), maxsize=4096)
+
 
 class Starboard(Cog):
     def __init__(self) -> None:
         self.standby = Standby()
-
-    @Cog.listener()
-    async def on_raw_reaction_add(self, event: RawReactionActionEvent) -> None:
-        """Called any time a user adds a reaction."""
-        logger.debug("react")
-        if event.emoji.name != "⭐":  # or event.user_id == event.message_id:
-            return
-        logger.debug("star")
-        await starboard_lock.acquire()
-
-        logger.debug("Star react added")
-        channel = standby.bot.get_channel(event.channel_id)
-        message = await channel.fetch_message(event.message_id)
-
-        stars = next(emoji.count for emoji in message.reactions if emoji.emoji == "⭐")
-        if stars < STARBOARD_THRESHOLD:
-            starboard_lock.release()
-            return
-
-        if stars == STARBOARD_THRESHOLD:
-            starboard = standby.bot.get_channel(ID.STARBOARD)
-            starboard_message = await starboard.send(
-                embed=starboard_embed(message, stars),
+        dispatcher.add_route(
+            ReactionRoute(handler=self.star_added, emojis={"⭐"}),
+        )
+        dispatcher.add_route(
+            ReactionRoute(handler=self.star_removed, events={"remove"}, emojis={"⭐"}),
+        )
+        dispatcher.add_route(
+            ReactionRoute(
+                handler=self.stars_cleared,
+                events={"clear_emoji"},
+                emojis={"⭐"},
+            ),
+        )
+        dispatcher.add_route(
+            ReactionRoute(handler=self.stars_cleared, events={"clear"}),
+        )
+
+    async def star_added(self, event: RawReactionActionEvent) -> None:
+        """Called any time a user adds a star reaction."""
+        async with starboard_lock:
+            logger.debug("Star react added")
+            stars = star_counts.get(event.message_id)
+            if stars is not None and stars + 1 < STARBOARD_THRESHOLD:
+                star_counts[event.message_id] = stars + 1
+                return
+
+            channel = standby.bot.get_channel(event.channel_id)
+            message = await channel.fetch_message(event.message_id)
+            stars = count_stars(message)
+            star_counts[message.id] = stars
+            if stars < STARBOARD_THRESHOLD:
+                return
+
+            if stars == STARBOARD_THRESHOLD:
+                starboard = get_starboard_channel(message.guild.id)
+                if starboard is None:
+                    return
+                starboard_message = await outbox.send(
+                    starboard,
+                    embed=starboard_embed(message, stars),
+                )
+                await record_starboard_message(message, starboard_message, stars)
+                return
+
+            starboard_message = await get_starboard_message(
+                message.id,
+                message.guild.id,
             )
+            await edit_stars(starboard_message, stars)
             await record_starboard_message(message, starboard_message, stars)
-            starboard_lock.release()
-            return
-
-        starboard_message = await get_starboard_message(message.id)
-
-        await edit_stars(starboard_message, stars)
-        await record_starboard_message(message, starboard_message, stars)
 
-        starboard_lock.release()
-
-    @Cog.listener()
-    async def on_raw_reaction_remove(self, event: RawReactionActionEvent) -> None:
-        """Called any time a user removes a reaction."""
-        if event.emoji.name != "⭐":  # or event.user_id == event.message_id:
-            return
-
-        await starboard_lock.acquire()
-
-        logger.debug("Star react removed")
-        channel = standby.bot.get_channel(event.channel_id)
-        message = await channel.fetch_message(event.message_id)
-
-        stars = 0
-        for emoji in message.reactions:
-            if emoji.emoji == "⭐":
-                stars = emoji.count
-
-        if stars < STARBOARD_THRESHOLD - 1:
-            starboard_lock.release()
-            return
+    async def star_removed(self, event: RawReactionActionEvent) -> None:
+        """Called any time a user removes a star reaction."""
+        async with starboard_lock:
+            logger.debug("Star react removed")
+            stars = star_counts.get(event.message_id)
+            if stars is not None and stars - 1 < STARBOARD_THRESHOLD - 1:
+                star_counts[event.message_id] = max(stars - 1, 0)
+                return
+
+            channel = standby.bot.get_channel(event.channel_id)
+            message = await channel.fetch_message(event.message_id)
+            stars = count_stars(message)
+            star_counts[message.id] = stars
+            if stars < STARBOARD_THRESHOLD - 1:
+                return
+
+            starboard_message = await get_starboard_message(
+                message.id,
+                message.guild.id,
+            )
+            if starboard_message is None:
+                return
 
-        starboard_message = await get_starboard_message(message.id)
+            if stars == STARBOARD_THRESHOLD - 1:
+                await starboard_message.delete()
+                await delete_recorded_starboard_message(message.id, message.guild.id)
+                return
 
-        if stars == STARBOARD_THRESHOLD - 1:
-            await starboard_message.delete()
-            await delete_recorded_starboard_message(message.id)
-            starboard_lock.release()
-            return
+            await edit_stars(starboard_message, stars)
+            await record_starboard_message(message, starboard_message, stars)
 
-        await edit_stars(starboard_message, stars)
-        await record_starboard_message(message, starboard_message, stars)
+    async def stars_cleared(
+        self,
+        event: RawReactionClearEvent | RawReactionClearEmojiEvent,
+    ) -> None:
+        """Called when a message's (star) reactions are cleared."""
+        async with starboard_lock:
+            star_counts.pop(event.message_id)
+            await clear_starboard_message(event.message_id, event.guild_id)
 
-        starboard_lock.release()
 
-    @Cog.listener()
-    async def on_raw_reaction_clear(self, event: RawReactionClearEvent) -> None:
-        """Called when all reactions are cleared from a message."""
-        async with starboard_lock:
-            await clear_starboard_message(event.message_id)
+def count_stars(message: Message) -> int:
+    """Count the star reactions on a message."""
+    for reaction in message.reactions:
+        if reaction.emoji == "⭐":
+            return reaction.count
+    return 0
 
-    @Cog.listener()
-    async def on_raw_reaction_clear_emoji(
-        self,
-        event: RawReactionClearEmojiEvent,
-    ) -> None:
-        """Called when all reactions of a certain emoji are cleared."""
-        if event.emoji.name != "⭐":
-            return
 
-        async with starboard_lock:
-            await clear_starboard_message(event.message_id)
+def get_starboard_channel(guild_id: int) -> ValidTextChannel | None:
+    """Get the starboard channel configured for a guild, if any."""
+    starboard_id = guild_config.get_id(guild_id, ID.STARBOARD)
+    return standby.bot.get_channel(starboard_id or 0)
 
 
-async def get_starboard_message(message_id: int) -> Message:
+async def get_starboard_message(message_id: int, guild_id: int) -> Message | None:
     """Get a starboard message.
 
     Args:
         message_id (int): ID of the message that was added to
             the starboard
+        guild_id (int): ID of the guild the message was sent in
 
     Returns:
-        Message: The corresponding starboard message.
+        Message | None: The corresponding starboard message, if any.
     """
     starboard_id = await standby.pg_pool.fetchval(
         f"""
@@ -134,10 +158,15 @@ async def get_starboard_message(message_id: int) -> Message:
         FROM
             {standby.schema}.starboard
         WHERE
-            message_id = {message_id}
+            guild_id = {guild_id}
+            AND message_id = {message_id}
         """,
     )
-    starboard_channel = uf.get_channel("starboard")
+    if starboard_id is None:
+        return None
+    starboard_channel = get_starboard_channel(guild_id)
+    if starboard_channel is None:
+        return None
     return await starboard_channel.fetch_message(starboard_id)
 
 
@@ -179,9 +208,16 @@ async def record_starboard_message(
     standby = Standby()
     await standby.pg_pool.execute(f"""
         INSERT INTO
-            {standby.schema}.starboard (user_id, message_id, starboard_id, stars)
+            {standby.schema}.starboard (
+                guild_id,
+                user_id,
+                message_id,
+                starboard_id,
+                stars
+            )
         VALUES
             (
+                {original_message.guild.id},
                 {original_message.author.id},
                 {original_message.id},
                 {starboard_message.id},
@@ -193,13 +229,17 @@ async def record_starboard_message(
         """)
 
 
-async def delete_recorded_starboard_message(original_message_id: int) -> None:
+async def delete_recorded_starboard_message(
+    original_message_id: int,
+    guild_id: int,
+) -> None:
     """Remove the database entry for the provided message."""
     standby = Standby()
     await standby.pg_pool.execute(f"""
         DELETE FROM {standby.schema}.starboard
         WHERE
-            message_id = {original_message_id}
+            guild_id = {guild_id}
+            AND message_id = {original_message_id}
         """)
 
 
@@ -215,11 +255,13 @@ async def edit_stars(message: Message | None, stars: int) -> None:
     )
 
 
-async def clear_starboard_message(original_message_id: int) -> None:
+async def clear_starboard_message(original_message_id: int, guild_id: int) -> None:
     """Delete entry from the starboard table and starboard channel."""
-    starboard_message = await get_starboard_message(original_message_id)
+    starboard_message = await get_starboard_message(original_message_id, guild_id)
+    if starboard_message is None:
+        return
     await starboard_message.delete()
-    await delete_recorded_starboard_message()
+    await delete_recorded_starboard_message(original_message_id, guild_id)
 
 
 def setup(bot: Bot) -> None:
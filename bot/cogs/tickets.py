@@ -1,13 +1,15 @@
 """Creation and managing of user tickets to the mod team."""
 
+import asyncio
 import logging
+import os
 
 from nextcord import (
     ButtonStyle,
     CategoryChannel,
     Embed,
+    File,
     Interaction,
-    Message,
     PermissionOverwrite,
     TextChannel,
     slash_command,
@@ -24,6 +26,9 @@ from domain import (
     Standby,
 )
 from utils import util_functions as uf
+from utils.outbox import Priority, outbox
+from utils.resolver import resolver
+from utils.transcript import export_transcript
 
 logger = logging.getLogger(__name__)
 
@@ -42,7 +47,7 @@ RESOLVED_MESSAGE = (
     "This ticket has been marked as resolved. If this was a mistake or you have"
     " additional questions, use the button below to reopen the ticket.\n"
     "For other issues, please create a new ticket in XXX.\n Moderators can use "
-    "the Scrap button to scrap this ticket. (Scrapping takes a while to complete)"
+    "the Scrap button to scrap this ticket."
 )
 REOPENED_MESSAGE = (
     "This ticket has been reopened. Once it is resolved, "
@@ -68,7 +73,7 @@ class Tickets(Cog):
         resolved_ticket_cat = await get_or_create_resolved_category(interaction)
         await interaction.channel.edit(category=resolved_ticket_cat)
 
-        claimable_channel = uf.get_channel(ChannelName.CLAIMABLE)
+        claimable_channel = uf.get_channel(ChannelName.CLAIMABLE, interaction.guild)
         view = ResolvedTicketView()
         await interaction.send(
             RESOLVED_MESSAGE.replace("XXX", claimable_channel.mention),
@@ -98,24 +103,14 @@ class Tickets(Cog):
         await interaction.send("Ticket system succesfully initiated", ephemeral=True)
 
 
-def get_tickets_log_embed(message: Message) -> Embed:
+def get_tickets_log_embed(channel: TextChannel, message_count: int) -> Embed:
     """Create an embed to log a finished ticket."""
     embed = Embed(color=Color.DARK_BLUE)
-    if message.attachments:
-        embed.set_image(url=message.attachments[0].url)
-    content_msg = "[Empty message]"
-    if len(message.content) > 0:
-        content_msg = message.content
-        max_length = 1800
-        if len(content_msg) > max_length:
-            content_msg = content_msg[0:max_length]
-            content_msg += " [Message too long to be logged]"
-    if message.author.display_avatar:
-        embed.set_thumbnail(url=message.author.display_avatar.url)
-    embed.title = message.author.name
-    embed.description = content_msg
-    embed.add_field(name="Channel", value=message.channel.name)
-    embed.add_field(name="Date", value=message.created_at)
+    embed.title = channel.name
+    embed.description = "The transcript of this ticket is attached."
+    embed.add_field(name="Messages", value=message_count)
+    embed.add_field(name="Opened", value=uf.dynamic_timestamp(channel.created_at))
+    embed.add_field(name="Scrapped", value=uf.dynamic_timestamp(uf.now()))
     return embed
 
 
@@ -126,18 +121,23 @@ async def create_claimable_channel(cat: CategoryChannel) -> None:
         reason="Making a claimable channel.",
     )
     logger.info("Creating claimable channel")
-    muted_role = uf.get_role("Muted")
+    muted_role = uf.get_role("Muted", cat.guild)
     if muted_role:
         await chnl.set_permissions(muted_role, send_messages=True)
     view = OpenTicketView()
-    msg = await chnl.send(CLAIMABLE_CHANNEL_MESSAGE, view=view)
+    msg = await outbox.send(
+        chnl,
+        CLAIMABLE_CHANNEL_MESSAGE,
+        view=view,
+        priority=Priority.INTERACTION,
+    )
     await view.record(msg)
 
 
 async def get_or_create_tickets_log(interaction: Interaction) -> TextChannel:
     """Get the ticket log channel. Create it if missing."""
     resolved_cat = await get_or_create_resolved_category(interaction)
-    tickets_log = uf.get_channel(ChannelName.TICKETS_LOG)
+    tickets_log = uf.get_channel(ChannelName.TICKETS_LOG, interaction.guild)
     if tickets_log is None:
         overwrites = {
             interaction.guild.default_role: PermissionOverwrite(read_messages=False),
@@ -150,7 +150,7 @@ async def get_or_create_tickets_log(interaction: Interaction) -> TextChannel:
             overwrites=overwrites,
         )
         for mod_role_name in RoleName.mod_role_names():
-            role = uf.get_role(mod_role_name)
+            role = uf.get_role(mod_role_name, interaction.guild)
             if role is not None:
                 await tickets_log.set_permissions(role, read_messages=True)
     return tickets_log
@@ -158,7 +158,10 @@ async def get_or_create_tickets_log(interaction: Interaction) -> TextChannel:
 
 async def get_or_create_claimable_category(interaction: Interaction) -> CategoryChannel:
     """Get the claimable tickets category. Create it if missing."""
-    claimable_ticket_cat = uf.get_category(CategoryName.CLAIMABLE_TICKETS)
+    claimable_ticket_cat = uf.get_category(
+        interaction.guild,
+        CategoryName.CLAIMABLE_TICKETS,
+    )
     if claimable_ticket_cat is None:
         logger.info("Creating claimable category")
         claimable_ticket_cat = await interaction.guild.create_category(
@@ -170,7 +173,7 @@ async def get_or_create_claimable_category(interaction: Interaction) -> Category
 
 async def get_or_create_active_category(interaction: Interaction) -> CategoryChannel:
     """Get the active ticket category. Create it if needed."""
-    active_ticket_cat = uf.get_category(CategoryName.ACTIVE_TICKETS)
+    active_ticket_cat = uf.get_category(interaction.guild, CategoryName.ACTIVE_TICKETS)
     if active_ticket_cat is None:
         logger.info("Creating active ticket category")
         active_ticket_cat = await interaction.guild.create_category(
@@ -182,7 +185,10 @@ async def get_or_create_active_category(interaction: Interaction) -> CategoryCha
 
 async def get_or_create_resolved_category(interaction: Interaction) -> CategoryChannel:
     """Get the resolved tickets category. Create it if needed."""
-    resolved_ticket_cat = uf.get_category(CategoryName.RESOLVED_TICKETS)
+    resolved_ticket_cat = uf.get_category(
+        interaction.guild,
+        CategoryName.RESOLVED_TICKETS,
+    )
     if resolved_ticket_cat is None:
         logger.info("Creating resolved ticket category")
         resolved_ticket_cat = await interaction.guild.create_category(
@@ -193,7 +199,7 @@ async def get_or_create_resolved_category(interaction: Interaction) -> CategoryC
 
 
 async def get_highest_num(interaction: Interaction) -> int:
-    """Get the current ticket number."""
+    """Get the highest number among the existing ticket channels."""
     active_ticket_cat = await get_or_create_active_category(interaction)
     resolved_ticket_cat = await get_or_create_resolved_category(interaction)
 
@@ -217,6 +223,56 @@ async def get_highest_num(interaction: Interaction) -> int:
     return num
 
 
+class TicketNumbers:
+    """Allocates ticket numbers from a database sequence.
+
+    nextval hands out every number exactly once, so tickets opened at
+    the same time never share a number. Before the sequence is used for
+    the first time, it is moved past the numbers of the existing ticket
+    channels, which is the only time those are looked at. The sequence
+    is never moved backwards, so a replica seeding it late cannot undo
+    numbers another replica has already handed out.
+    """
+
+    def __init__(self) -> None:
+        """Initialize ticket numbers."""
+        self.seeded = False
+        self.lock = asyncio.Lock()
+
+    async def seed(self, interaction: Interaction) -> None:
+        """Move a fresh sequence past the existing ticket numbers."""
+        standby = Standby()
+        sequence = f"{standby.schema}.ticket_number"
+        async with self.lock:
+            if self.seeded:
+                return
+            used = await standby.pg_pool.fetchval(f"SELECT is_called FROM {sequence}")
+            if not used:
+                highest = await get_highest_num(interaction)
+                if highest > 0:
+                    logger.info(f"Continuing ticket numbers after {highest}")
+                    await standby.pg_pool.execute(
+                        "SELECT setval($1::REGCLASS, GREATEST($2, "
+                        f"(SELECT last_value FROM {sequence})))",
+                        sequence,
+                        highest,
+                    )
+            self.seeded = True
+
+    async def next(self, interaction: Interaction) -> int:
+        """Allocate the number of a new ticket."""
+        if not self.seeded:
+            await self.seed(interaction)
+        standby = Standby()
+        return await standby.pg_pool.fetchval(
+            "SELECT nextval($1::REGCLASS)",
+            f"{standby.schema}.ticket_number",
+        )
+
+
+ticket_numbers = TicketNumbers()
+
+
 class OpenTicketView(uf.PersistentView):
     """View to create a new ticket."""
 
@@ -226,7 +282,7 @@ class OpenTicketView(uf.PersistentView):
     @button(style=ButtonStyle.green, label="Open ticket")
     async def create(self, button: Button, interaction: Interaction) -> None:  # noqa: ARG002
         """Button to create a new ticket."""
-        claimable_channel = uf.get_channel(ChannelName.CLAIMABLE)
+        claimable_channel = uf.get_channel(ChannelName.CLAIMABLE, interaction.guild)
         if interaction.channel != claimable_channel:
             await interaction.send(
                 f"This command can only be used in {claimable_channel.mention}.",
@@ -234,7 +290,7 @@ class OpenTicketView(uf.PersistentView):
             )
             return
 
-        issue_num = await get_highest_num(interaction) + 1
+        issue_num = await ticket_numbers.next(interaction)
 
         active_ticket_cat = await get_or_create_active_category(interaction)
         overwrites = {
@@ -248,11 +304,15 @@ class OpenTicketView(uf.PersistentView):
         )
         await ticket_chnl.set_permissions(interaction.user, read_messages=True)
         for mod_role_name in RoleName.mod_role_names():
-            role = uf.get_role(name=mod_role_name)
+            role = uf.get_role(mod_role_name, interaction.guild)
             if role is not None:
                 await ticket_chnl.set_permissions(role, read_messages=True)
 
-        await ticket_chnl.send(f"<@{interaction.user.id}> {CLAIMED_MESSAGE}")
+        await outbox.send(
+            ticket_chnl,
+            f"<@{interaction.user.id}> {CLAIMED_MESSAGE}",
+            priority=Priority.INTERACTION,
+        )
         await interaction.send(
             f"You can now head over to {ticket_chnl.mention}.",
             ephemeral=True,
@@ -275,6 +335,7 @@ class ResolvedTicketView(uf.PersistentView):
         await interaction.channel.edit(category=active_ticket_cat)
         await interaction.edit(view=ResolvedTicketView(disabled=True))
         await interaction.send(REOPENED_MESSAGE)
+        await resolver.chunk(interaction.guild)
         for user in interaction.channel.members:
             await interaction.channel.set_permissions(
                 user,
@@ -290,16 +351,27 @@ class ResolvedTicketView(uf.PersistentView):
             return
 
         await interaction.send("Scrapping in progress", ephemeral=True)
+        channel = interaction.channel
         tickets_log = await get_or_create_tickets_log(interaction)
-        msg_list = await interaction.channel.history(
-            limit=500,
-            oldest_first=True,
-        ).flatten()
-        for msg in msg_list:
-            emb = get_tickets_log_embed(msg)
-            await tickets_log.send(embed=emb)
-
-        await interaction.channel.delete()
+        transcript, count = await export_transcript(channel)
+        with transcript:
+            size = transcript.seek(0, os.SEEK_END)
+            transcript.seek(0)
+            if size > interaction.guild.filesize_limit:
+                await interaction.send(
+                    "The transcript of this ticket is too large to upload, "
+                    "so the ticket has not been scrapped",
+                    ephemeral=True,
+                )
+                return
+            await outbox.send(
+                tickets_log,
+                embed=get_tickets_log_embed(channel, count),
+                file=File(transcript, filename=f"{channel.name}.txt.gz"),
+                priority=Priority.LOG,
+            )
+
+        await channel.delete()
 
 
 def setup(bot: Bot) -> None:
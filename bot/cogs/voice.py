@@ -1,8 +1,18 @@
 """Voice related features."""
 
+import asyncio
 import logging
-
-from nextcord import Member, VoiceChannel, VoiceState
+from collections import defaultdict
+
+from nextcord import (
+    Guild,
+    HTTPException,
+    Member,
+    Role,
+    StageChannel,
+    VoiceChannel,
+    VoiceState,
+)
 from nextcord.ext.commands import Bot, Cog
 
 from domain import Standby
@@ -11,9 +21,100 @@ from utils import util_functions as uf
 logger = logging.getLogger(__name__)
 
 
+DEBOUNCE = 1.5
+
+
+class VoiceRoleReconciler:
+    """Keeps members' voice channel roles in line with their channel.
+
+    Voice state updates only record which channels a member left and
+    schedule a reconciliation. After a short delay, the member's
+    current voice state is read and all role changes are applied in a
+    single edit, so a member hopping between channels in quick
+    succession costs one request. Roles for channels without one are
+    created at most once, no matter how many members join at the same
+    time.
+    """
+
+    def __init__(self) -> None:
+        """Initialize reconciler."""
+        self.left: dict[int, set[str]] = defaultdict(set)
+        self.pending: dict[int, asyncio.Task] = {}
+        self.role_creations: dict[tuple[int, str], asyncio.Task[Role]] = {}
+
+    def schedule(
+        self,
+        member: Member,
+        left: VoiceChannel | StageChannel | None,
+    ) -> None:
+        """Queue a reconciliation for a member who changed channels.
+
+        Args:
+            member (Member): Member whose voice state changed
+            left (VoiceChannel | StageChannel | None): Channel the
+                member left
+        """
+        if left:
+            self.left[member.id].add(left.name)
+        if member.id not in self.pending:
+            self.pending[member.id] = asyncio.create_task(
+                self.reconcile(member.guild, member.id),
+            )
+
+    async def reconcile(self, guild: Guild, member_id: int) -> None:
+        """Apply a member's pending voice role changes in one edit."""
+        await asyncio.sleep(DEBOUNCE)
+        self.pending.pop(member_id, None)
+        left = self.left.pop(member_id, set())
+
+        member = guild.get_member(member_id)
+        if member is None:
+            return
+        channel = member.voice.channel if member.voice else None
+        current = channel.name if channel else None
+
+        roles = [
+            role
+            for role in member.roles
+            if not role.is_default() and (role.name not in left or role.name == current)
+        ]
+        try:
+            if current:
+                role = await self.get_or_create_role(guild, current)
+                if role not in roles:
+                    roles.append(role)
+
+            if set(roles) != {role for role in member.roles if not role.is_default()}:
+                logger.debug(f"Updating voice roles for {member}")
+                await member.edit(roles=roles)
+        except HTTPException:
+            logger.exception(f"Could not update voice roles for {member}")
+
+    async def get_or_create_role(self, guild: Guild, name: str) -> Role:
+        """Get the role for a voice channel, creating it if necessary.
+
+        Concurrent calls for the same name in the same guild share a
+        single creation.
+        """
+        key = (guild.id, name)
+        role = uf.get_role(name, guild)
+        task = self.role_creations.get(key)
+        if role:
+            self.role_creations.pop(key, None)
+            return role
+        if task is None or (
+            task.done() and (task.cancelled() or task.exception() is not None)
+        ):
+            logger.info(f"Creating voice channel role for {name}")
+            task = asyncio.create_task(guild.create_role(name=name, mentionable=True))
+            self.role_creations[key] = task
+        return await asyncio.shield(task)
+
+
 class Voice(Cog):
     def __init__(self) -> None:
         self.standby = Standby()
+        self.roles = VoiceRoleReconciler()
 
     @Cog.listener()
     async def on_voice_state_update(
@@ -29,19 +130,7 @@ class Voice(Cog):
         if before.channel == after.channel:
             return
 
-        if before.channel:
-            role = uf.get_role(before.channel.name)
-            if role:
-                await member.remove_roles(role)
-
-        if after.channel:
-            role = uf.get_role(after.channel.name)
-            if not role:
-                role = await member.guild.create_role(
-                    name=after.channel.name,
-                    mentionable=True,
-                )
-            await member.add_roles(role)
+        self.roles.schedule(member, before.channel)
 
     @Cog.listener()
     async def on_guild_channel_update(
@@ -55,7 +144,7 @@ class Voice(Cog):
         """
         if isinstance(after, VoiceChannel):
             logger.info(f"Voice channel renamed from {before.name} to {after.name}")
-            role = uf.get_role(before.name)
+            role = uf.get_role(before.name, before.guild)
             if role:
                 logger.info("Renaming voice channel role")
                 await role.edit(name=after.name)
@@ -70,7 +159,8 @@ class Voice(Cog):
             return
 
         logger.info(f"Voice channel {channel.name} deleted")
-        role = uf.get_role(channel.name)
+        self.roles.role_creations.pop((channel.guild.id, channel.name), None)
+        role = uf.get_role(channel.name, channel.guild)
         if role:
             logger.info(f"Deleting voice channel role for {channel.name}")
             await role.delete()
@@ -1,22 +1,28 @@
 """Standby class + various enums and constants."""
 
 import asyncio
+import functools
 import importlib
-import json
 import logging
 import os
+from collections.abc import Awaitable, Callable, Coroutine
+from contextvars import ContextVar
 from datetime import datetime, timedelta
 from enum import Enum, IntEnum, StrEnum, auto
 from pathlib import Path
-from typing import Self
+from types import ModuleType
+from typing import Any, Self
 
 import aiohttp
 import nextcord
 from asyncpg import Pool
-from nextcord import Guild, Intents
-from nextcord.ext.commands import Bot
+from nextcord import ApplicationCommandOptionType, Guild, InteractionType
+from nextcord.ext.commands import AutoShardedBot
+from nextcord.http import Route
 from pytz import timezone
 
+from utils import gateway, intents, metrics
+
 logger = logging.getLogger(__name__)
 
 # Uncategorized
@@ -24,6 +30,113 @@ BOT_TZ = timezone(os.getenv("TZ", default="UTC"))
 ValidTextChannel = nextcord.TextChannel | nextcord.VoiceChannel | nextcord.Thread
 EMPTY_STRING = "\u200b"
 EMPTY_STRING_2 = "᲼"
+# "startup" downloads every member when connecting, "lazy" fetches them
+# when they are needed
+MEMBER_CHUNKING = os.getenv("MEMBER_CHUNKING", default="startup")
+# Number of gateway shards. If unset, Discord's recommendation is used.
+SHARD_COUNT = int(os.getenv("SHARD_COUNT")) if os.getenv("SHARD_COUNT") else None
+
+
+current_route: ContextVar[str] = ContextVar("current_route", default="unknown")
+
+
+def command_name(interaction: nextcord.Interaction) -> str:
+    """Get the full name of an invoked command and its subcommands."""
+    data = interaction.data or {}
+    names = [data.get("name", "unknown")]
+    options = data.get("options", [])
+    while options and options[0].get("type") in {
+        ApplicationCommandOptionType.sub_command,
+        ApplicationCommandOptionType.sub_command_group,
+    }:
+        names.append(options[0]["name"])
+        options = options[0].get("options", [])
+    return " ".join(names)
+
+
+class InstrumentedBot(AutoShardedBot):
+    """Bot recording metrics for events, commands and REST calls.
+
+    Runs as an auto-sharded client, so that a single process can serve
+    many guilds, with SHARD_COUNT shards if set.
+
+    Every listener, including those added by cogs, runs through
+    _run_event, and every application command through
+    process_application_commands, so timing those covers all handlers
+    without touching them individually.
+
+    Also runs shutdown hooks before closing, giving buffered state a
+    chance to be written out while the database is still reachable.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:  # noqa: ANN401
+        """Initialize bot and wrap its HTTP client."""
+        super().__init__(*args, **kwargs)
+        self.shutdown_hooks: list[Callable[[], Awaitable[None]]] = []
+        request = self.http.request
+
+        @functools.wraps(request)
+        async def timed_request(route: Route, **kwargs: Any) -> Any:  # noqa: ANN401
+            label = f"{route.method} {route.path}"
+            token = current_route.set(label)
+            status = "ok"
+            try:
+                with metrics.REST_DURATION.time(label):
+                    return await request(route, **kwargs)
+            except nextcord.HTTPException as e:
+                status = str(e.status)
+                raise
+            except Exception:
+                status = "error"
+                raise
+            finally:
+                metrics.REST_REQUESTS.inc(label, status)
+                current_route.reset(token)
+
+        self.http.request = timed_request
+
+    async def _run_event(
+        self,
+        coro: Callable[..., Coroutine[Any, Any, Any]],
+        event_name: str,
+        *args: Any,  # noqa: ANN401
+        **kwargs: Any,  # noqa: ANN401
+    ) -> None:
+        with metrics.EVENT_DURATION.time(event_name, coro.__qualname__):
+            await super()._run_event(coro, event_name, *args, **kwargs)
+
+    async def process_application_commands(
+        self,
+        interaction: nextcord.Interaction,
+    ) -> None:
+        """Process an interaction, timing application commands."""
+        if interaction.type != InteractionType.application_command:
+            await super().process_application_commands(interaction)
+            return
+        with metrics.COMMAND_DURATION.time(command_name(interaction)):
+            await super().process_application_commands(interaction)
+
+    async def close(self) -> None:
+        """Run shutdown hooks, then close the bot."""
+        if not self.is_closed():
+            for hook in self.shutdown_hooks:
+                try:
+                    await hook()
+                except Exception:
+                    logger.exception(f"Shutdown hook {hook.__qualname__} failed")
+        await super().close()
+
+    def dispatch(self, event_name: str, *args: Any, **kwargs: Any) -> None:  # noqa: ANN401
+        """Dispatch an event, counting rate limits by route.
+
+        Rate limit events are dispatched from within the request that
+        hit the limit, so the route is still available at this point.
+        """
+        if event_name == "http_ratelimit":
+            metrics.REST_RATE_LIMITS.inc(current_route.get(), str(args[-1]))
+        elif event_name == "global_http_ratelimit":
+            metrics.REST_RATE_LIMITS.inc(current_route.get(), "global")
+        super().dispatch(event_name, *args, **kwargs)
 
 
 class Standby:
@@ -31,12 +144,14 @@ class Standby:
 
     Holds a reference to the currently running Bot instance, as well as
     to the active Postgres connection pool. Can be instantiated at any
-    time to obtain those references.
+    time to obtain those references. The stored guild is the home guild
+    given by GUILD_ID; code that can serve any guild should use the
+    guild of the event it is handling instead.
     """
 
     instance = None
 
-    bot: Bot
+    bot: InstrumentedBot
     pg_pool: Pool
     guild: Guild
     token: str
@@ -46,20 +161,45 @@ class Standby:
         """Instantiate the Bot object."""
         if cls.instance is None:
             cls.instance = super().__new__(cls)
-            cls.instance.bot = Bot(intents=Intents.all(), case_insensitive=True)
+            cls.instance.bot = InstrumentedBot(
+                intents=intents.for_profile(),
+                chunk_guilds_at_startup=MEMBER_CHUNKING != "lazy",
+                shard_count=SHARD_COUNT,
+                case_insensitive=True,
+                enable_debug_events=bool(gateway.RECORD_PATH),
+            )
             cls.instance.token = os.getenv("BOT_TOKEN")
         return cls.instance
 
+    def import_cogs(self) -> list[ModuleType]:
+        """Import the modules of all cogs in the cogs/ directory.
+
+        Importing does not touch the bot, so it can run in a worker
+        thread while other startup work continues.
+
+        Returns:
+            list[ModuleType]: The imported modules
+        """
+        logger.info("Importing cogs")
+        return [
+            importlib.import_module(f"cogs.{file.stem}")
+            for file in sorted(Path().glob("bot/cogs/*.py"))
+        ]
+
     def load_cogs(self) -> None:
         """Load all cogs in the cogs/ directory.
 
         Most of the bot's functionality (slash commands etc.) is
         packaged in Cogs. Those need to be loaded to become available
-        for use.
+        for use. The modules are imported as regular modules rather than
+        through load_extension, which executes a module again even if
+        another cog has already imported it, leaving two copies with
+        separate state.
         """
+        modules = self.import_cogs()
         logger.info("Loading cogs")
-        for file in Path().glob("bot/cogs/*.py"):
-            self.bot.load_extension(f"cogs.{file.stem}")
+        for module in modules:
+            module.setup(self.bot)
 
     def store_guild(self) -> None:
         """Store a reference to the current guild."""
@@ -122,11 +262,11 @@ class Standby:
             ]
             if all(disabled):
                 logger.debug("All buttons disabled - deleting record")
-                await uf.delete_view_record(message.id)
+                await uf.delete_view_record(message.id, record["guild_id"])
                 continue
 
             logger.debug("Recreating view")
-            params = json.loads(record["params"] or "{}")
+            params = record["params"] or {}
 
             module = importlib.import_module(record["module"])
             ViewClass: type[uf.PersistentView] = getattr(module, record["class"])  # noqa: N806
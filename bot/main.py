@@ -1,10 +1,19 @@
 """Activate the bot."""
 
+import asyncio
 import logging
 import os
+import sys
 
-from domain import Format, Standby
+from domain import ID, Format, Standby
 from postgres.setup import init_connection
+from utils import metrics, number_solver
+from utils import warframe as wf
+from utils.gateway import RECORD_PATH, GatewayRecorder
+from utils.guild_config import guild_config
+from utils.leader import leader
+from utils.startup import Stage, Startup
+from utils.watchdog import LoopWatchdog
 
 ENV = os.getenv("ENV")
 LOG_LEVEL = os.getenv("LOG_LEVEL") or logging.INFO
@@ -23,17 +32,80 @@ logger.info(f"Running in {ENV}")
 standby = Standby()
 
 
-@standby.bot.event
-async def on_ready() -> None:
-    """Startup preparations."""
+async def import_cogs() -> None:
+    """Import the cog modules without blocking the event loop."""
+    await asyncio.to_thread(standby.import_cogs)
+
+
+async def load_cogs() -> None:
+    """Add the imported cogs to the bot."""
+    standby.load_cogs()
+
+
+async def store_guild() -> None:
+    """Store a reference to the current guild."""
     standby.store_guild()
+
+
+async def restore_urban_pages() -> None:
+    """Resume paging of Urban Dictionary embeds."""
+    await standby.bot.get_cog("Services").restore_urban_pages()
+
+
+async def set_status() -> None:
+    """Set the default status message."""
     await standby.set_status("Have a nice day!")
-    await standby.recreate_views()
-    await standby.announce()
+
+
+setup = Startup(
+    "Setup",
+    [
+        Stage(name="database", run=init_connection),
+        Stage(name="imports", run=import_cogs),
+        Stage(name="cogs", run=load_cogs, after=("imports",)),
+        Stage(name="guild_config", run=guild_config.load, after=("database",)),
+        Stage(name="leader", run=leader.start, after=("database",)),
+        Stage(name="metrics", run=metrics.start_server),
+    ],
+)
+ready = Startup(
+    "Ready",
+    [
+        Stage(name="guild", run=store_guild),
+        Stage(name="status", run=set_status),
+        Stage(name="views", run=standby.recreate_views, after=("guild",)),
+        Stage(name="urban_pages", run=restore_urban_pages),
+        Stage(name="announce", run=standby.announce),
+        Stage(name="warframe", run=wf.mod_list.get),
+    ],
+)
+
+
+@standby.bot.event
+async def on_ready() -> None:
+    """Startup preparations.
+
+    on_ready fires again whenever the bot reconnects without resuming
+    its session, so the preparations only run the first time.
+    """
+    if ready.started:
+        logger.info("Reconnected")
+        return
+
+    await ready.run()
+    channel = standby.bot.get_channel(ID.ERROR_CHANNEL)
+    if channel:
+        await channel.send(f"{setup.report()}\n{ready.report()}")
 
     logger.info("Bot ready!")
 
 
-standby.load_cogs()
-standby.bot.loop.run_until_complete(init_connection())
+# Fork the solver worker while the process has no other threads yet
+number_solver.get_executor()
+if not standby.bot.loop.run_until_complete(setup.run()):
+    logger.critical(f"Startup failed\n{setup.report()}")
+    sys.exit(1)
+LoopWatchdog().start(standby.bot.loop)
+if RECORD_PATH:
+    GatewayRecorder(RECORD_PATH).start(standby.bot)
 standby.bot.run(standby.token)
@@ -5,28 +5,41 @@ import os
 
 from asyncpg import Pool
 
-from domain import Standby
+from domain import ID, Standby
 
 logger = logging.getLogger(__name__)
 
+# Every row belongs to a guild. Rows from before the bot served several
+# guilds are all from the home guild, which the default backfills.
+GUILD_COLUMN = f"BIGINT NOT NULL DEFAULT {ID.GUILD.value}"
+
 STRUCTURE = {
     "birthday": {
         "columns": {
-            "user_id": "BIGINT PRIMARY KEY",
+            "guild_id": GUILD_COLUMN,
+            "user_id": "BIGINT",
             "birth_date": "DATE",
         },
+        "constraints": {
+            "birthday_pkey": "PRIMARY KEY (guild_id, user_id)",
+        },
     },
     "view": {
         "columns": {
+            "guild_id": GUILD_COLUMN,
             "channel_id": "BIGINT",
-            "message_id": "BIGINT PRIMARY KEY",
+            "message_id": "BIGINT",
             "module": "TEXT",
             "class": "TEXT",
             "params": "JSON",
         },
+        "constraints": {
+            "view_pkey": "PRIMARY KEY (guild_id, message_id)",
+        },
     },
     "rating": {
         "columns": {
+            "guild_id": GUILD_COLUMN,
             "user_id": "BIGINT",
             "category": "TEXT",
             "title": "TEXT",
@@ -34,19 +47,24 @@ STRUCTURE = {
             "review": "TEXT",
         },
         "constraints": {
-            "rating_pkey": "PRIMARY KEY (user_id, category, title)",
+            "rating_pkey": "PRIMARY KEY (guild_id, user_id, category, title)",
         },
     },
     "starboard": {
         "columns": {
+            "guild_id": GUILD_COLUMN,
             "user_id": "BIGINT",
-            "message_id": "BIGINT PRIMARY KEY",
+            "message_id": "BIGINT",
             "starboard_id": "BIGINT",
             "stars": "INTEGER",
         },
+        "constraints": {
+            "starboard_pkey": "PRIMARY KEY (guild_id, message_id)",
+        },
     },
     "burger": {
         "columns": {
+            "guild_id": GUILD_COLUMN,
             "giver_id": "BIGINT",
             "recipient_id": "BIGINT",
             "transferred_at": "TIMESTAMPTZ",
@@ -55,7 +73,8 @@ STRUCTURE = {
     },
     "reminder": {
         "columns": {
-            "reminder_id": "SERIAL PRIMARY KEY",
+            "guild_id": GUILD_COLUMN,
+            "reminder_id": "SERIAL",
             "user_id": "BIGINT",
             "created_at": "TIMESTAMPTZ",
             "expires_at": "TIMESTAMPTZ",
@@ -64,9 +83,13 @@ STRUCTURE = {
             "message_id": "BIGINT",
             "send_dm": "BOOLEAN",
         },
+        "constraints": {
+            "reminder_pkey": "PRIMARY KEY (guild_id, reminder_id)",
+        },
     },
     "prediction": {
         "columns": {
+            "guild_id": GUILD_COLUMN,
             "user_id": "BIGINT",
             "predicted_at": "TIMESTAMPTZ",
             "label": "TEXT",
@@ -74,11 +97,12 @@ STRUCTURE = {
             "status": "TEXT",
         },
         "constraints": {
-            "prediction_pkey": "PRIMARY KEY (user_id, label)",
+            "prediction_pkey": "PRIMARY KEY (guild_id, user_id, label)",
         },
     },
     "roulette": {
         "columns": {
+            "guild_id": GUILD_COLUMN,
             "user_id": "BIGINT",
             "played_at": "TIMESTAMPTZ",
             "win": "BOOLEAN",
@@ -86,24 +110,75 @@ STRUCTURE = {
     },
     "simple_award": {
         "columns": {
-            "user_id": "BIGINT PRIMARY KEY",
+            "guild_id": GUILD_COLUMN,
+            "user_id": "BIGINT",
             "thanks": "INTEGER DEFAULT 0",
             "skulls": "INTEGER DEFAULT 0",
             "brains": "INTEGER DEFAULT 0",
         },
+        "constraints": {
+            "simple_award_pkey": "PRIMARY KEY (guild_id, user_id)",
+        },
     },
     "repost": {
         "columns": {
+            "guild_id": GUILD_COLUMN,
             "user_id": "BIGINT",
             "message_id": "BIGINT",
             "expires_at": "TIMESTAMPTZ",
             "processed": "BOOLEAN DEFAULT FALSE",
         },
         "constraints": {
-            "repost_pkey": "PRIMARY KEY (user_id, message_id)",
+            "repost_pkey": "PRIMARY KEY (guild_id, user_id, message_id)",
+        },
+    },
+    "unverified_member": {
+        "columns": {
+            "guild_id": GUILD_COLUMN,
+            "user_id": "BIGINT",
+            "joined_at": "TIMESTAMPTZ",
+        },
+        "constraints": {
+            "unverified_member_pkey": "PRIMARY KEY (guild_id, user_id)",
+        },
+    },
+    "urban_page": {
+        "columns": {
+            "guild_id": GUILD_COLUMN,
+            "message_id": "BIGINT",
+            "query": "TEXT",
+            "page": "INT",
+            "updated_at": "TIMESTAMPTZ DEFAULT NOW()",
+        },
+        "constraints": {
+            "urban_page_pkey": "PRIMARY KEY (guild_id, message_id)",
+        },
+    },
+    "guild_config": {
+        "columns": {
+            "guild_id": GUILD_COLUMN,
+            "setting": "TEXT",
+            "value": "TEXT",
+        },
+        "constraints": {
+            "guild_config_pkey": "PRIMARY KEY (guild_id, setting)",
+        },
+    },
+    "fabricated_number": {
+        "columns": {
+            "guild_id": GUILD_COLUMN,
+            "target": "BIGINT",
+            "numbers": "TEXT",
+            "solution": "TEXT",
+        },
+        "constraints": {
+            "fabricated_number_pkey": "PRIMARY KEY (guild_id, target, numbers)",
         },
     },
 }
+SEQUENCES = {
+    "ticket_number": "AS BIGINT START WITH 1",
+}
 
 
 async def setup_database(con: Pool) -> None:
@@ -143,6 +218,11 @@ async def setup_database(con: Pool) -> None:
                 ADD CONSTRAINT {constraint_name} {constraint_spec}
                 """)
 
+    for sequence, sequence_spec in SEQUENCES.items():
+        await con.execute(f"""
+            CREATE SEQUENCE IF NOT EXISTS {schema}.{sequence} {sequence_spec}
+            """)
+
     await con.execute(f"""
         CREATE OR REPLACE VIEW {schema}.award AS
         SELECT
@@ -161,11 +241,20 @@ async def setup_database(con: Pool) -> None:
             orbs,
             stars,
             brains,
-            reposts
+            reposts,
+            COALESCE(
+                sa.guild_id,
+                brg.guild_id,
+                mbrg.guild_id,
+                prd.guild_id,
+                sb.guild_id,
+                ree.guild_id
+            ) AS guild_id
         FROM
             {schema}.simple_award AS sa
             FULL OUTER JOIN (
                 SELECT
+                    guild_id,
                     recipient_id,
                     COUNT(*) AS burgers
                 FROM
@@ -173,10 +262,13 @@ async def setup_database(con: Pool) -> None:
                 WHERE
                     reason != 'mold'
                 GROUP BY
+                    guild_id,
                     recipient_id
-            ) AS brg ON brg.recipient_id = sa.user_id
+            ) AS brg ON brg.guild_id = sa.guild_id
+                AND brg.recipient_id = sa.user_id
             FULL OUTER JOIN (
                 SELECT
+                    guild_id,
                     giver_id,
                     COUNT(*) AS moldy_burgers
                 FROM
@@ -184,10 +276,13 @@ async def setup_database(con: Pool) -> None:
                 WHERE
                     reason = 'mold'
                 GROUP BY
+                    guild_id,
                     giver_id
-            ) AS mbrg ON mbrg.giver_id = sa.user_id
+            ) AS mbrg ON mbrg.guild_id = sa.guild_id
+                AND mbrg.giver_id = sa.user_id
             FULL OUTER JOIN (
                 SELECT
+                    guild_id,
                     user_id,
                     COUNT(*) AS orbs
                 FROM
@@ -195,26 +290,34 @@ async def setup_database(con: Pool) -> None:
                 WHERE
                     status = 'Confirmed'
                 GROUP BY
+                    guild_id,
                     user_id
-            ) AS prd ON prd.user_id = sa.user_id
+            ) AS prd ON prd.guild_id = sa.guild_id
+                AND prd.user_id = sa.user_id
             FULL OUTER JOIN (
                 SELECT
+                    guild_id,
                     user_id,
                     SUM(stars) AS stars
                 FROM
                     {schema}.starboard
                 GROUP BY
+                    guild_id,
                     user_id
-            ) AS sb ON sb.user_id = sa.user_id
+            ) AS sb ON sb.guild_id = sa.guild_id
+                AND sb.user_id = sa.user_id
             FULL OUTER JOIN (
                 SELECT
+                    guild_id,
                     user_id,
                     COUNT(*) AS reposts
                 FROM
                     {schema}.repost
                 GROUP BY
+                    guild_id,
                     user_id
-            ) AS ree ON ree.user_id = sa.user_id
+            ) AS ree ON ree.guild_id = sa.guild_id
+                AND ree.user_id = sa.user_id
         """)
 
     logger.info("Database creation complete")
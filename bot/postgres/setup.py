@@ -1,18 +1,224 @@
 """PostgreSQL database interactions."""
 
-from asyncpg import create_pool
+import json
+import logging
+import os
+import time
+from collections.abc import Awaitable, Generator
+from dataclasses import dataclass
+from typing import Any, Self
+
+from asyncpg import Connection, Pool
+from asyncpg.connection import LoggedQuery
+from asyncpg.pool import PoolAcquireContext
+from asyncpg.protocol import Record
 
 from domain import URL, Standby
 from postgres.architecture import setup_database
+from utils import metrics
 from utils import util_functions as uf
 
+logger = logging.getLogger(__name__)
 bot_start_time = uf.now()
 standby = Standby()
 
+MAX_LOGGED_QUERY_LENGTH = 500
+
+
+@dataclass(kw_only=True)
+class PoolConfig:
+    """Connection pool settings.
+
+    Attributes:
+        min_size (int): Connections kept open at all times
+        max_size (int): Maximum number of open connections
+        max_queries (int): Queries after which a connection is replaced
+        max_inactive_connection_lifetime (float): Seconds after which
+            idle connections above min_size are closed
+        command_timeout (float): Seconds after which a query is
+            cancelled
+        statement_cache_size (int): Prepared statements cached per
+            connection. Must be 0 behind a transaction-mode pooler such
+            as PgBouncer.
+        slow_query_threshold (float): Seconds after which a query is
+            logged as slow
+    """
+
+    min_size: int = 2
+    max_size: int = 10
+    max_queries: int = 50000
+    max_inactive_connection_lifetime: float = 300.0
+    command_timeout: float = 30.0
+    statement_cache_size: int = 100
+    slow_query_threshold: float = 0.5
+
+    @classmethod
+    def from_env(cls) -> Self:
+        """Read settings from DB_* environment variables.
+
+        Each setting can be overridden by the environment variable
+        named after it, e.g. DB_MAX_SIZE or DB_COMMAND_TIMEOUT.
+        """
+        defaults = cls()
+        overrides = {}
+        for name, default in vars(defaults).items():
+            value = os.getenv(f"DB_{name.upper()}")
+            if value is not None:
+                overrides[name] = type(default)(value)
+        return cls(**overrides)
+
+
+@dataclass(kw_only=True)
+class PoolStats:
+    """Snapshot of the connection pool's state."""
+
+    size: int
+    max_size: int
+    idle: int
+    waiting: int
+
+    @property
+    def in_use(self) -> int:
+        """Number of connections currently acquired."""
+        return self.size - self.idle
+
+    @property
+    def saturated(self) -> bool:
+        """Whether every connection is in use and tasks are waiting."""
+        return self.in_use >= self.max_size and self.waiting > 0
+
+
+POOL_CONFIG = PoolConfig.from_env()
+
+
+class TimedAcquire:
+    """Wrapper around pool.acquire() that times getting a connection.
+
+    Supports both ways of using pool.acquire(): as an async context
+    manager and by awaiting it directly.
+    """
+
+    def __init__(self, pool: "InstrumentedPool", context: PoolAcquireContext) -> None:
+        """Initialize TimedAcquire."""
+        self.pool = pool
+        self.context = context
+
+    async def __aenter__(self) -> Connection:
+        """Acquire a connection for the duration of the block."""
+        return await self.pool.timed(self.context.__aenter__())
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        """Release the connection back to the pool."""
+        await self.context.__aexit__(*exc_info)
+
+    def __await__(self) -> Generator[Any, None, Connection]:
+        """Acquire a connection that must be released explicitly."""
+        return self.pool.timed(self.context).__await__()
+
+
+class InstrumentedPool(Pool):
+    """Connection pool recording how long acquiring a connection takes.
+
+    The pool.fetch and pool.execute shortcuts go through acquire() as
+    well, so every query run through the pool is covered.
+    """
+
+    waiting = 0
+
+    def acquire(self, *, timeout: float | None = None) -> TimedAcquire:
+        """Acquire a connection, recording how long that takes.
+
+        Args:
+            timeout (float | None): Seconds to wait for a connection
+
+        Returns:
+            TimedAcquire: Awaitable or async context manager yielding
+                the connection
+        """
+        return TimedAcquire(self, super().acquire(timeout=timeout))
+
+    async def timed(self, acquiring: Awaitable[Connection]) -> Connection:
+        """Wait for a connection and record the time spent waiting.
+
+        Args:
+            acquiring (Awaitable[Connection]): Pending acquisition
+
+        Returns:
+            Connection: The acquired connection
+        """
+        start = time.perf_counter()
+        self.waiting += 1
+        try:
+            return await acquiring
+        finally:
+            self.waiting -= 1
+            metrics.DB_ACQUIRE_WAIT.observe(value=time.perf_counter() - start)
+
+    def stats(self) -> PoolStats:
+        """Get a snapshot of the pool's state."""
+        return PoolStats(
+            size=self.get_size(),
+            max_size=self.get_max_size(),
+            idle=self.get_idle_size(),
+            waiting=self.waiting,
+        )
+
+
+def record_query(query: LoggedQuery) -> None:
+    """Record the duration and outcome of a finished query."""
+    metrics.DB_QUERY_DURATION.observe(value=query.elapsed)
+    if query.exception is not None:
+        metrics.DB_QUERY_ERRORS.inc()
+    if query.elapsed >= POOL_CONFIG.slow_query_threshold:
+        metrics.DB_SLOW_QUERIES.inc()
+        text = " ".join(query.query.split())[:MAX_LOGGED_QUERY_LENGTH]
+        logger.warning(f"Slow query ({query.elapsed:.2f}s): {text}")
+
+
+async def init_pool_connection(con: Connection) -> None:
+    """Prepare a newly opened pool connection.
+
+    Registers codecs so that JSON columns are read as and written from
+    Python objects, and starts recording queries.
+    """
+    for type_name in ("json", "jsonb"):
+        await con.set_type_codec(
+            type_name,
+            encoder=json.dumps,
+            decoder=json.loads,
+            schema="pg_catalog",
+        )
+    con.add_query_logger(record_query)
+
 
 async def init_connection() -> None:
     """Initialize the connection and store a reference to it."""
-    standby.pg_pool = await create_pool(URL.DATABASE, ssl="prefer")
+    logger.info(f"Creating connection pool with {POOL_CONFIG}")
+    standby.pg_pool = await InstrumentedPool(
+        URL.DATABASE,
+        ssl="prefer",
+        min_size=POOL_CONFIG.min_size,
+        max_size=POOL_CONFIG.max_size,
+        max_queries=POOL_CONFIG.max_queries,
+        max_inactive_connection_lifetime=POOL_CONFIG.max_inactive_connection_lifetime,
+        command_timeout=POOL_CONFIG.command_timeout,
+        statement_cache_size=POOL_CONFIG.statement_cache_size,
+        init=init_pool_connection,
+        loop=None,
+        connection_class=Connection,
+        record_class=Record,
+    )
+    metrics.DB_CONNECTIONS.set_function(
+        "idle",
+        function=lambda: standby.pg_pool.stats().idle,
+    )
+    metrics.DB_CONNECTIONS.set_function(
+        "in_use",
+        function=lambda: standby.pg_pool.stats().in_use,
+    )
+    metrics.DB_ACQUIRE_WAITING.set_function(
+        function=lambda: standby.pg_pool.stats().waiting,
+    )
 
     async with standby.pg_pool.acquire() as con:
         await setup_database(con)
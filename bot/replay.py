@@ -0,0 +1,161 @@
+"""Replay a gateway recording against the bot for load testing.
+
+Feeds the dispatch payloads of a recording made with
+GATEWAY_RECORD_PATH into the bot's event parsers, as if they had been
+received from Discord, at a multiple of the recorded speed. REST calls
+are answered by FakeDiscord instead of being sent to Discord, with its
+rate limits applied, while database queries run as usual, so
+DATABASE_URL should point to a scratch database.
+
+Usage:
+    python bot/replay.py recording.jsonl.gz --speed 10
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+from collections import Counter
+
+from domain import ID, Format, Standby
+from postgres.setup import init_connection
+from utils import metrics
+from utils.fake_discord import FakeDiscord
+from utils.gateway import read_recording
+
+logging.basicConfig(
+    level=logging.INFO,
+    format=Format.LOGGING,
+    datefmt=Format.YYYYMMDD_HHMMSS,
+)
+logging.getLogger("nextcord").setLevel(logging.WARNING)
+
+logger = logging.getLogger("replay")
+standby = Standby()
+
+
+def prepare_bot() -> None:
+    """Keep the bot from syncing with Discord on its own."""
+    bot = standby.bot
+    bot._connection._chunk_guilds = False  # noqa: SLF001
+    bot._rollout_register_new = False  # noqa: SLF001
+    bot._rollout_update_known = False  # noqa: SLF001
+    bot._rollout_delete_unknown = False  # noqa: SLF001
+
+    @bot.event
+    async def on_ready() -> None:
+        standby.store_guild()
+
+
+async def wait_for_handlers(timeout: float) -> int:
+    """Wait for event handlers that are still running to finish.
+
+    Returns:
+        int: Number of handlers that did not finish in time
+    """
+    pending = {
+        task for task in asyncio.all_tasks() if task.get_name().startswith("nextcord: ")
+    }
+    if not pending:
+        return 0
+    _, pending = await asyncio.wait(pending, timeout=timeout)
+    return len(pending)
+
+
+def listener_report() -> list[str]:
+    """Summarize the time spent in each event listener."""
+    listeners = metrics.EVENT_DURATION
+    totals = sorted(
+        listeners.sums.items(),
+        key=lambda item: item[1],
+        reverse=True,
+    )
+    lines = []
+    for labels, total in totals:
+        count = sum(listeners.counts[labels])
+        event, listener = labels
+        lines.append(
+            f"  {listener} ({event}): {count} calls, {total:.3f}s total, "
+            f"{total / count * 1000:.2f}ms average",
+        )
+    return lines
+
+
+async def replay(path: str, fake: FakeDiscord, speed: float, settle: float) -> None:
+    """Feed a recording into the bot's event parsers.
+
+    Args:
+        path (str): Path of the recording
+        fake (FakeDiscord): Fake answering the bot's REST calls
+        speed (float): Playback speed relative to the recording, or 0
+            to play back as fast as possible
+        settle (float): Seconds to wait for handlers after the last
+            event
+    """
+    parsers = standby.bot._connection.parsers  # noqa: SLF001
+    events: Counter[str] = Counter()
+    start = time.perf_counter()
+
+    for at, payload in read_recording(path):
+        if speed:
+            delay = at / speed - (time.perf_counter() - start)
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+        event = payload["t"]
+        parser = parsers.get(event)
+        if parser is None:
+            continue
+        data = payload["d"]
+        if event in {"READY", "RESUMED"}:
+            data["__shard_id__"] = 0
+        parser(data)
+        events[event] += 1
+        await asyncio.sleep(0)
+
+    fed = time.perf_counter() - start
+    unfinished = await wait_for_handlers(settle)
+    elapsed = time.perf_counter() - start
+    total = sum(events.values())
+
+    lines = [
+        f"Replayed {total} events in {fed:.2f}s ({total / max(fed, 1e-9):.0f}/s), "
+        f"handlers finished after {elapsed:.2f}s, {unfinished} still running",
+        "Events:",
+        *(f"  {event}: {count}" for event, count in events.most_common()),
+        "REST calls:",
+        *(f"  {route}: {count}" for route, count in fake.requests.most_common()),
+        "Rate limited REST calls:",
+        *(f"  {route}: {count}" for route, count in fake.rate_limited.most_common()),
+        "Listeners:",
+        *listener_report(),
+    ]
+    logger.info("\n".join(lines))
+
+
+arg_parser = argparse.ArgumentParser(description="Replay a gateway recording.")
+arg_parser.add_argument("path", help="recording made with GATEWAY_RECORD_PATH")
+arg_parser.add_argument(
+    "--speed",
+    type=float,
+    default=1.0,
+    help="playback speed relative to the recording, 0 for no delays",
+)
+arg_parser.add_argument(
+    "--settle",
+    type=float,
+    default=30.0,
+    help="seconds to wait for handlers after the last event",
+)
+args = arg_parser.parse_args()
+
+fake = FakeDiscord(bot_id=ID.BOT, strict=False)
+prepare_bot()
+standby.load_cogs()
+loop = standby.bot.loop
+loop.run_until_complete(init_connection())
+loop.run_until_complete(fake.start())
+try:
+    loop.run_until_complete(replay(args.path, fake, args.speed, args.settle))
+finally:
+    loop.run_until_complete(fake.stop())
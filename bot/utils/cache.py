@@ -0,0 +1,67 @@
+"""In-memory caches."""
+
+import time
+from collections import OrderedDict
+from datetime import timedelta
+
+MISSING = object()
+
+
+class TTLCache[K, V]:
+    """Mapping whose entries expire after a fixed time to live.
+
+    Once the cache holds maxsize entries, adding another evicts the
+    least recently used one.
+    """
+
+    def __init__(self, ttl: timedelta, maxsize: int = 128) -> None:
+        """Initialize cache."""
+        self.ttl = ttl.total_seconds()
+        self.maxsize = maxsize
+        self.entries: OrderedDict[K, tuple[float, V]] = OrderedDict()
+
+    def __len__(self) -> int:
+        """Number of entries, including expired ones not yet evicted."""
+        return len(self.entries)
+
+    def __contains__(self, key: K) -> bool:
+        """Check whether an unexpired entry exists for a key."""
+        return self.get(key, MISSING) is not MISSING
+
+    def __setitem__(self, key: K, value: V) -> None:
+        """Add or replace an entry, resetting its time to live."""
+        self.entries[key] = (time.monotonic() + self.ttl, value)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+    def get(self, key: K, default: V | None = None) -> V | None:
+        """Get the value for a key if it exists and hasn't expired.
+
+        Args:
+            key (K): Key to look up
+            default (V | None, optional): Value to return if the key is
+                missing or expired. Defaults to None.
+
+        Returns:
+            V | None: Cached value, or the default
+        """
+        entry = self.entries.get(key)
+        if entry is None:
+            return default
+        expires, value = entry
+        if expires < time.monotonic():
+            del self.entries[key]
+            return default
+        self.entries.move_to_end(key)
+        return value
+
+    def pop(self, key: K, default: V | None = None) -> V | None:
+        """Remove an entry and return its value if it hasn't expired."""
+        value = self.get(key, default)
+        self.entries.pop(key, None)
+        return value
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        self.entries.clear()
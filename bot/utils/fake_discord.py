@@ -0,0 +1,472 @@
+"""In-process fake of the Discord REST API.
+
+Serves the handful of endpoints the bot's hot paths rely on (fetching
+messages, members, channels and users, sending and editing messages,
+reactions) from in-memory state, with configurable latency and per
+route rate limit buckets that answer with 429 responses the same way
+Discord does. Starting the fake points nextcord's Route.BASE at it, so
+Standby().bot can be used unchanged for offline benchmarks and
+regression tests.
+
+Example:
+    fake = FakeDiscord(latency=0.05)
+    fake.add_guild(guild_id=1)
+    fake.add_channel(guild_id=1, channel_id=2)
+    await fake.start()
+    await standby.bot.login("fake")
+    channel = await standby.bot.fetch_channel(2)
+    await channel.send("hello")
+    await fake.stop()
+"""
+
+import asyncio
+import json
+import logging
+import re
+import time
+from collections import Counter
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from typing import Any
+
+from aiohttp import web
+from nextcord.http import Route
+from nextcord.utils import time_snowflake
+
+logger = logging.getLogger(__name__)
+
+type Payload = dict[str, Any]
+
+ROUTES = [
+    ("GET", "/users/@me"),
+    ("GET", "/users/{user_id}"),
+    ("GET", "/guilds/{guild_id}"),
+    ("GET", "/guilds/{guild_id}/members/{user_id}"),
+    ("PATCH", "/guilds/{guild_id}/members/{user_id}"),
+    ("GET", "/channels/{channel_id}"),
+    ("GET", "/channels/{channel_id}/messages/{message_id}"),
+    ("POST", "/channels/{channel_id}/messages"),
+    ("PATCH", "/channels/{channel_id}/messages/{message_id}"),
+    ("DELETE", "/channels/{channel_id}/messages/{message_id}"),
+    ("PUT", "/channels/{channel_id}/messages/{message_id}/reactions/{emoji}/@me"),
+    ("DELETE", "/channels/{channel_id}/messages/{message_id}/reactions/{emoji}/@me"),
+    ("GET", "/applications/{application_id}/commands"),
+    ("GET", "/applications/{application_id}/guilds/{guild_id}/commands"),
+    ("POST", "/webhooks/{webhook_id}/{webhook_token}"),
+    ("PATCH", "/webhooks/{webhook_id}/{webhook_token}/messages/{message_id}"),
+]
+MAJOR_PARAMETERS = ("channel_id", "guild_id")
+
+
+def compile_route(path: str) -> re.Pattern:
+    """Turn a route path into a pattern matching request paths."""
+    pattern = re.sub(r"\{(\w+)\}", r"(?P<\1>[^/]+)", path)
+    return re.compile(f"^{pattern}$")
+
+
+ROUTE_PATTERNS = [(method, path, compile_route(path)) for method, path in ROUTES]
+
+
+def json_response(
+    payload: Payload,
+    *,
+    status: int,
+    headers: dict[str, str] | None = None,
+) -> web.Response:
+    """Build a JSON response.
+
+    Nextcord only parses bodies whose content type is exactly
+    "application/json", without the charset aiohttp adds by default.
+    """
+    return web.Response(
+        body=json.dumps(payload).encode(),
+        status=status,
+        headers={**(headers or {}), "Content-Type": "application/json"},
+    )
+
+
+@dataclass(kw_only=True)
+class BucketConfig:
+    """Rate limit of a route.
+
+    Attributes:
+        limit (int): Requests allowed per window
+        window (float): Length of the window in seconds
+    """
+
+    limit: int = 5
+    window: float = 5.0
+
+
+@dataclass(kw_only=True)
+class Bucket:
+    """Current state of a rate limit bucket."""
+
+    config: BucketConfig
+    remaining: int = 0
+    reset_at: float = 0.0
+
+    def take(self, now: float) -> bool:
+        """Use up a request, returning whether one was available."""
+        if now >= self.reset_at:
+            self.remaining = self.config.limit
+            self.reset_at = now + self.config.window
+        if self.remaining == 0:
+            return False
+        self.remaining -= 1
+        return True
+
+
+class FakeDiscord:
+    """Fake Discord REST API backed by in-memory state."""
+
+    def __init__(
+        self,
+        *,
+        latency: float = 0.0,
+        default_limit: BucketConfig | None = None,
+        limits: dict[str, BucketConfig] | None = None,
+        bot_id: int = 1,
+        strict: bool = True,
+    ) -> None:
+        """Initialize fake.
+
+        Args:
+            latency (float): Seconds each request takes
+            default_limit (BucketConfig | None): Rate limit of routes
+                without their own
+            limits (dict[str, BucketConfig] | None): Rate limits by
+                route, e.g. "POST /channels/{channel_id}/messages"
+            bot_id (int): User ID of the bot
+            strict (bool): Whether to answer routes that are not faked
+                with 404. Otherwise they succeed with an empty body.
+        """
+        self.latency = latency
+        self.strict = strict
+        self.default_limit = default_limit or BucketConfig(limit=50, window=1.0)
+        self.limits = limits or {}
+        self.buckets: dict[str, Bucket] = {}
+        self.requests: Counter[str] = Counter()
+        self.rate_limited: Counter[str] = Counter()
+
+        self.users: dict[int, Payload] = {}
+        self.guilds: dict[int, Payload] = {}
+        self.members: dict[tuple[int, int], Payload] = {}
+        self.channels: dict[int, Payload] = {}
+        self.messages: dict[tuple[int, int], Payload] = {}
+        self.bot_user = self.add_user(user_id=bot_id, name="Standby", bot=True)
+
+        self.runner: web.AppRunner | None = None
+        self.original_base = Route.BASE
+
+    def add_user(
+        self,
+        *,
+        user_id: int,
+        name: str = "user",
+        bot: bool = False,
+    ) -> Payload:
+        """Add a user."""
+        user = {
+            "id": str(user_id),
+            "username": name,
+            "discriminator": "0",
+            "global_name": name,
+            "avatar": None,
+            "bot": bot,
+        }
+        self.users[user_id] = user
+        return user
+
+    def add_guild(self, *, guild_id: int, name: str = "guild") -> Payload:
+        """Add a guild with only the default role."""
+        guild = {
+            "id": str(guild_id),
+            "name": name,
+            "owner_id": self.bot_user["id"],
+            "roles": [
+                {
+                    "id": str(guild_id),
+                    "name": "@everyone",
+                    "permissions": "0",
+                    "position": 0,
+                    "color": 0,
+                    "hoist": False,
+                    "managed": False,
+                    "mentionable": False,
+                },
+            ],
+            "emojis": [],
+            "stickers": [],
+            "features": [],
+        }
+        self.guilds[guild_id] = guild
+        return guild
+
+    def add_member(self, *, guild_id: int, user_id: int, name: str = "user") -> Payload:
+        """Add a member, creating the user if needed."""
+        user = self.users.get(user_id) or self.add_user(user_id=user_id, name=name)
+        member = {
+            "user": user,
+            "roles": [],
+            "joined_at": datetime.now(tz=UTC).isoformat(),
+            "deaf": False,
+            "mute": False,
+        }
+        self.members[guild_id, user_id] = member
+        return member
+
+    def add_channel(
+        self,
+        *,
+        guild_id: int,
+        channel_id: int,
+        name: str = "channel",
+    ) -> Payload:
+        """Add a text channel."""
+        channel = {
+            "id": str(channel_id),
+            "guild_id": str(guild_id),
+            "type": 0,
+            "name": name,
+            "position": 0,
+            "permission_overwrites": [],
+        }
+        self.channels[channel_id] = channel
+        return channel
+
+    def add_message(
+        self,
+        *,
+        channel_id: int,
+        author_id: int | None = None,
+        content: str = "",
+        message_id: int | None = None,
+    ) -> Payload:
+        """Add a message to a channel."""
+        now = datetime.now(tz=UTC)
+        message_id = message_id or time_snowflake(now) + len(self.messages)
+        author = self.users.get(author_id) if author_id else self.bot_user
+        message = {
+            "id": str(message_id),
+            "channel_id": str(channel_id),
+            "author": author or self.add_user(user_id=author_id),
+            "content": content,
+            "embeds": [],
+            "components": [],
+            "attachments": [],
+            "mentions": [],
+            "mention_roles": [],
+            "mention_everyone": False,
+            "pinned": False,
+            "tts": False,
+            "type": 0,
+            "timestamp": now.isoformat(),
+            "edited_timestamp": None,
+        }
+        guild_id = self.channels.get(channel_id, {}).get("guild_id")
+        if guild_id is not None:
+            message["guild_id"] = guild_id
+        self.messages[channel_id, message_id] = message
+        return message
+
+    async def start(self) -> str:
+        """Serve the fake and point nextcord at it.
+
+        Returns:
+            str: Base URL of the fake API
+        """
+        app = web.Application()
+        app.router.add_route("*", "/api/v{version}/{path:.*}", self.handle)
+        self.runner = web.AppRunner(app, access_log=None)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, host="127.0.0.1", port=0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]  # noqa: SLF001
+        Route.BASE = f"http://127.0.0.1:{port}/api/v10"
+        logger.info(f"Serving fake Discord API at {Route.BASE}")
+        return Route.BASE
+
+    async def stop(self) -> None:
+        """Stop serving and point nextcord back at Discord."""
+        Route.BASE = self.original_base
+        if self.runner is not None:
+            await self.runner.cleanup()
+            self.runner = None
+
+    def match(self, method: str, path: str) -> tuple[str, dict[str, str]] | None:
+        """Find the route of a request.
+
+        Returns:
+            tuple[str, dict[str, str]] | None: Route path and its
+                parameters, or None if the route is not faked
+        """
+        for route_method, route_path, pattern in ROUTE_PATTERNS:
+            if route_method == method and (match := pattern.match(path)):
+                return route_path, match.groupdict()
+        return None
+
+    def bucket_for(self, route: str, parameters: dict[str, str]) -> tuple[str, Bucket]:
+        """Get the rate limit bucket of a request."""
+        major = next(
+            (parameters[name] for name in MAJOR_PARAMETERS if name in parameters),
+            "",
+        )
+        name = f"{route}:{major}"
+        if name not in self.buckets:
+            config = self.limits.get(route, self.default_limit)
+            self.buckets[name] = Bucket(config=config)
+        return name, self.buckets[name]
+
+    async def handle(self, request: web.Request) -> web.Response:
+        """Answer a request, applying latency and rate limits."""
+        path = "/" + request.match_info["path"]
+        matched = self.match(request.method, path)
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if matched is None:
+            generic_path = re.sub(r"\d+", "{id}", path)
+            self.requests[f"{request.method} {generic_path}"] += 1
+            if self.strict:
+                return self.error(404, "404: Not Found")
+            return web.Response(status=204)
+
+        template, parameters = matched
+        route = f"{request.method} {template}"
+        self.requests[route] += 1
+
+        name, bucket = self.bucket_for(route, parameters)
+        now = time.monotonic()
+        headers = {"Via": "1.1 fake-discord", "X-RateLimit-Bucket": name}
+        if not bucket.take(now):
+            self.rate_limited[route] += 1
+            retry_after = round(bucket.reset_at - now, 3)
+            headers |= {
+                "Retry-After": str(retry_after),
+                "X-RateLimit-Scope": "user",
+                "X-RateLimit-Limit": str(bucket.config.limit),
+                "X-RateLimit-Remaining": "0",
+                "X-RateLimit-Reset-After": str(retry_after),
+            }
+            body = {
+                "message": "You are being rate limited.",
+                "retry_after": retry_after,
+            }
+            return json_response(body, status=429, headers=headers)
+
+        headers |= {
+            "X-RateLimit-Limit": str(bucket.config.limit),
+            "X-RateLimit-Remaining": str(bucket.remaining),
+            "X-RateLimit-Reset": str(time.time() + bucket.reset_at - now),
+            "X-RateLimit-Reset-After": str(round(bucket.reset_at - now, 3)),
+        }
+        body = await self.read_body(request)
+        status, result = self.respond(request.method, template, parameters, body)
+        if result is None:
+            return web.Response(status=status, headers=headers)
+        return json_response(result, status=status, headers=headers)
+
+    @staticmethod
+    async def read_body(request: web.Request) -> Payload:
+        """Read the JSON body of a request, including multipart ones."""
+        if not request.can_read_body:
+            return {}
+        if request.content_type.startswith("multipart/"):
+            form = await request.post()
+            return json.loads(form.get("payload_json") or "{}")
+        return await request.json()
+
+    def respond(  # noqa: C901, PLR0911, PLR0912
+        self,
+        method: str,
+        route: str,
+        parameters: dict[str, str],
+        body: Payload,
+    ) -> tuple[int, Payload | list[Payload] | None]:
+        """Produce the status and body of a request to a faked route."""
+        ids = {
+            name: int(value) for name, value in parameters.items() if value.isdigit()
+        }
+        match method, route:
+            case "GET", "/users/@me":
+                return 200, self.bot_user
+            case "GET", "/users/{user_id}":
+                return self.found(self.users.get(ids.get("user_id")))
+            case "GET", "/guilds/{guild_id}":
+                return self.found(self.guilds.get(ids.get("guild_id")))
+            case "GET", "/guilds/{guild_id}/members/{user_id}":
+                return self.found(self.members.get((ids["guild_id"], ids["user_id"])))
+            case "PATCH", "/guilds/{guild_id}/members/{user_id}":
+                member = self.members.get((ids["guild_id"], ids["user_id"]))
+                if member is not None and "roles" in body:
+                    member["roles"] = body["roles"]
+                return self.found(member)
+            case "GET", "/channels/{channel_id}":
+                return self.found(self.channels.get(ids.get("channel_id")))
+            case "GET", "/channels/{channel_id}/messages/{message_id}":
+                key = (ids["channel_id"], ids["message_id"])
+                return self.found(self.messages.get(key))
+            case "POST", "/channels/{channel_id}/messages":
+                message = self.add_message(
+                    channel_id=ids["channel_id"],
+                    content=body.get("content") or "",
+                )
+                message["embeds"] = body.get("embeds") or []
+                message["components"] = body.get("components") or []
+                return 200, message
+            case "POST", "/webhooks/{webhook_id}/{webhook_token}":
+                # Interaction followups, whose channel is unknown here
+                message = self.add_message(
+                    channel_id=0,
+                    content=body.get("content") or "",
+                )
+                message["embeds"] = body.get("embeds") or []
+                message["components"] = body.get("components") or []
+                return 200, message
+            case (
+                "PATCH",
+                "/webhooks/{webhook_id}/{webhook_token}/messages/{message_id}",
+            ):
+                message = self.messages.get((0, ids.get("message_id")))
+                if message is None:
+                    message = self.add_message(channel_id=0)
+                message |= {
+                    key: value
+                    for key, value in body.items()
+                    if key in {"content", "embeds", "components"}
+                }
+                return 200, message
+            case "GET", (
+                "/applications/{application_id}/commands"
+                | "/applications/{application_id}/guilds/{guild_id}/commands"
+            ):
+                return 200, []
+            case "PATCH", "/channels/{channel_id}/messages/{message_id}":
+                message = self.messages.get((ids["channel_id"], ids["message_id"]))
+                if message is not None:
+                    message |= {
+                        key: value
+                        for key, value in body.items()
+                        if key in {"content", "embeds", "components"}
+                    }
+                    message["edited_timestamp"] = datetime.now(tz=UTC).isoformat()
+                return self.found(message)
+            case "DELETE", "/channels/{channel_id}/messages/{message_id}":
+                message = self.messages.pop(
+                    (ids["channel_id"], ids["message_id"]),
+                    None,
+                )
+                return (204, None) if message is not None else self.found(None)
+            case _:
+                return 204, None
+
+    def found(self, payload: Payload | None) -> tuple[int, Payload | None]:
+        """Answer with a payload, or 404 if it does not exist."""
+        if payload is None:
+            return 404, {"message": "Unknown", "code": 10000}
+        return 200, payload
+
+    @staticmethod
+    def error(status: int, message: str) -> web.Response:
+        """Build an error response."""
+        return json_response({"message": message, "code": 0}, status=status)
@@ -0,0 +1,101 @@
+"""Recording of raw gateway traffic for later replay.
+
+When the GATEWAY_RECORD_PATH environment variable is set, every payload
+received from the gateway is appended to a gzip compressed JSON lines
+file at that path, together with the number of seconds since recording
+started. Recordings contain message contents and user data, so they
+must be handled with the same care as the database.
+
+Recordings are played back by replay.py.
+"""
+
+import atexit
+import gzip
+import json
+import logging
+import os
+import time
+import zlib
+from collections.abc import Iterator
+from pathlib import Path
+from typing import IO, Any
+
+from nextcord.ext.commands import Bot
+
+logger = logging.getLogger(__name__)
+
+RECORD_PATH = os.getenv("GATEWAY_RECORD_PATH")
+DISPATCH = 0
+
+
+class GatewayRecorder:
+    """Writes raw gateway payloads to a compressed file."""
+
+    def __init__(self, path: str) -> None:
+        """Initialize recorder."""
+        self.path = Path(path)
+        self.file: IO[str] | None = None
+        self.start_time = 0.0
+        self.count = 0
+
+    def start(self, bot: Bot) -> None:
+        """Start recording the bot's gateway traffic.
+
+        The bot must have been created with debug events enabled, since
+        raw payloads are not dispatched otherwise.
+
+        Args:
+            bot (Bot): Bot to record
+        """
+        self.file = gzip.open(self.path, "wt", encoding="utf-8")  # noqa: SIM115
+        self.start_time = time.monotonic()
+        bot.add_listener(self.on_socket_raw_receive, "on_socket_raw_receive")
+        atexit.register(self.stop)
+        logger.info(f"Recording gateway traffic to {self.path}")
+
+    async def on_socket_raw_receive(self, payload: str) -> None:
+        """Append a payload to the recording.
+
+        The payload is already valid JSON, so it is embedded in the line
+        as is instead of being parsed and serialized again.
+        """
+        if self.file is None:
+            return
+        elapsed = time.monotonic() - self.start_time
+        self.file.write(f'{{"at": {elapsed:.4f}, "payload": {payload}}}\n')
+        self.count += 1
+
+    def stop(self) -> None:
+        """Finish the recording."""
+        if self.file is None:
+            return
+        self.file.close()
+        self.file = None
+        logger.info(f"Recorded {self.count} gateway payloads to {self.path}")
+
+
+def read_recording(path: str | Path) -> Iterator[tuple[float, dict[str, Any]]]:
+    """Read the dispatch payloads in a recording.
+
+    Recordings cut short by a crash are read up to the last complete
+    line.
+
+    Args:
+        path (str | Path): Path of the recording
+
+    Yields:
+        tuple[float, dict[str, Any]]: Seconds since the start of the
+            recording, and the payload
+    """
+    with gzip.open(path, "rt", encoding="utf-8") as file:
+        try:
+            for line in file:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    logger.warning(f"Skipping incomplete line in {path}")
+                    continue
+                if entry["payload"].get("op") == DISPATCH:
+                    yield entry["at"], entry["payload"]
+        except (EOFError, zlib.error):
+            logger.warning(f"Recording {path} ends abruptly")
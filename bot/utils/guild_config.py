@@ -0,0 +1,146 @@
+"""Per-guild settings.
+
+Channel IDs and special channel names used to be fixed for the single
+guild the bot served, through the ID and ChannelName constants. Each
+guild can now override them with rows in the guild_config table. The
+constants remain the defaults: channel names apply to every guild,
+while IDs, which only exist in one guild, only apply to the home guild
+given by GUILD_ID.
+
+All rows are read into memory at startup, and changes made through this
+module update the cache as they are written.
+"""
+
+import logging
+
+from domain import ID, ChannelName, Standby
+
+logger = logging.getLogger(__name__)
+standby = Standby()
+
+# IDs that differ between guilds, as opposed to those of users
+GUILD_IDS = (
+    ID.STARBOARD,
+    ID.ERROR_CHANNEL,
+    ID.GENERAL,
+    ID.GIVEAWAYS,
+    ID.TICKETS,
+    ID.RULES_MESSAGE,
+    ID.BOT_SPAM,
+)
+
+type Setting = ID | ChannelName
+
+
+def setting_key(setting: Setting) -> str:
+    """Get the name a setting is stored under."""
+    prefix = "id" if isinstance(setting, ID) else "channel_name"
+    return f"{prefix}.{setting.name.lower()}"
+
+
+SETTINGS: dict[str, Setting] = {
+    setting_key(setting): setting for setting in (*GUILD_IDS, *ChannelName)
+}
+
+
+class GuildConfig:
+    """Cached settings of every guild."""
+
+    def __init__(self) -> None:
+        """Initialize config."""
+        self.values: dict[int, dict[str, str]] = {}
+
+    async def load(self) -> None:
+        """Read the settings of all guilds."""
+        records = await standby.pg_pool.fetch(f"""
+            SELECT
+                guild_id,
+                setting,
+                value
+            FROM
+                {standby.schema}.guild_config
+            """)
+        values: dict[int, dict[str, str]] = {}
+        for record in records:
+            values.setdefault(record["guild_id"], {})[record["setting"]] = record[
+                "value"
+            ]
+        self.values = values
+        logger.info(f"Loaded settings of {len(values)} guilds")
+
+    def get_id(self, guild_id: int, setting: ID) -> int | None:
+        """Get an ID setting of a guild.
+
+        Args:
+            guild_id (int): ID of the guild
+            setting (ID): Setting to get
+
+        Returns:
+            int | None: The configured ID, the constant for the home
+                guild, or None if the guild has not configured it
+        """
+        value = self.values.get(guild_id, {}).get(setting_key(setting))
+        if value is not None:
+            return int(value)
+        return int(setting) if guild_id == ID.GUILD else None
+
+    def get_channel_name(self, guild_id: int, setting: ChannelName) -> str:
+        """Get the name of a special channel in a guild.
+
+        Args:
+            guild_id (int): ID of the guild
+            setting (ChannelName): Channel to get the name of
+
+        Returns:
+            str: The configured name, or the default one
+        """
+        value = self.values.get(guild_id, {}).get(setting_key(setting))
+        return value if value is not None else str(setting)
+
+    async def set(self, guild_id: int, setting: Setting, value: str | int) -> None:
+        """Change a setting of a guild.
+
+        Args:
+            guild_id (int): ID of the guild
+            setting (Setting): Setting to change
+            value (str | int): New value
+        """
+        key = setting_key(setting)
+        await standby.pg_pool.execute(
+            f"""
+            INSERT INTO
+                {standby.schema}.guild_config (guild_id, setting, value)
+            VALUES
+                ($1, $2, $3)
+            ON CONFLICT ON CONSTRAINT guild_config_pkey DO UPDATE
+            SET
+                value = EXCLUDED.value
+            """,
+            guild_id,
+            key,
+            str(value),
+        )
+        self.values.setdefault(guild_id, {})[key] = str(value)
+
+    async def reset(self, guild_id: int, setting: Setting) -> None:
+        """Return a setting of a guild to its default.
+
+        Args:
+            guild_id (int): ID of the guild
+            setting (Setting): Setting to reset
+        """
+        key = setting_key(setting)
+        await standby.pg_pool.execute(
+            f"""
+            DELETE FROM {standby.schema}.guild_config
+            WHERE
+                guild_id = $1
+                AND setting = $2
+            """,
+            guild_id,
+            key,
+        )
+        self.values.get(guild_id, {}).pop(key, None)
+
+
+guild_config = GuildConfig()
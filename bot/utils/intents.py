@@ -0,0 +1,120 @@
+"""Gateway intents derived from the loaded cogs.
+
+Every intent makes Discord send another kind of event, whether or not
+the bot handles it. Presence updates in particular make up most of the
+traffic on large servers. With the "cogs" profile, the bot only asks
+for the intents needed by the events its listeners handle, plus the
+guilds and members intents that the caches and member lookups rely on.
+The "all" profile requests every intent, as before.
+
+The intents are fixed when the bot is constructed, before any cog is
+imported, so the listeners are found by parsing the cog sources rather
+than by inspecting the loaded cogs.
+
+The profile is chosen with the GATEWAY_INTENTS environment variable.
+"""
+
+import ast
+import logging
+import os
+from pathlib import Path
+
+from nextcord import Intents
+
+logger = logging.getLogger(__name__)
+
+PROFILE = os.getenv("GATEWAY_INTENTS", default="cogs")
+COGS_PATH = Path(__file__).parent.parent / "cogs"
+
+BASE_INTENTS = ("guilds", "members", "emojis_and_stickers")
+EVENT_INTENTS: dict[str, tuple[str, ...]] = {
+    "on_message": ("guild_messages", "dm_messages", "message_content"),
+    "on_message_edit": ("guild_messages", "dm_messages"),
+    "on_message_delete": ("guild_messages", "dm_messages"),
+    "on_raw_message_edit": ("guild_messages", "dm_messages"),
+    "on_raw_message_delete": ("guild_messages", "dm_messages"),
+    "on_raw_bulk_message_delete": ("guild_messages",),
+    "on_reaction_add": ("guild_reactions", "dm_reactions"),
+    "on_reaction_remove": ("guild_reactions", "dm_reactions"),
+    "on_raw_reaction_add": ("guild_reactions", "dm_reactions"),
+    "on_raw_reaction_remove": ("guild_reactions", "dm_reactions"),
+    "on_raw_reaction_clear": ("guild_reactions", "dm_reactions"),
+    "on_raw_reaction_clear_emoji": ("guild_reactions", "dm_reactions"),
+    "on_voice_state_update": ("voice_states",),
+    "on_presence_update": ("presences",),
+    "on_typing": ("guild_typing", "dm_typing"),
+    "on_member_ban": ("moderation",),
+    "on_member_unban": ("moderation",),
+    "on_guild_emojis_update": ("emojis_and_stickers",),
+    "on_guild_stickers_update": ("emojis_and_stickers",),
+    "on_invite_create": ("invites",),
+    "on_invite_delete": ("invites",),
+    "on_webhooks_update": ("webhooks",),
+}
+
+
+def listener_name(node: ast.FunctionDef | ast.AsyncFunctionDef) -> str | None:
+    """Get the event a function listens to, if it is a cog listener.
+
+    Args:
+        node (ast.FunctionDef | ast.AsyncFunctionDef): Parsed function
+
+    Returns:
+        str | None: Name of the event, or None if it is no listener
+    """
+    for decorator in node.decorator_list:
+        if not (
+            isinstance(decorator, ast.Call)
+            and isinstance(decorator.func, ast.Attribute)
+            and decorator.func.attr == "listener"
+        ):
+            continue
+        if decorator.args and isinstance(decorator.args[0], ast.Constant):
+            return decorator.args[0].value
+        return node.name
+    return None
+
+
+def listened_events() -> set[str]:
+    """Find the events the cogs listen to, without importing them.
+
+    Returns:
+        set[str]: Names of the events with a cog listener
+    """
+    events = set()
+    for file in sorted(COGS_PATH.glob("*.py")):
+        tree = ast.parse(file.read_text(encoding="utf-8"))
+        for node in ast.walk(tree):
+            if isinstance(node, ast.FunctionDef | ast.AsyncFunctionDef):
+                event = listener_name(node)
+                if event:
+                    events.add(event)
+    return events
+
+
+def required() -> Intents:
+    """Get the intents needed by the cogs' event listeners.
+
+    Returns:
+        Intents: Intents to connect with
+    """
+    names = set(BASE_INTENTS)
+    for event in listened_events():
+        names.update(EVENT_INTENTS.get(event, ()))
+    return Intents(**dict.fromkeys(names, True))
+
+
+def for_profile() -> Intents:
+    """Get the intents to construct the bot with.
+
+    Returns:
+        Intents: All intents, or only the required ones, depending on
+            the configured profile
+    """
+    if PROFILE == "all":
+        return Intents.all()
+
+    intents = required()
+    enabled = sorted(name for name, value in intents if value)
+    logger.info(f"Connecting with intents: {', '.join(enabled)}")
+    return intents
@@ -0,0 +1,137 @@
+"""Leader election between replicas of the bot.
+
+Several bot processes can run against the same database for failover,
+but background loops must only run in one of them. The replicas compete
+for a Postgres advisory lock held by a dedicated connection: whichever
+holds it is the leader, and only the leader runs leader-only loops.
+
+The lock belongs to the session, so Postgres releases it as soon as the
+leader's connection ends, whether the process exits, crashes or drops
+off the network. TCP keepalives make the server notice a vanished peer
+within seconds, after which a standby's next attempt succeeds. The
+leader checks its connection on the same interval and steps down as
+soon as a check fails, which happens before the server gives up on it,
+so two replicas never consider themselves leader at the same time.
+"""
+
+import asyncio
+import contextlib
+import hashlib
+import logging
+import os
+
+import asyncpg
+from asyncpg import Connection
+
+from domain import URL, Standby
+from utils import metrics
+
+logger = logging.getLogger(__name__)
+standby = Standby()
+
+CAMPAIGN_INTERVAL = float(os.getenv("LEADER_CAMPAIGN_INTERVAL", default="2"))
+CHECK_TIMEOUT = 2.0
+# The server gives up on a silent connection after 5 + 3 * 1 seconds,
+# well after the leader's own check would have failed
+KEEPALIVE_SETTINGS = {
+    "tcp_keepalives_idle": "5",
+    "tcp_keepalives_interval": "1",
+    "tcp_keepalives_count": "3",
+}
+
+
+def lock_key(name: str) -> int:
+    """Get the advisory lock key for a name, as a signed 64-bit int."""
+    return int.from_bytes(
+        hashlib.blake2b(name.encode(), digest_size=8).digest(),
+        signed=True,
+    )
+
+
+class Leader:
+    """Campaigns for leadership among the replicas sharing a schema."""
+
+    def __init__(self) -> None:
+        """Initialize leader election."""
+        self.elected = asyncio.Event()
+        self.key: int | None = None
+        self.connection: Connection | None = None
+        self.task: asyncio.Task | None = None
+        metrics.LEADER.set_function(function=lambda: float(self.is_leader))
+
+    @property
+    def is_leader(self) -> bool:
+        """Whether this replica currently holds the lock."""
+        return self.elected.is_set()
+
+    async def start(self) -> None:
+        """Start campaigning in the background.
+
+        Must run after the database has been set up, as the lock is
+        named after the schema.
+        """
+        self.key = lock_key(f"{standby.schema}.leader")
+        self.task = asyncio.create_task(self.campaign())
+        standby.bot.shutdown_hooks.append(self.stop)
+
+    async def campaign(self) -> None:
+        """Try to become or stay leader, forever."""
+        while True:
+            try:
+                await self.attempt()
+            except Exception:
+                logger.exception("Leader election attempt failed")
+                self.disconnect()
+            await asyncio.sleep(CAMPAIGN_INTERVAL)
+
+    async def attempt(self) -> None:
+        """Check the held lock, or try to take it."""
+        if self.connection is None or self.connection.is_closed():
+            self.step_down()
+            self.connection = await asyncpg.connect(
+                URL.DATABASE,
+                ssl="prefer",
+                timeout=CHECK_TIMEOUT,
+                server_settings=KEEPALIVE_SETTINGS,
+            )
+
+        if self.is_leader:
+            await self.connection.fetchval("SELECT 1", timeout=CHECK_TIMEOUT)
+            return
+
+        acquired = await self.connection.fetchval(
+            "SELECT pg_try_advisory_lock($1)",
+            self.key,
+            timeout=CHECK_TIMEOUT,
+        )
+        if acquired:
+            logger.info("Elected leader, running background loops")
+            self.elected.set()
+
+    def step_down(self) -> None:
+        """Stop acting as leader."""
+        if self.is_leader:
+            logger.warning("Lost leadership, pausing background loops")
+            self.elected.clear()
+
+    def disconnect(self) -> None:
+        """Drop the connection, releasing the lock if it was held."""
+        self.step_down()
+        if self.connection is not None:
+            self.connection.terminate()
+            self.connection = None
+
+    async def stop(self) -> None:
+        """Stop campaigning and hand leadership to another replica.
+
+        Closing the connection ends the session, which releases the
+        lock right away instead of when the server times it out.
+        """
+        if self.task is not None:
+            self.task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self.task
+        self.disconnect()
+
+
+leader = Leader()
@@ -0,0 +1,161 @@
+"""Index of the memes available to the meme command.
+
+Meme files live in static/images/memes, with alternative versions of
+the same meme distinguished by a bracketed suffix, e.g.
+"Horny [DD].png" and "Horny [dog].jpg". The catalog maps each meme name
+to its files and keeps a trigram index of the names so autocomplete
+suggestions can be ranked without scanning the whole catalog.
+"""
+
+import logging
+import random
+import re
+from collections import defaultdict
+from functools import lru_cache
+from pathlib import Path
+
+from fuzzywuzzy import fuzz
+
+from domain import URL
+
+logger = logging.getLogger(__name__)
+
+MEME_DIRECTORY = Path(URL.LOCAL_STATIC) / "images/memes"
+VARIANT_SUFFIX = re.compile(r" \[.+\]$")
+MAX_SUGGESTIONS = 25
+FUZZY_THRESHOLD = 70
+NGRAM_LENGTH = 3
+
+
+def ngrams(text: str) -> set[str]:
+    """Get the set of character trigrams in a text."""
+    return {
+        text[index : index + NGRAM_LENGTH]
+        for index in range(len(text) - NGRAM_LENGTH + 1)
+    }
+
+
+class MemeCatalog:
+    """Names and files of all available memes."""
+
+    def __init__(self, directory: Path = MEME_DIRECTORY) -> None:
+        """Initialize catalog."""
+        self.directory = directory
+        self.mtime = None
+        self.variants: dict[str, list[str]] = {}
+        self.names: list[str] = []
+        self.folded: list[str] = []
+        self.index: dict[str, set[int]] = {}
+        self.cached_rank = self._rank
+        self.reload()
+
+    def reload(self) -> bool:
+        """Rebuild the catalog if the meme directory has changed.
+
+        Returns:
+            bool: Whether the catalog was rebuilt
+        """
+        mtime = self.directory.stat().st_mtime_ns
+        if mtime == self.mtime:
+            return False
+
+        variants = defaultdict(list)
+        for file in sorted(self.directory.iterdir()):
+            if file.is_file():
+                variants[VARIANT_SUFFIX.sub("", file.stem)].append(file.name)
+
+        self.mtime = mtime
+        self.variants = dict(variants)
+        self.names = sorted(self.variants, key=str.casefold)
+        self.folded = [name.casefold() for name in self.names]
+        self.index = defaultdict(set)
+        for position, name in enumerate(self.folded):
+            for ngram in ngrams(name):
+                self.index[ngram].add(position)
+        self.cached_rank = lru_cache(maxsize=1024)(self._rank)
+
+        logger.info(f"Loaded {len(self.names)} memes from {self.directory}")
+        return True
+
+    def pick(self, name: str) -> str | None:
+        """Get the file name of a random version of a meme.
+
+        Args:
+            name (str): Meme name
+
+        Returns:
+            str | None: File name, or None if there is no such meme
+        """
+        if name not in self.variants:
+            return None
+        return random.choice(self.variants[name])
+
+    def _candidates(self, query: str) -> set[int]:
+        """Get the positions of names that may contain the query.
+
+        Every name containing the query also contains all of its
+        trigrams, so intersecting their postings narrows the search.
+        Queries too short to have trigrams match every name.
+        """
+        query_ngrams = ngrams(query)
+        if not query_ngrams:
+            return set(range(len(self.names)))
+        postings = sorted(
+            (self.index.get(ngram, set()) for ngram in query_ngrams),
+            key=len,
+        )
+        return set.intersection(*postings)
+
+    def _rank(self, query: str) -> tuple[str, ...]:
+        """Get the best matching meme names for a casefolded query.
+
+        Exact matches are ranked first, followed by names starting with
+        the query, names with a word starting with the query and names
+        containing it. Remaining slots are filled with fuzzy matches
+        among names sharing at least one trigram with the query.
+        """
+        ranked = []
+        for position in self._candidates(query):
+            name = self.folded[position]
+            if query not in name:
+                continue
+            if name == query:
+                tier = 0
+            elif name.startswith(query):
+                tier = 1
+            elif f" {query}" in name:
+                tier = 2
+            else:
+                tier = 3
+            ranked.append((tier, position))
+        matches = [self.names[position] for _, position in sorted(ranked)]
+
+        if len(matches) < MAX_SUGGESTIONS:
+            exact = {position for _, position in ranked}
+            related = set().union(
+                *(self.index.get(ngram, set()) for ngram in ngrams(query)),
+            )
+            scored = sorted(
+                (-fuzz.partial_ratio(query, self.folded[position]), position)
+                for position in related - exact
+            )
+            matches.extend(
+                self.names[position]
+                for score, position in scored
+                if -score >= FUZZY_THRESHOLD
+            )
+
+        return tuple(matches[:MAX_SUGGESTIONS])
+
+    def suggest(self, query: str) -> tuple[str, ...]:
+        """Get autocomplete suggestions for a query.
+
+        Results are memoized until the catalog is next rebuilt.
+
+        Args:
+            query (str): User input
+
+        Returns:
+            tuple[str, ...]: Up to 25 matching meme names
+        """
+        return self.cached_rank(query.casefold())
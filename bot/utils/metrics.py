@@ -0,0 +1,274 @@
+"""Runtime metrics in the Prometheus text exposition format.
+
+Metrics are recorded by the instrumented Bot, the database pool and
+delayed loops, and served over HTTP on the port given by the
+METRICS_PORT environment variable. Nothing is served if it is unset.
+The server only listens on localhost unless METRICS_HOST names another
+interface to expose it on, e.g. 0.0.0.0 for a scraper on another host.
+"""
+
+import logging
+import os
+import time
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from typing import ClassVar
+
+from aiohttp import web
+
+logger = logging.getLogger(__name__)
+
+METRICS_PORT = os.getenv("METRICS_PORT")
+METRICS_HOST = os.getenv("METRICS_HOST", default="127.0.0.1")
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+type Labels = tuple[str, ...]
+
+
+def format_labels(names: Labels, values: Labels, **extra: str) -> str:
+    """Format label names and values as a Prometheus label set."""
+    pairs = [*zip(names, values, strict=True), *extra.items()]
+    if not pairs:
+        return ""
+    escaped = (
+        (name, str(value).replace("\\", "\\\\").replace('"', '\\"'))
+        for name, value in pairs
+    )
+    return "{" + ",".join(f'{name}="{value}"' for name, value in escaped) + "}"
+
+
+class Metric(ABC):
+    """Base class for metrics, keeping track of all instances."""
+
+    kind: ClassVar[str]
+    registry: ClassVar[list["Metric"]] = []
+
+    def __init__(self, name: str, description: str, labels: Labels = ()) -> None:
+        """Initialize metric and add it to the registry."""
+        self.name = name
+        self.description = description
+        self.labels = labels
+        Metric.registry.append(self)
+
+    @abstractmethod
+    def samples(self) -> Iterator[str]:
+        """Yield the metric's sample lines."""
+
+    def render(self) -> str:
+        """Render the metric in the text exposition format."""
+        lines = [
+            f"# HELP {self.name} {self.description}",
+            f"# TYPE {self.name} {self.kind}",
+            *self.samples(),
+        ]
+        return "\n".join(lines)
+
+
+class Counter(Metric):
+    """Monotonically increasing count."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, description: str, labels: Labels = ()) -> None:
+        """Initialize counter."""
+        super().__init__(name, description, labels)
+        self.values: dict[Labels, float] = defaultdict(float)
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        """Increase the count for a label set."""
+        self.values[labels] += amount
+
+    def samples(self) -> Iterator[str]:
+        """Yield the metric's sample lines."""
+        for labels, value in self.values.items():
+            yield f"{self.name}{format_labels(self.labels, labels)} {value}"
+
+
+class Gauge(Metric):
+    """Value that can go up and down, or be computed when scraped."""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, description: str, labels: Labels = ()) -> None:
+        """Initialize gauge."""
+        super().__init__(name, description, labels)
+        self.values: dict[Labels, float] = {}
+        self.functions: dict[Labels, Callable[[], float]] = {}
+
+    def set(self, *labels: str, value: float) -> None:
+        """Set the value for a label set."""
+        self.values[labels] = value
+
+    def set_function(self, *labels: str, function: Callable[[], float]) -> None:
+        """Compute the value for a label set each time it is scraped."""
+        self.functions[labels] = function
+
+    def samples(self) -> Iterator[str]:
+        """Yield the metric's sample lines."""
+        values = dict(self.values)
+        for labels, function in self.functions.items():
+            try:
+                values[labels] = function()
+            except Exception:
+                logger.exception(f"Could not compute {self.name}")
+        for labels, value in values.items():
+            yield f"{self.name}{format_labels(self.labels, labels)} {value}"
+
+
+class Histogram(Metric):
+    """Distribution of observed values, e.g. durations in seconds."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        labels: Labels = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> None:
+        """Initialize histogram."""
+        super().__init__(name, description, labels)
+        self.buckets = buckets
+        self.counts: dict[Labels, list[int]] = {}
+        self.sums: dict[Labels, float] = defaultdict(float)
+
+    def observe(self, *labels: str, value: float) -> None:
+        """Record an observation for a label set."""
+        counts = self.counts.setdefault(labels, [0] * (len(self.buckets) + 1))
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                counts[index] += 1
+                break
+        else:
+            counts[-1] += 1
+        self.sums[labels] += value
+
+    @contextmanager
+    def time(self, *labels: str) -> Iterator[None]:
+        """Observe the duration of a block of code."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(*labels, value=time.perf_counter() - start)
+
+    def samples(self) -> Iterator[str]:
+        """Yield the metric's sample lines."""
+        for labels, counts in self.counts.items():
+            cumulative = 0
+            for bound, count in zip(
+                [*self.buckets, "+Inf"],
+                counts,
+                strict=True,
+            ):
+                cumulative += count
+                label_set = format_labels(self.labels, labels, le=str(bound))
+                yield f"{self.name}_bucket{label_set} {cumulative}"
+            label_set = format_labels(self.labels, labels)
+            yield f"{self.name}_sum{label_set} {self.sums[labels]}"
+            yield f"{self.name}_count{label_set} {cumulative}"
+
+
+EVENT_DURATION = Histogram(
+    "standby_event_duration_seconds",
+    "Time spent in event listeners.",
+    ("event", "listener"),
+)
+COMMAND_DURATION = Histogram(
+    "standby_command_duration_seconds",
+    "Time spent processing application commands.",
+    ("command",),
+)
+DB_ACQUIRE_WAIT = Histogram(
+    "standby_db_acquire_wait_seconds",
+    "Time spent waiting for a database connection.",
+)
+DB_CONNECTIONS = Gauge(
+    "standby_db_connections",
+    "Database connections in the pool.",
+    ("state",),
+)
+DB_ACQUIRE_WAITING = Gauge(
+    "standby_db_acquire_waiting",
+    "Tasks waiting for a database connection.",
+)
+DB_QUERY_DURATION = Histogram(
+    "standby_db_query_duration_seconds",
+    "Time spent executing database queries.",
+)
+DB_QUERY_ERRORS = Counter(
+    "standby_db_query_errors_total",
+    "Database queries that raised an exception.",
+)
+DB_SLOW_QUERIES = Counter(
+    "standby_db_slow_queries_total",
+    "Database queries slower than the slow query threshold.",
+)
+REST_REQUESTS = Counter(
+    "standby_rest_requests_total",
+    "Discord REST requests by route and outcome.",
+    ("route", "status"),
+)
+REST_DURATION = Histogram(
+    "standby_rest_duration_seconds",
+    "Discord REST request duration, including rate limit waits.",
+    ("route",),
+)
+REST_RATE_LIMITS = Counter(
+    "standby_rest_rate_limits_total",
+    "Discord REST 429 responses by route and scope.",
+    ("route", "scope"),
+)
+LOOP_TICK_DURATION = Histogram(
+    "standby_loop_tick_duration_seconds",
+    "Duration of each iteration of a delayed loop.",
+    ("task",),
+)
+LEADER = Gauge(
+    "standby_leader",
+    "Whether this replica is the leader running background loops.",
+)
+LOOP_LAG = Histogram(
+    "standby_event_loop_lag_seconds",
+    "How late the event loop heartbeat wakes up.",
+)
+OUTBOX_QUEUED = Gauge(
+    "standby_outbox_queued_messages",
+    "Outgoing messages waiting to be sent.",
+)
+OUTBOX_MESSAGES = Counter(
+    "standby_outbox_messages_total",
+    "Outgoing messages by priority and outcome.",
+    ("priority", "outcome"),
+)
+OUTBOX_WAIT = Histogram(
+    "standby_outbox_wait_seconds",
+    "Time outgoing messages spend queued before being sent.",
+    ("priority",),
+)
+
+
+def render() -> str:
+    """Render all registered metrics."""
+    return "\n".join(metric.render() for metric in Metric.registry) + "\n"
+
+
+async def handle_metrics(request: web.Request) -> web.Response:  # noqa: ARG001
+    """Serve the current metrics."""
+    return web.Response(text=render(), content_type="text/plain", charset="utf-8")
+
+
+async def start_server() -> None:
+    """Serve metrics on METRICS_HOST and METRICS_PORT, if set."""
+    if not METRICS_PORT:
+        return
+    app = web.Application()
+    app.router.add_get("/metrics", handle_metrics)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, host=METRICS_HOST, port=int(METRICS_PORT))
+    await site.start()
+    logger.info(f"Serving metrics on {METRICS_HOST}:{METRICS_PORT}")
@@ -0,0 +1,389 @@
+"""Solver for the fabricate_number command.
+
+Finds an arithmetic expression that combines some of the provided
+numbers into a target value. Numbers may be concatenated ("1" and "2"
+into "12"), and combined with +, -, * and exact integer division.
+
+Searching is exponential in the number of inputs, so it runs in a
+separate process with a hard time budget. The worker handles one search
+at a time: identical requests share a search, and others wait for the
+worker, up to MAX_WAITING at a time, before their budget starts.
+Reachable values are computed once per multiset of inputs (so "1,2,2"
+and "2,1,2" share work) and memoized in the worker up to MAX_MEMO_VALUES
+values, and finished searches are stored in the database so repeated
+requests are answered without solving.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import time
+from collections import Counter, OrderedDict
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from itertools import permutations, product
+
+from domain import Standby
+
+logger = logging.getLogger(__name__)
+standby = Standby()
+
+MAX_NUMBERS = 8
+MAX_CONCAT_LENGTH = 3
+VALUE_LIMIT = 10**6
+TIME_BUDGET = 10
+MAX_WAITING = 3
+# Values kept across all memoized multisets. Six inputs alone can reach
+# tens of thousands of values, each with its expression.
+MAX_MEMO_VALUES = 200_000
+
+type Multiset = tuple[int, ...]
+
+_deadline = 0.0
+_executor: ProcessPoolExecutor | None = None
+_memo: OrderedDict[Multiset, dict[int, str]] = OrderedDict()
+_memo_values = 0
+
+
+class SolverBusyError(Exception):
+    """Raised when too many searches are already waiting."""
+
+
+def _check_deadline() -> None:
+    """Abort the current search if the time budget is exhausted.
+
+    Raises:
+        TimeoutError: If the deadline has passed
+    """
+    if time.monotonic() > _deadline:
+        raise TimeoutError
+
+
+def _sub_multisets(numbers: Multiset) -> Iterator[Multiset]:
+    """Yield each proper non-empty sub-multiset of a sorted multiset."""
+    counts = sorted(Counter(numbers).items())
+    for picks in product(*(range(count + 1) for _, count in counts)):
+        size = sum(picks)
+        if 0 < size < len(numbers):
+            yield tuple(
+                number
+                for (number, _), pick in zip(counts, picks, strict=True)
+                for _ in range(pick)
+            )
+
+
+def _difference(numbers: Multiset, part: Multiset) -> Multiset:
+    """Remove the elements of a sub-multiset from a sorted multiset."""
+    return tuple(sorted((Counter(numbers) - Counter(part)).elements()))
+
+
+def _wrap(expression: str) -> str:
+    """Parenthesize compound expressions."""
+    return expression if expression.isdigit() else f"({expression})"
+
+
+def _combine(
+    lhs: int,
+    lhs_expr: str,
+    rhs: int,
+    rhs_expr: str,
+    *,
+    commutative: bool,
+) -> Iterator[tuple[int, str]]:
+    """Yield every value obtainable from a single operation."""
+    left, right = _wrap(lhs_expr), _wrap(rhs_expr)
+    if commutative:
+        yield lhs + rhs, f"{left}+{right}"
+        yield lhs * rhs, f"{left}*{right}"
+    yield lhs - rhs, f"{left}-{right}"
+    if rhs != 0 and lhs % rhs == 0:
+        yield lhs // rhs, f"{left}/{right}"
+
+
+def _leaves(numbers: Multiset) -> dict[int, str]:
+    """Get the values obtainable by concatenating all numbers."""
+    if len(numbers) > MAX_CONCAT_LENGTH:
+        return {}
+    values = {}
+    for perm in sorted(set(permutations(numbers))):
+        value = int("".join(map(str, perm)))
+        values.setdefault(value, str(value))
+    return values
+
+
+def _splits(numbers: Multiset) -> Iterator[tuple[dict, dict, bool]]:
+    """Yield reachable values for each way to split a multiset in two.
+
+    The flag marks the canonical order of each pair, which is the only
+    one commutative operations need to be applied in.
+    """
+    for left in _sub_multisets(numbers):
+        right = _difference(numbers, left)
+        yield reachable(left), reachable(right), left <= right
+
+
+def reachable(numbers: Multiset) -> dict[int, str]:
+    """Get all values obtainable using exactly the provided numbers.
+
+    Results are memoized, dropping the least recently used ones once
+    more than MAX_MEMO_VALUES values are kept.
+
+    Args:
+        numbers (Multiset): Sorted tuple of input numbers
+
+    Returns:
+        dict[int, str]: Reachable values mapped to an expression
+            producing them
+    """
+    global _memo_values  # noqa: PLW0603
+    if numbers in _memo:
+        _memo.move_to_end(numbers)
+        return _memo[numbers]
+
+    values = _leaves(numbers)
+    for left_values, right_values, commutative in _splits(numbers):
+        for lhs, lhs_expr in left_values.items():
+            _check_deadline()
+            for rhs, rhs_expr in right_values.items():
+                for value, expr in _combine(
+                    lhs,
+                    lhs_expr,
+                    rhs,
+                    rhs_expr,
+                    commutative=commutative,
+                ):
+                    if abs(value) <= VALUE_LIMIT:
+                        values.setdefault(value, expr)
+
+    _memo[numbers] = values
+    _memo_values += len(values)
+    while _memo_values > MAX_MEMO_VALUES and len(_memo) > 1:
+        _, evicted = _memo.popitem(last=False)
+        _memo_values -= len(evicted)
+    return values
+
+
+def _find(numbers: Multiset, target: int) -> str | None:
+    """Find an expression for the target using exactly these numbers.
+
+    Unlike reachable, stops at the first hit and does not memoize.
+    """
+    leaves = _leaves(numbers)
+    if target in leaves:
+        return leaves[target]
+    for left_values, right_values, commutative in _splits(numbers):
+        for lhs, lhs_expr in left_values.items():
+            _check_deadline()
+            for rhs, rhs_expr in right_values.items():
+                for value, expr in _combine(
+                    lhs,
+                    lhs_expr,
+                    rhs,
+                    rhs_expr,
+                    commutative=commutative,
+                ):
+                    if value == target:
+                        return expr
+    return None
+
+
+def solve(target: int, numbers: Multiset, budget: float) -> str | None:
+    """Search for an expression, trying smaller subsets first.
+
+    Runs in a worker process.
+
+    Args:
+        target (int): Value to obtain
+        numbers (Multiset): Sorted tuple of available numbers
+        budget (float): Time budget in seconds
+
+    Raises:
+        TimeoutError: If the budget runs out before the search ends
+
+    Returns:
+        str | None: An expression evaluating to the target, or None if
+            no such expression exists
+    """
+    global _deadline  # noqa: PLW0603
+    _deadline = time.monotonic() + budget
+
+    for size in range(1, len(numbers) + 1):
+        subsets = {subset for subset in _sub_multisets(numbers) if len(subset) == size}
+        if size == len(numbers):
+            subsets.add(numbers)
+        for subset in sorted(subsets):
+            if expression := _find(subset, target):
+                return expression
+    return None
+
+
+def get_executor() -> ProcessPoolExecutor:
+    """Get the solver process pool, creating it if needed.
+
+    The worker is forked as soon as the pool is created. Forking a
+    process that runs threads can leave locks held in the child, so
+    main calls this before startup creates any threads.
+    """
+    global _executor  # noqa: PLW0603
+    if _executor is None:
+        _executor = ProcessPoolExecutor(
+            max_workers=1,
+            mp_context=multiprocessing.get_context("fork"),
+        )
+        _executor.submit(time.monotonic)
+    return _executor
+
+
+def reset_executor() -> None:
+    """Drop a broken process pool, so the next search gets a new one.
+
+    The pool breaks when its worker dies, e.g. when the OOM killer
+    picks it. The replacement is forked while threads are running, which
+    is safe enough here: the worker only runs solve, which takes no
+    locks.
+    """
+    global _executor  # noqa: PLW0603
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+class Searches:
+    """Runs searches in the worker one at a time."""
+
+    def __init__(self) -> None:
+        """Initialize searches."""
+        self.lock = asyncio.Lock()
+        self.pending: dict[tuple[int, Multiset], asyncio.Task[str | None]] = {}
+
+    async def submit(
+        self,
+        target: int,
+        numbers: Multiset,
+        budget: float,
+    ) -> str | None:
+        """Search, sharing the search of an identical pending request.
+
+        Raises:
+            SolverBusyError: If too many searches are already pending
+            TimeoutError: If the search does not finish in time
+        """
+        request = (target, numbers)
+        task = self.pending.get(request)
+        if task is None:
+            # One search runs while the others wait
+            if len(self.pending) > MAX_WAITING:
+                raise SolverBusyError
+            task = asyncio.create_task(self.run(target, numbers, budget))
+            task.add_done_callback(lambda _: self.pending.pop(request, None))
+            self.pending[request] = task
+        return await asyncio.shield(task)
+
+    async def run(self, target: int, numbers: Multiset, budget: float) -> str | None:
+        """Wait for the worker to be free, then search.
+
+        The timeout only starts once the worker is free, so searches
+        waiting behind another are not charged for its time. If the
+        worker dies, the search is retried once in a new one.
+
+        Raises:
+            TimeoutError: If the search does not finish in time
+            BrokenProcessPool: If the new worker dies as well
+        """
+        async with self.lock:
+            try:
+                return await self.search(target, numbers, budget)
+            except BrokenProcessPool:
+                logger.warning("Solver worker died, starting a new one")
+                reset_executor()
+            try:
+                return await self.search(target, numbers, budget)
+            except BrokenProcessPool:
+                reset_executor()
+                raise
+
+    @staticmethod
+    async def search(target: int, numbers: Multiset, budget: float) -> str | None:
+        """Search in the worker, giving up shortly after the budget."""
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(get_executor(), solve, target, numbers, budget)
+        try:
+            return await asyncio.wait_for(future, timeout=budget + 5)
+        except TimeoutError:
+            future.cancel()
+            raise
+
+
+searches = Searches()
+
+
+async def fabricate_number(
+    target: int,
+    numbers: list[int],
+    guild_id: int,
+    budget: float = TIME_BUDGET,
+) -> str | None:
+    """Find a way to combine the numbers into the target.
+
+    Solutions do not depend on the guild, so those found for any guild
+    are reused. New ones are stored under the guild that asked.
+
+    Args:
+        target (int): Value to obtain
+        numbers (list[int]): Available non-negative numbers
+        guild_id (int): ID of the guild asking
+        budget (float, optional): Time budget in seconds. Defaults to
+            TIME_BUDGET.
+
+    Raises:
+        TimeoutError: If no answer was found within the budget
+        SolverBusyError: If too many searches are already waiting
+        BrokenProcessPool: If the worker keeps dying
+
+    Returns:
+        str | None: An expression evaluating to the target, or None if
+            no such expression exists
+    """
+    multiset = tuple(sorted(numbers))
+    key = ",".join(map(str, multiset))
+
+    record = await standby.pg_pool.fetchrow(
+        f"""
+        SELECT
+            solution
+        FROM
+            {standby.schema}.fabricated_number
+        WHERE
+            target = $1
+            AND numbers = $2
+        LIMIT
+            1
+        """,
+        target,
+        key,
+    )
+    if record:
+        logger.debug(f"Cached solution found for {target} from {key}")
+        return record["solution"]
+
+    try:
+        solution = await searches.submit(target, multiset, budget)
+    except TimeoutError:
+        logger.info(f"Gave up on {target} from {key} after {budget} seconds")
+        raise
+
+    await standby.pg_pool.execute(
+        f"""
+        INSERT INTO
+            {standby.schema}.fabricated_number (guild_id, target, numbers, solution)
+        VALUES
+            ($1, $2, $3, $4)
+        ON CONFLICT ON CONSTRAINT fabricated_number_pkey DO NOTHING
+        """,
+        guild_id,
+        target,
+        key,
+        solution,
+    )
+    return solution
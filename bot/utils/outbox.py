@@ -0,0 +1,301 @@
+"""Scheduling of outgoing messages by priority.
+
+Messages are sent through a queue per destination, matching Discord's
+per-channel rate limit buckets, and a shared pool of send slots that
+goes to the most important waiting message first. When messages pile up
+for a destination, queued logs that consist only of embeds and were
+marked as mergeable are combined into a single message, and background
+notifications are dropped once they have waited too long or the queue
+is full.
+"""
+
+import asyncio
+import contextlib
+import heapq
+import itertools
+import logging
+import time
+from collections.abc import AsyncIterator
+from enum import IntEnum
+from typing import Any
+
+from nextcord import Embed, Message
+from nextcord.abc import Messageable
+
+from utils import metrics
+
+logger = logging.getLogger(__name__)
+
+MAX_CONCURRENT_SENDS = 5
+MAX_QUEUED_PER_DESTINATION = 50
+MAX_BACKGROUND_DELAY = 60.0
+MAX_EMBEDS_PER_MESSAGE = 10
+
+type Key = tuple[str, int]
+
+
+class Priority(IntEnum):
+    """Importance of an outgoing message, most important first."""
+
+    INTERACTION = 0  # Part of the response to a command
+    REPLY = 1  # Reaction to something a user did
+    LOG = 2  # Moderation and maintenance logs
+    BACKGROUND = 3  # Notifications nobody is waiting for
+
+
+class PrioritySemaphore:
+    """Semaphore that lets the most important waiter in first."""
+
+    def __init__(self, value: int) -> None:
+        """Initialize semaphore."""
+        self.value = value
+        self.waiters: list[tuple[int, int, asyncio.Future[None]]] = []
+        self.sequence = itertools.count()
+
+    @contextlib.asynccontextmanager
+    async def acquire(self, priority: Priority) -> AsyncIterator[None]:
+        """Hold a slot for the duration of the context."""
+        if self.value > 0 and not self.waiters:
+            self.value -= 1
+        else:
+            future = asyncio.get_running_loop().create_future()
+            heapq.heappush(self.waiters, (priority, next(self.sequence), future))
+            try:
+                await future
+            except asyncio.CancelledError:
+                if future.done() and not future.cancelled():
+                    self.release()
+                raise
+        try:
+            yield
+        finally:
+            self.release()
+
+    def release(self) -> None:
+        """Hand the slot to the next waiter, or free it."""
+        while self.waiters:
+            _, _, future = heapq.heappop(self.waiters)
+            if not future.done():
+                future.set_result(None)
+                return
+        self.value += 1
+
+
+class Outgoing:
+    """A message waiting to be sent."""
+
+    __slots__ = (
+        "content",
+        "future",
+        "kwargs",
+        "mergeable",
+        "priority",
+        "queued_at",
+        "sequence",
+    )
+
+    def __init__(
+        self,
+        priority: Priority,
+        sequence: int,
+        content: str | None,
+        kwargs: dict[str, Any],
+        *,
+        mergeable: bool = False,
+    ) -> None:
+        """Initialize outgoing message."""
+        self.priority = priority
+        self.mergeable = mergeable
+        self.sequence = sequence
+        self.content = content
+        self.kwargs = kwargs
+        self.queued_at = time.monotonic()
+        self.future: asyncio.Future[Message | None] = (
+            asyncio.get_running_loop().create_future()
+        )
+
+    def __lt__(self, other: "Outgoing") -> bool:
+        """Order by priority, then by age."""
+        return (self.priority, self.sequence) < (other.priority, other.sequence)
+
+    @property
+    def embeds(self) -> list[Embed]:
+        """Embeds of the message."""
+        if "embed" in self.kwargs:
+            return [self.kwargs["embed"]]
+        return list(self.kwargs.get("embeds") or [])
+
+    def can_merge(self, other: "Outgoing") -> bool:
+        """Check whether another message can be sent with this one."""
+        return (
+            self.mergeable
+            and other.mergeable
+            and self.priority >= Priority.LOG
+            and other.priority == self.priority
+            and self.content is None
+            and other.content is None
+            and self.kwargs.keys() <= {"embed", "embeds"}
+            and other.kwargs.keys() <= {"embed", "embeds"}
+        )
+
+    def resolve(self, message: Message | None) -> None:
+        """Pass the sent message to whoever is waiting for it."""
+        if not self.future.done():
+            self.future.set_result(message)
+
+    def fail(self, error: BaseException) -> None:
+        """Pass an error to whoever is waiting for the message."""
+        if not self.future.done():
+            self.future.set_exception(error)
+
+
+class Outbox:
+    """Sends messages in order of priority."""
+
+    def __init__(
+        self,
+        max_concurrent_sends: int = MAX_CONCURRENT_SENDS,
+        max_queued: int = MAX_QUEUED_PER_DESTINATION,
+        max_background_delay: float = MAX_BACKGROUND_DELAY,
+    ) -> None:
+        """Initialize outbox."""
+        self.slots = PrioritySemaphore(max_concurrent_sends)
+        self.max_queued = max_queued
+        self.max_background_delay = max_background_delay
+        self.queues: dict[Key, list[Outgoing]] = {}
+        self.workers: dict[Key, asyncio.Task] = {}
+        self.sequence = itertools.count()
+        metrics.OUTBOX_QUEUED.set_function(
+            function=lambda: sum(len(queue) for queue in self.queues.values()),
+        )
+
+    async def send(
+        self,
+        destination: Messageable,
+        content: str | None = None,
+        *,
+        priority: Priority = Priority.REPLY,
+        mergeable: bool = False,
+        **kwargs: Any,  # noqa: ANN401
+    ) -> Message | None:
+        """Send a message once its turn comes.
+
+        Takes the same arguments as Messageable.send.
+
+        Args:
+            destination (Messageable): Channel or user to send to
+            content (str | None): Text of the message
+            priority (Priority): Importance of the message
+            mergeable (bool): Whether the message may be combined with
+                other queued log or background embeds. Only for callers
+                that do not use the returned message.
+            **kwargs: Further arguments of Messageable.send
+
+        Returns:
+            Message | None: The message that was sent, which is shared
+                with other messages if they were combined, or None if
+                the message was dropped
+        """
+        key = (type(destination).__name__, destination.id)
+        queue = self.queues.setdefault(key, [])
+        item = Outgoing(
+            priority,
+            next(self.sequence),
+            content,
+            kwargs,
+            mergeable=mergeable,
+        )
+        heapq.heappush(queue, item)
+        if len(queue) > self.max_queued:
+            self.shed(queue)
+        if key not in self.workers:
+            self.workers[key] = asyncio.create_task(self.drain(key, destination))
+        return await item.future
+
+    def shed(self, queue: list[Outgoing]) -> None:
+        """Drop the oldest background message of an overfull queue."""
+        background = [item for item in queue if item.priority == Priority.BACKGROUND]
+        if not background:
+            return
+        oldest = min(background, key=lambda item: item.sequence)
+        queue.remove(oldest)
+        heapq.heapify(queue)
+        self.drop(oldest)
+
+    def drop(self, item: Outgoing) -> None:
+        """Give up on sending a message."""
+        metrics.OUTBOX_MESSAGES.inc(item.priority.name.lower(), "dropped")
+        item.resolve(None)
+
+    def take_batch(self, queue: list[Outgoing]) -> list[Outgoing]:
+        """Take the next message and those it can be combined with."""
+        first = heapq.heappop(queue)
+        batch = [first]
+        embed_count = len(first.embeds)
+        while (
+            queue
+            and first.can_merge(queue[0])
+            and embed_count + len(queue[0].embeds) <= MAX_EMBEDS_PER_MESSAGE
+        ):
+            item = heapq.heappop(queue)
+            batch.append(item)
+            embed_count += len(item.embeds)
+        return batch
+
+    async def drain(self, key: Key, destination: Messageable) -> None:
+        """Send the queued messages of a destination, in order."""
+        queue = self.queues[key]
+        batch: list[Outgoing] = []
+        try:
+            while queue:
+                # Skip messages whose senders were cancelled
+                batch = [
+                    item for item in self.take_batch(queue) if not item.future.done()
+                ]
+                if not batch:
+                    continue
+                first = batch[0]
+                waited = time.monotonic() - first.queued_at
+                if (
+                    first.priority == Priority.BACKGROUND
+                    and waited > self.max_background_delay
+                ):
+                    for item in batch:
+                        self.drop(item)
+                    continue
+
+                async with self.slots.acquire(first.priority):
+                    await self.deliver(destination, batch)
+        finally:
+            # Settle what is left if the worker was cancelled, so that
+            # the senders do not wait forever
+            for item in [*batch, *queue]:
+                if not item.future.done():
+                    self.drop(item)
+            del self.queues[key]
+            del self.workers[key]
+
+    async def deliver(self, destination: Messageable, batch: list[Outgoing]) -> None:
+        """Send a batch of messages as one."""
+        first = batch[0]
+        priority = first.priority.name.lower()
+        metrics.OUTBOX_WAIT.observe(priority, value=time.monotonic() - first.queued_at)
+        try:
+            if len(batch) == 1:
+                message = await destination.send(first.content, **first.kwargs)
+            else:
+                embeds = [embed for item in batch for embed in item.embeds]
+                message = await destination.send(embeds=embeds)
+        except Exception as e:
+            metrics.OUTBOX_MESSAGES.inc(priority, "failed", amount=len(batch))
+            for item in batch:
+                item.fail(e)
+            return
+
+        outcome = "sent" if len(batch) == 1 else "combined"
+        metrics.OUTBOX_MESSAGES.inc(priority, outcome, amount=len(batch))
+        for item in batch:
+            item.resolve(message)
+
+
+outbox = Outbox()
@@ -0,0 +1,82 @@
+"""Sampling profiler for the running bot.
+
+Samples the event loop thread's stack at a fixed interval from a
+separate thread and aggregates the samples into the collapsed stack
+format ("outer;inner;innermost count" per line) understood by
+flamegraph.pl, speedscope and similar tools. The overhead is a stack
+walk every few milliseconds, so it is safe to run in production.
+"""
+
+import asyncio
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from types import FrameType
+
+SAMPLE_INTERVAL = 0.005
+MAX_DURATION = 120
+
+
+def frame_label(frame: FrameType) -> str:
+    """Get the label of a single stack frame."""
+    code = frame.f_code
+    return f"{Path(code.co_filename).stem}.{code.co_qualname}"
+
+
+def collapse(frame: FrameType) -> str:
+    """Collapse a stack into a single line, outermost frame first."""
+    labels = []
+    while frame is not None:
+        labels.append(frame_label(frame))
+        frame = frame.f_back
+    return ";".join(reversed(labels))
+
+
+class SamplingProfiler:
+    """Samples the stack of a thread for a fixed duration."""
+
+    lock = asyncio.Lock()
+
+    def __init__(self, thread_id: int, interval: float = SAMPLE_INTERVAL) -> None:
+        """Initialize profiler."""
+        self.thread_id = thread_id
+        self.interval = interval
+        self.samples: Counter[str] = Counter()
+
+    def run(self, seconds: float) -> None:
+        """Collect samples for the given number of seconds.
+
+        Blocks, so it must run outside the thread being sampled.
+        """
+        deadline = time.monotonic() + seconds
+        while time.monotonic() < deadline:
+            frame = sys._current_frames().get(self.thread_id)  # noqa: SLF001
+            if frame is not None:
+                self.samples[collapse(frame)] += 1
+            del frame
+            time.sleep(self.interval)
+
+    def collapsed(self) -> str:
+        """Get the samples in the collapsed stack format."""
+        return "".join(
+            f"{stack} {count}\n" for stack, count in self.samples.most_common()
+        )
+
+
+async def profile(seconds: float) -> SamplingProfiler:
+    """Profile the event loop for the given number of seconds.
+
+    Only one profile runs at a time, later calls wait their turn.
+
+    Args:
+        seconds (float): Duration of the profile
+
+    Returns:
+        SamplingProfiler: Profiler holding the collected samples
+    """
+    profiler = SamplingProfiler(threading.get_ident())
+    async with SamplingProfiler.lock:
+        await asyncio.to_thread(profiler.run, min(seconds, MAX_DURATION))
+    return profiler
@@ -0,0 +1,196 @@
+"""Deletion of many messages from a channel.
+
+Discord deletes up to 100 messages in a single bulk delete request, but
+only ones younger than 14 days. Matching messages are collected while
+walking back through the channel history and bulk deleted in batches of
+100; once the history reaches older messages, those are deleted one at
+a time with a pause in between, since their deletion is rate limited
+much more strictly.
+"""
+
+import asyncio
+import logging
+import re
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+
+from nextcord import HTTPException, Message, NotFound
+
+from domain import ValidTextChannel
+from utils import util_functions as uf
+
+logger = logging.getLogger(__name__)
+
+BULK_DELETE_LIMIT = 100
+# Kept a little under 14 days, so that messages do not age past the
+# limit between being collected and being deleted
+BULK_DELETE_MAX_AGE = timedelta(days=14) - timedelta(minutes=5)
+SINGLE_DELETE_INTERVAL = 1.0
+PROGRESS_INTERVAL = 2.0
+
+
+@dataclass(kw_only=True)
+class PurgeFilter:
+    """Criteria a message must meet to be deleted.
+
+    Attributes:
+        author_id (int | None): Only delete messages by this user
+        pattern (re.Pattern | None): Only delete messages whose content
+            matches this pattern
+        after (datetime | None): Only delete messages sent after this
+        before (datetime | None): Only delete messages sent before this
+        skip_ids (set[int]): IDs of messages to keep regardless
+    """
+
+    author_id: int | None = None
+    pattern: re.Pattern | None = None
+    after: datetime | None = None
+    before: datetime | None = None
+    skip_ids: set[int] = field(default_factory=set)
+
+    def matches(self, message: Message) -> bool:
+        """Check whether a message should be deleted."""
+        if message.id in self.skip_ids:
+            return False
+        if self.after is not None and message.created_at <= self.after:
+            return False
+        if self.before is not None and message.created_at >= self.before:
+            return False
+        if self.author_id is not None and message.author.id != self.author_id:
+            return False
+        return self.pattern is None or bool(self.pattern.search(message.content))
+
+
+@dataclass(kw_only=True)
+class PurgeProgress:
+    """Counts of a purge in progress.
+
+    Attributes:
+        scanned (int): Messages looked at
+        deleted (int): Messages deleted
+        failed (int): Messages that could not be deleted
+        finished (bool): Whether the purge is complete
+    """
+
+    scanned: int = 0
+    deleted: int = 0
+    failed: int = 0
+    finished: bool = False
+
+
+class Purge:
+    """Deletes the matching messages among the latest in a channel."""
+
+    def __init__(
+        self,
+        channel: ValidTextChannel,
+        purge_filter: PurgeFilter,
+        *,
+        limit: int,
+        scan_limit: int,
+        on_progress: Callable[[PurgeProgress], Awaitable[None]] | None = None,
+    ) -> None:
+        """Initialize purge.
+
+        Args:
+            channel (ValidTextChannel): Channel to delete messages from
+            purge_filter (PurgeFilter): Messages to delete
+            limit (int): Maximum number of messages to delete
+            scan_limit (int): Maximum number of messages to look at
+            on_progress (Callable[[PurgeProgress], Awaitable[None]]):
+                Called with the progress at most every PROGRESS_INTERVAL
+                seconds, and once when finished. Optional.
+        """
+        self.channel = channel
+        self.filter = purge_filter
+        self.limit = limit
+        self.scan_limit = scan_limit
+        self.on_progress = on_progress
+        self.progress = PurgeProgress()
+        self.batch: list[Message] = []
+        self.last_report = time.monotonic()
+
+    async def run(self) -> PurgeProgress:
+        """Delete the matching messages.
+
+        Returns:
+            PurgeProgress: Final counts
+        """
+        bulk_cutoff = uf.utcnow() - BULK_DELETE_MAX_AGE
+        # Only before is passed: with after, Discord pages forward from
+        # the oldest end of the window and ignores before altogether
+        async for message in self.channel.history(
+            limit=self.scan_limit,
+            before=self.filter.before,
+        ):
+            if self.filter.after is not None and (
+                message.created_at <= self.filter.after
+            ):
+                break
+            self.progress.scanned += 1
+            if not self.filter.matches(message):
+                continue
+
+            if message.created_at > bulk_cutoff:
+                self.batch.append(message)
+                if len(self.batch) == BULK_DELETE_LIMIT:
+                    await self.delete_batch()
+            else:
+                await self.delete_batch()
+                await self.delete_single(message)
+
+            if self.progress.deleted + len(self.batch) >= self.limit:
+                break
+            await self.report()
+
+        await self.delete_batch()
+        self.progress.finished = True
+        await self.report(force=True)
+        return self.progress
+
+    async def delete_batch(self) -> None:
+        """Bulk delete the collected messages."""
+        if not self.batch:
+            return
+        batch, self.batch = self.batch, []
+        if len(batch) == 1:
+            await self.delete_single(batch[0], pace=False)
+            return
+        try:
+            await self.channel.delete_messages(batch)
+        except HTTPException:
+            logger.exception(f"Could not bulk delete {len(batch)} messages")
+            self.progress.failed += len(batch)
+        else:
+            self.progress.deleted += len(batch)
+        await self.report()
+
+    async def delete_single(self, message: Message, *, pace: bool = True) -> None:
+        """Delete a message on its own."""
+        try:
+            await message.delete()
+        except NotFound:
+            pass
+        except HTTPException:
+            logger.exception(f"Could not delete message {message.id}")
+            self.progress.failed += 1
+        else:
+            self.progress.deleted += 1
+        if pace:
+            await asyncio.sleep(SINGLE_DELETE_INTERVAL)
+        await self.report()
+
+    async def report(self, *, force: bool = False) -> None:
+        """Pass on the progress unless it was just passed on."""
+        if self.on_progress is None:
+            return
+        now = time.monotonic()
+        if not force and now - self.last_report < PROGRESS_INTERVAL:
+            return
+        self.last_report = now
+        try:
+            await self.on_progress(self.progress)
+        except HTTPException:
+            logger.exception("Could not report purge progress")
@@ -0,0 +1,125 @@
+"""Routing of raw reaction events to the cogs that handle them.
+
+Raw reaction events fire for every reaction anywhere in the server,
+so handlers register the emojis and, optionally, the messages they
+care about. Events are only passed on to handlers that can act on
+them, which keeps the common case free of any REST calls.
+"""
+
+import asyncio
+import logging
+from collections import defaultdict
+from collections.abc import Awaitable, Callable, Container
+from dataclasses import dataclass, field
+from typing import Literal
+
+from nextcord import (
+    RawReactionActionEvent,
+    RawReactionClearEmojiEvent,
+    RawReactionClearEvent,
+)
+
+from domain import ID
+
+logger = logging.getLogger(__name__)
+
+ReactionEvent = (
+    RawReactionActionEvent | RawReactionClearEmojiEvent | RawReactionClearEvent
+)
+ReactionEventType = Literal["add", "remove", "clear", "clear_emoji"]
+ReactionHandler = Callable[[ReactionEvent], Awaitable[None]]
+
+
+@dataclass(kw_only=True)
+class ReactionRoute:
+    """Wrapper class for reaction handler parameters.
+
+    Attributes:
+        handler (ReactionHandler): Coroutine called with the event
+        events (set[ReactionEventType]): Event types to handle
+        emojis (set[str]): Names of the emojis to handle. Empty to
+            handle every emoji, which is also the only way to receive
+            "clear" events since those carry no emoji.
+        messages (Container[int] | None): IDs of the messages to
+            handle, or None to handle every message. Typically a set or
+            cache kept up to date by the handler's cog.
+    """
+
+    handler: ReactionHandler
+    events: set[ReactionEventType] = field(default_factory=lambda: {"add"})
+    emojis: set[str] = field(default_factory=set)
+    messages: Container[int] | None = None
+
+    def accepts(self, event: ReactionEvent) -> bool:
+        """Check whether an event passes the route's message filter."""
+        return self.messages is None or event.message_id in self.messages
+
+
+class ReactionDispatcher:
+    """Index of reaction routes by event type and emoji name."""
+
+    def __init__(self) -> None:
+        """Initialize dispatcher."""
+        self.by_emoji: dict[str, dict[str, list[ReactionRoute]]] = defaultdict(
+            lambda: defaultdict(list),
+        )
+        self.any_emoji: dict[str, list[ReactionRoute]] = defaultdict(list)
+
+    def add_route(self, route: ReactionRoute) -> None:
+        """Register a route.
+
+        Args:
+            route (ReactionRoute): Route to register
+        """
+        for event_type in route.events:
+            if route.emojis:
+                for emoji in route.emojis:
+                    self.by_emoji[event_type][emoji].append(route)
+            else:
+                self.any_emoji[event_type].append(route)
+
+    def routes_for(
+        self,
+        event_type: ReactionEventType,
+        event: ReactionEvent,
+    ) -> list[ReactionRoute]:
+        """Get the routes that should receive an event."""
+        routes = list(self.any_emoji.get(event_type, []))
+        emoji = getattr(event, "emoji", None)
+        if emoji is not None and event_type in self.by_emoji:
+            routes += self.by_emoji[event_type].get(emoji.name, [])
+        return [route for route in routes if route.accepts(event)]
+
+    async def dispatch(
+        self,
+        event_type: ReactionEventType,
+        event: ReactionEvent,
+    ) -> None:
+        """Pass an event on to every route that accepts it.
+
+        The bot's own reactions are never dispatched.
+
+        Args:
+            event_type (ReactionEventType): Type of reaction event
+            event (ReactionEvent): The raw event
+        """
+        if getattr(event, "user_id", None) == ID.BOT:
+            return
+
+        routes = self.routes_for(event_type, event)
+        if not routes:
+            return
+
+        results = await asyncio.gather(
+            *(route.handler(event) for route in routes),
+            return_exceptions=True,
+        )
+        for route, result in zip(routes, results, strict=True):
+            if isinstance(result, Exception):
+                logger.error(
+                    f"Error in reaction handler {route.handler.__qualname__}",
+                    exc_info=result,
+                )
+
+
+dispatcher = ReactionDispatcher()
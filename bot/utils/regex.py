@@ -13,6 +13,7 @@ from cogs.awards import Award, give_award
 from domain import ID, URL, ChannelName
 from utils import util_functions as uf
 from utils import warframe as wf
+from utils.outbox import outbox
 
 
 @dataclass(kw_only=True)
@@ -30,8 +31,8 @@ regex_responses: list[RegexResponse] = []
 
 
 async def cough_resp(message: Message) -> None:
-    await message.channel.send(":mask:")
-    await message.channel.send("Wear a mask!")
+    await outbox.send(message.channel, ":mask:")
+    await outbox.send(message.channel, "Wear a mask!")
 
 
 regex_responses.append(
@@ -46,12 +47,12 @@ async def ping_resp(message: Message) -> None:
     }
 
     if message.author.id in custom_responses:
-        await message.channel.send(custom_responses[message.author.id])
+        await outbox.send(message.channel, custom_responses[message.author.id])
     else:
         emoji = uf.get_emoji("Pingsock")
         if emoji is not None:
-            await message.channel.send(emoji)
-        await message.channel.send(f"{message.author.mention}")
+            await outbox.send(message.channel, emoji)
+        await outbox.send(message.channel, f"{message.author.mention}")
 
 
 regex_responses.append(
@@ -77,18 +78,18 @@ async def uwu_resp(message: Message) -> None:
     n = len(re.findall("[rRlL]", msg))
     if n > 4:  # noqa: PLR2004
         txt = re.sub("[rRlL]", "w", msg)
-        await message.channel.send(txt)
+        await outbox.send(message.channel, txt)
     elif random.randint(1, 10) == 7:  # noqa: PLR2004
         txt = (
             "I'll let you off with just a warning this time "
             "but I'd better not see you doing it again."
         )
-        await message.channel.send(txt)
+        await outbox.send(message.channel, txt)
     elif random.randint(1, 2) == 1:
         warning_video = File(URL.LOCAL_STATIC + "/videos/warning.mp4")
-        await message.channel.send(file=warning_video)
+        await outbox.send(message.channel, file=warning_video)
     else:
-        await message.channel.send(URL.GITHUB_STATIC + "/images/uwu.png")
+        await outbox.send(message.channel, URL.GITHUB_STATIC + "/images/uwu.png")
 
 
 regex_responses.append(
@@ -98,9 +99,9 @@ regex_responses.append(
 
 async def nephew_resp(message: Message) -> None:
     if message.content == "||nephew||":
-        await message.channel.send("||delet this||")
+        await outbox.send(message.channel, "||delet this||")
     else:
-        await message.channel.send("delet this")
+        await outbox.send(message.channel, "delet this")
 
 
 regex_responses.append(RegexResponse(trigger=r"^\|*nephew\|*$", response=nephew_resp))
@@ -108,30 +109,30 @@ regex_responses.append(RegexResponse(trigger=r"^\|*nephew\|*$", response=nephew_
 
 async def kenobi_resp(message: Message) -> None:
     if random.randint(1, 2) == 1:
-        await message.channel.send("General " + message.author.mention)
+        await outbox.send(message.channel, "General " + message.author.mention)
     else:
-        await message.channel.send(URL.GITHUB_STATIC + "/images/kenobi.png")
+        await outbox.send(message.channel, URL.GITHUB_STATIC + "/images/kenobi.png")
 
 
 regex_responses.append(RegexResponse(trigger="hello there", response=kenobi_resp))
 
 
 async def bell_resp(message: Message) -> None:
-    await message.channel.send(URL.GITHUB_STATIC + "/images/bell.gif")
+    await outbox.send(message.channel, URL.GITHUB_STATIC + "/images/bell.gif")
 
 
 regex_responses.append(RegexResponse(trigger="ringing my bell", response=bell_resp))
 
 
 async def no_u_resp(message: Message) -> None:
-    await message.channel.send(URL.GITHUB_STATIC + "/images/no_u.png")
+    await outbox.send(message.channel, URL.GITHUB_STATIC + "/images/no_u.png")
 
 
 regex_responses.append(RegexResponse(trigger="^no u$", response=no_u_resp))
 
 
 async def one_of_us_resp(message: Message) -> None:
-    await message.channel.send("One of us!")
+    await outbox.send(message.channel, "One of us!")
 
 
 regex_responses.append(
@@ -140,7 +141,7 @@ regex_responses.append(
 
 
 async def society_resp(message: Message) -> None:
-    await message.channel.send("Bottom Text")
+    await outbox.send(message.channel, "Bottom Text")
 
 
 regex_responses.append(
@@ -149,7 +150,8 @@ regex_responses.append(
 
 
 async def deep_one_resp(message: Message) -> None:
-    await message.channel.send(
+    await outbox.send(
+        message.channel,
         "blub blub blub blub blub blub blub blub blub blub blub blub blub blub blub",
     )
 
@@ -189,14 +191,14 @@ regex_responses.append(RegexResponse(trigger=r"^[^\/<]*420", response=fourtwenty
 
 
 async def woop_resp(message: Message) -> None:
-    await message.channel.send("That's the sound of da police!")
+    await outbox.send(message.channel, "That's the sound of da police!")
 
 
 regex_responses.append(RegexResponse(trigger=r"^woop woop[\.!]*$", response=woop_resp))
 
 
 async def paragon_resp(message: Message) -> None:
-    await message.channel.send("Fuck Epic!")
+    await outbox.send(message.channel, "Fuck Epic!")
 
 
 regex_responses.append(RegexResponse(trigger="paragon", response=paragon_resp))
@@ -213,7 +215,7 @@ regex_responses.append(RegexResponse(trigger=r"^\W*bruh\W*$", response=bruh_resp
 
 
 async def hans_resp(message: Message) -> None:
-    await message.channel.send("Get ze Flammenwerfer!")
+    await outbox.send(message.channel, "Get ze Flammenwerfer!")
 
 
 regex_responses.append(RegexResponse(trigger=r"^hans\W*$", response=hans_resp))
@@ -223,11 +225,12 @@ async def loli_resp(message: Message) -> None:
     glare = uf.get_emoji("BlobGlare")
     if glare is not None:
         await message.add_reaction(glare)
-    await message.channel.send(
+    await outbox.send(
+        message.channel,
         "https://cdn.discordapp.com/attachments/413861431906402334/731636158223614113/image0-27.jpg",
     )
     if re.search("loli", message.content, re.IGNORECASE) is None:
-        await message.channel.send(f"Fuck off, {message.author.mention}")
+        await outbox.send(message.channel, f"Fuck off, {message.author.mention}")
 
 
 regex_responses.append(
@@ -241,7 +244,7 @@ regex_responses.append(
 
 
 async def dont_at_me_resp(message: Message) -> None:
-    await message.channel.send(f"{message.author.mention}")
+    await outbox.send(message.channel, f"{message.author.mention}")
 
 
 regex_responses.append(
@@ -250,7 +253,7 @@ regex_responses.append(
 
 
 async def america_resp(message: Message) -> None:
-    await message.channel.send("Fuck yeah!")
+    await outbox.send(message.channel, "Fuck yeah!")
 
 
 regex_responses.append(
@@ -260,16 +263,19 @@ regex_responses.append(
 
 async def mod_resp(message: Message) -> None:
     mod_names = re.findall(r"(?<=\[)[a-zA-Z ']+(?=\])", message.content)
+    if not mod_names:
+        return
+    thumbnails = await wf.mod_list.get()
     for mod_name in mod_names:
-        if mod_name.lower() in wf.mod_list:
-            await message.channel.send(wf.mod_list[mod_name.lower()])
+        if mod_name.lower() in thumbnails:
+            await outbox.send(message.channel, thumbnails[mod_name.lower()])
 
 
 regex_responses.append(RegexResponse(trigger=r"\[.*\]", response=mod_resp))
 
 
 async def x_is_x_resp(message: Message) -> None:
-    await message.channel.send(URL.GITHUB_STATIC + "/images/x%20is%20x.png")
+    await outbox.send(message.channel, URL.GITHUB_STATIC + "/images/x%20is%20x.png")
 
 
 regex_responses.append(
@@ -295,7 +301,7 @@ regex_responses.append(RegexResponse(trigger="ass testing", response=ass_testing
 
 
 async def belgium_resp(message: Message) -> None:
-    await message.channel.send("Watch your language!")
+    await outbox.send(message.channel, "Watch your language!")
 
 
 regex_responses.append(
@@ -304,7 +310,7 @@ regex_responses.append(
 
 
 async def finally_resp(message: Message) -> None:
-    await message.channel.send("middle text")
+    await outbox.send(message.channel, "middle text")
 
 
 regex_responses.append(
@@ -313,7 +319,7 @@ regex_responses.append(
 
 
 async def now_resp(message: Message) -> None:
-    await message.channel.send(URL.GITHUB_STATIC + "/images/now.png")
+    await outbox.send(message.channel, URL.GITHUB_STATIC + "/images/now.png")
 
 
 regex_responses.append(
@@ -322,7 +328,8 @@ regex_responses.append(
 
 
 async def maybe_resp(message: Message) -> None:
-    await message.channel.send(
+    await outbox.send(
+        message.channel,
         URL.GITHUB_STATIC + "/images/memes/Maybe%20I%20am%20a%20monster.png",
     )
 
@@ -366,7 +373,10 @@ regex_responses.append(
 
 
 async def coinflip_resp(message: Message) -> None:
-    await message.channel.send("Heads" if random.randint(0, 1) == 1 else "Tails")
+    await outbox.send(
+        message.channel,
+        "Heads" if random.randint(0, 1) == 1 else "Tails",
+    )
 
 
 regex_responses.append(
@@ -378,7 +388,7 @@ regex_responses.append(
 
 
 async def mario_resp(message: Message) -> None:
-    await message.channel.send("Mario!")
+    await outbox.send(message.channel, "Mario!")
 
 
 regex_responses.append(
@@ -387,9 +397,9 @@ regex_responses.append(
 
 
 async def uhoh_resp(message: Message) -> None:
-    await message.channel.send("SpaghettiOs 😦")
+    await outbox.send(message.channel, "SpaghettiOs 😦")
     if random.randint(0, 1) == 1:
-        await message.channel.send("..and stinky!")
+        await outbox.send(message.channel, "..and stinky!")
 
 
 regex_responses.append(
@@ -398,7 +408,7 @@ regex_responses.append(
 
 
 async def ahoy_resp(message: Message) -> None:
-    await message.channel.send("Ahoy Matey!")
+    await outbox.send(message.channel, "Ahoy Matey!")
     await message.add_reaction("BlobWave:382606234148143115")
 
 
@@ -408,7 +418,7 @@ regex_responses.append(
 
 
 async def spooky_resp(message: Message) -> None:
-    await message.channel.send("2spooky4me")
+    await outbox.send(message.channel, "2spooky4me")
 
 
 regex_responses.append(
@@ -426,7 +436,7 @@ regex_responses.append(
 
 
 async def easy_peasy_resp(message: Message) -> None:
-    await message.channel.send("Lemon squeezy!")
+    await outbox.send(message.channel, "Lemon squeezy!")
 
 
 regex_responses.append(
@@ -435,7 +445,10 @@ regex_responses.append(
 
 
 async def tuesday_resp(message: Message) -> None:
-    await message.channel.send("Happy <@235055132843180032> appreciation day everyone!")
+    await outbox.send(
+        message.channel,
+        "Happy <@235055132843180032> appreciation day everyone!",
+    )
 
 
 regex_responses.append(
@@ -445,14 +458,14 @@ regex_responses.append(
 
 async def yeboi_resp(message: Message) -> None:
     boii = "BO" + "I" * (len(message.content) - 1)
-    await message.channel.send(boii[:1999])
+    await outbox.send(message.channel, boii[:1999])
 
 
 regex_responses.append(RegexResponse(trigger="^ye{3,}$", response=yeboi_resp))
 
 
 async def cough_bless_resp(message: Message) -> None:
-    await message.channel.send("Bless you!")
+    await outbox.send(message.channel, "Bless you!")
 
 
 regex_responses.append(
@@ -464,14 +477,14 @@ regex_responses.append(
 
 
 async def egeis_resp(message: Message) -> None:
-    await message.channel.send("👀?egeiS yas enoemos diD")
+    await outbox.send(message.channel, "👀?egeiS yas enoemos diD")
 
 
 regex_responses.append(RegexResponse(trigger=r"^.*egeis[^\?]*$", response=egeis_resp))
 
 
 async def fme_resp(message: Message) -> None:
-    await message.channel.send("Don't mind if I do 👍")
+    await outbox.send(message.channel, "Don't mind if I do 👍")
 
 
 regex_responses.append(
@@ -480,7 +493,7 @@ regex_responses.append(
 
 
 async def ayaya_resp(message: Message) -> None:
-    await message.channel.send("Ayaya!")
+    await outbox.send(message.channel, "Ayaya!")
     await message.add_reaction("Ayy:610479153937907733")
     await message.add_reaction("Ayy2:470743166207787010")
 
@@ -504,9 +517,9 @@ async def link_resp(message: Message) -> None:
     embed = uf.message_embed(source_message, "link", message.author)
     if not source_message.content and source_message.embeds:
         embed.description = "[See attached embed]"
-    await message.channel.send(embed=embed)
+    await outbox.send(message.channel, embed=embed)
     if not source_message.content and source_message.embeds:
-        await message.channel.send(embed=source_message.embeds[0])
+        await outbox.send(message.channel, embed=source_message.embeds[0])
 
 
 # TODO: Better regex
@@ -528,7 +541,7 @@ regex_responses.append(
 
 
 async def what_is_love_resp(message: Message) -> None:
-    await message.channel.send("*♬ Baby don't hurt me ♬*")
+    await outbox.send(message.channel, "*♬ Baby don't hurt me ♬*")
 
 
 regex_responses.append(
@@ -537,7 +550,7 @@ regex_responses.append(
 
 
 async def baby_dont_hurt_me_resp(message: Message) -> None:
-    await message.channel.send("*♬ no more ♬*")
+    await outbox.send(message.channel, "*♬ no more ♬*")
 
 
 regex_responses.append(
@@ -549,7 +562,7 @@ regex_responses.append(
 
 
 async def sweet_dreams_resp(message: Message) -> None:
-    await message.channel.send("*♬ are made of this ♬*")
+    await outbox.send(message.channel, "*♬ are made of this ♬*")
 
 
 regex_responses.append(
@@ -558,7 +571,7 @@ regex_responses.append(
 
 
 async def yarr_harr_resp(message: Message) -> None:
-    await message.channel.send("fiddle de dee")
+    await outbox.send(message.channel, "fiddle de dee")
 
 
 regex_responses.append(
@@ -567,7 +580,7 @@ regex_responses.append(
 
 
 async def trust_me_resp(message: Message) -> None:
-    await message.channel.send("I'm an engineer!")
+    await outbox.send(message.channel, "I'm an engineer!")
 
 
 regex_responses.append(
@@ -576,7 +589,7 @@ regex_responses.append(
 
 
 async def long_ass_time_resp(message: Message) -> None:
-    await message.channel.send("*♬ ..in a town called Kickapoo ♬*")
+    await outbox.send(message.channel, "*♬ ..in a town called Kickapoo ♬*")
 
 
 regex_responses.append(
@@ -588,7 +601,10 @@ regex_responses.append(
 
 
 async def testing_attention_resp(message: Message) -> None:
-    await message.channel.send("*♬ Feel the tension soon as someone mentions me ♬*")
+    await outbox.send(
+        message.channel,
+        "*♬ Feel the tension soon as someone mentions me ♬*",
+    )
 
 
 regex_responses.append(
@@ -600,7 +616,7 @@ regex_responses.append(
 
 
 async def testing_emn_resp(message: Message) -> None:
-    await message.channel.send("**♬ Attention please! ♬**")
+    await outbox.send(message.channel, "**♬ Attention please! ♬**")
 
 
 regex_responses.append(
@@ -609,7 +625,7 @@ regex_responses.append(
 
 
 async def spaghetti_resp(message: Message) -> None:
-    await message.channel.send("*mom's spaghetti*")
+    await outbox.send(message.channel, "*mom's spaghetti*")
 
 
 regex_responses.append(
@@ -618,7 +634,8 @@ regex_responses.append(
 
 
 async def moneyyy_resp(message: Message) -> None:
-    await message.channel.send(
+    await outbox.send(
+        message.channel,
         "Money money money money money money money money money money!",
     )
 
@@ -629,7 +646,7 @@ regex_responses.append(
 
 
 async def yesterday_resp(message: Message) -> None:
-    await message.channel.send("*♬ All my troubles seemed so far away ♬*")
+    await outbox.send(message.channel, "*♬ All my troubles seemed so far away ♬*")
 
 
 regex_responses.append(
@@ -638,7 +655,7 @@ regex_responses.append(
 
 
 async def deja_vu_resp(message: Message) -> None:
-    await message.channel.send("*♬ I've just been in this place before ♬*")
+    await outbox.send(message.channel, "*♬ I've just been in this place before ♬*")
 
 
 regex_responses.append(
@@ -647,7 +664,7 @@ regex_responses.append(
 
 
 async def higher_on_the_street_resp(message: Message) -> None:
-    await message.channel.send("*♬ And I know it's my time to go ♬*")
+    await outbox.send(message.channel, "*♬ And I know it's my time to go ♬*")
 
 
 regex_responses.append(
@@ -659,7 +676,7 @@ regex_responses.append(
 
 
 async def somebody_resp(message: Message) -> None:
-    await message.channel.send("**BODY ONCE TOLD ME**")
+    await outbox.send(message.channel, "**BODY ONCE TOLD ME**")
 
 
 regex_responses.append(
@@ -668,7 +685,7 @@ regex_responses.append(
 
 
 async def roll_me_resp(message: Message) -> None:
-    await message.channel.send("**I AIN'T THE SHARPEST TOOL IN THE SHED**")
+    await outbox.send(message.channel, "**I AIN'T THE SHARPEST TOOL IN THE SHED**")
 
 
 regex_responses.append(
@@ -677,7 +694,7 @@ regex_responses.append(
 
 
 async def hard_rock_resp(message: Message) -> None:
-    await message.channel.send("**Hallelujah!**")
+    await outbox.send(message.channel, "**Hallelujah!**")
 
 
 regex_responses.append(
@@ -686,7 +703,7 @@ regex_responses.append(
 
 
 async def wake_up_resp(message: Message) -> None:
-    await message.channel.send("*♬ Grab a brush and put a little make up! ♬*")
+    await outbox.send(message.channel, "*♬ Grab a brush and put a little make up! ♬*")
 
 
 regex_responses.append(
@@ -695,7 +712,7 @@ regex_responses.append(
 
 
 async def beep_boop_resp(message: Message) -> None:
-    await message.channel.send("I'm a robot.")
+    await outbox.send(message.channel, "I'm a robot.")
 
 
 regex_responses.append(
@@ -704,7 +721,7 @@ regex_responses.append(
 
 
 async def beep_beep_resp(message: Message) -> None:
-    await message.channel.send("I'm a sheep.")
+    await outbox.send(message.channel, "I'm a sheep.")
 
 
 regex_responses.append(
@@ -713,7 +730,7 @@ regex_responses.append(
 
 
 async def bark_bark_resp(message: Message) -> None:
-    await message.channel.send("I'm a shark.")
+    await outbox.send(message.channel, "I'm a shark.")
 
 
 regex_responses.append(
@@ -722,7 +739,7 @@ regex_responses.append(
 
 
 async def meow_meow_resp(message: Message) -> None:
-    await message.channel.send("I'm a cow.")
+    await outbox.send(message.channel, "I'm a cow.")
 
 
 regex_responses.append(
@@ -731,7 +748,7 @@ regex_responses.append(
 
 
 async def quack_quack_resp(message: Message) -> None:
-    await message.channel.send("I'm a yak.")
+    await outbox.send(message.channel, "I'm a yak.")
 
 
 regex_responses.append(
@@ -740,7 +757,7 @@ regex_responses.append(
 
 
 async def dab_dab_resp(message: Message) -> None:
-    await message.channel.send("I'm a crab.")
+    await outbox.send(message.channel, "I'm a crab.")
 
 
 regex_responses.append(
@@ -749,7 +766,7 @@ regex_responses.append(
 
 
 async def float_float_resp(message: Message) -> None:
-    await message.channel.send("I'm a goat.")
+    await outbox.send(message.channel, "I'm a goat.")
 
 
 regex_responses.append(
@@ -758,7 +775,7 @@ regex_responses.append(
 
 
 async def screech_screech_resp(message: Message) -> None:
-    await message.channel.send("I'm a leech.")
+    await outbox.send(message.channel, "I'm a leech.")
 
 
 regex_responses.append(
@@ -770,7 +787,7 @@ regex_responses.append(
 
 
 async def bam_bam_resp(message: Message) -> None:
-    await message.channel.send("I'm a lamb.")
+    await outbox.send(message.channel, "I'm a lamb.")
 
 
 regex_responses.append(
@@ -779,7 +796,7 @@ regex_responses.append(
 
 
 async def dig_dig_resp(message: Message) -> None:
-    await message.channel.send("I'm a pig.")
+    await outbox.send(message.channel, "I'm a pig.")
 
 
 regex_responses.append(
@@ -788,7 +805,8 @@ regex_responses.append(
 
 
 async def roar_roar_resp(message: Message) -> None:
-    await message.channel.send(
+    await outbox.send(
+        message.channel,
         "I'm a boar." if random.randint(0, 1) == 1 else "Dinosaur",
     )
 
@@ -799,7 +817,7 @@ regex_responses.append(
 
 
 async def shake_shake_resp(message: Message) -> None:
-    await message.channel.send("I'm a snake.")
+    await outbox.send(message.channel, "I'm a snake.")
 
 
 regex_responses.append(
@@ -808,7 +826,7 @@ regex_responses.append(
 
 
 async def swish_swish_resp(message: Message) -> None:
-    await message.channel.send("I'm a fish.")
+    await outbox.send(message.channel, "I'm a fish.")
 
 
 regex_responses.append(
@@ -817,7 +835,7 @@ regex_responses.append(
 
 
 async def squawk_squawk_resp(message: Message) -> None:
-    await message.channel.send("I'm a hawk.")
+    await outbox.send(message.channel, "I'm a hawk.")
 
 
 regex_responses.append(
@@ -826,7 +844,7 @@ regex_responses.append(
 
 
 async def cluck_cluck_resp(message: Message) -> None:
-    await message.channel.send("I'm a duck.")
+    await outbox.send(message.channel, "I'm a duck.")
 
 
 regex_responses.append(
@@ -835,7 +853,7 @@ regex_responses.append(
 
 
 async def growl_growl_resp(message: Message) -> None:
-    await message.channel.send("I'm an owl.")
+    await outbox.send(message.channel, "I'm an owl.")
 
 
 regex_responses.append(
@@ -844,7 +862,7 @@ regex_responses.append(
 
 
 async def drop_drop_resp(message: Message) -> None:
-    await message.channel.send("Do the flop!")
+    await outbox.send(message.channel, "Do the flop!")
 
 
 regex_responses.append(
@@ -853,7 +871,7 @@ regex_responses.append(
 
 
 async def boink_boink_resp(message: Message) -> None:
-    await message.channel.send("I'm bad at rhyming. :(")
+    await outbox.send(message.channel, "I'm bad at rhyming. :(")
 
 
 regex_responses.append(
@@ -862,7 +880,7 @@ regex_responses.append(
 
 
 async def click_click_resp(message: Message) -> None:
-    await message.channel.send("I'm a chick.")
+    await outbox.send(message.channel, "I'm a chick.")
 
 
 regex_responses.append(
@@ -871,7 +889,7 @@ regex_responses.append(
 
 
 async def blue_resp(message: Message) -> None:
-    await message.channel.send("♬ Da ba dee da ba di ♬")
+    await outbox.send(message.channel, "♬ Da ba dee da ba di ♬")
 
 
 regex_responses.append(
@@ -882,7 +900,8 @@ regex_responses.append(
 async def pingsock_resp(message: Message) -> None:
     await asyncio.sleep(5)
     if random.randint(1, 4) == 1:
-        await message.channel.send(
+        await outbox.send(
+            message.channel,
             f"Do I see someone who loves being pinged, {message.author.mention}?",
         )
 
@@ -922,7 +941,10 @@ regex_responses.append(
 
 async def pedestal_resp(message: Message) -> None:
     await message.add_reaction("👏")
-    await message.channel.send("Quickly, master <@235055132843180032>, quickly!")
+    await outbox.send(
+        message.channel,
+        "Quickly, master <@235055132843180032>, quickly!",
+    )
 
 
 regex_responses.append(
@@ -948,7 +970,7 @@ regex_responses.append(
 
 
 async def stradavar_resp(message: Message) -> None:
-    await message.channel.send(f"Quickly, <@{ID.JORM}>, quickly!")
+    await outbox.send(message.channel, f"Quickly, <@{ID.JORM}>, quickly!")
     await message.add_reaction("👏")
 
 
@@ -1001,7 +1023,8 @@ regex_responses.append(RegexResponse(trigger=r"siege.*\?", response=siege_resp))
 
 async def offers_resp(message: Message) -> None:
     await message.delete()
-    await message.author.send(
+    await outbox.send(
+        message.author,
         f"Hi {message.author.mention}! We're trying to streamline "
         f"{message.channel.mention} - please update your post to contain a link, "
         "an image, or a specific reference to a game store and re-post it. "
@@ -1067,7 +1090,7 @@ regex_responses.append(
 
 
 async def hms_resp(message: Message) -> None:
-    await message.channel.send(URL.GITHUB_STATIC + "/images/hms%20fucking.png")
+    await outbox.send(message.channel, URL.GITHUB_STATIC + "/images/hms%20fucking.png")
 
 
 regex_responses.append(
@@ -1076,8 +1099,8 @@ regex_responses.append(
 
 
 async def gramps_resp(message: Message) -> None:
-    await message.channel.send(URL.GITHUB_STATIC + "/images/markus.gif")
-    await message.channel.send(message.content)
+    await outbox.send(message.channel, URL.GITHUB_STATIC + "/images/markus.gif")
+    await outbox.send(message.channel, message.content)
 
 
 regex_responses.append(
@@ -1106,7 +1129,7 @@ regex_responses.append(
 
 
 async def so_true_resp(message: Message) -> None:
-    await message.channel.send(URL.GITHUB_STATIC + "/videos/so_true.mov")
+    await outbox.send(message.channel, URL.GITHUB_STATIC + "/videos/so_true.mov")
 
 
 regex_responses.append(
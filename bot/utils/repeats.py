@@ -0,0 +1,79 @@
+"""Detection of messages repeated by several people in a row."""
+
+import hashlib
+from collections import OrderedDict
+
+DEFAULT_STREAK_LENGTH = 2
+DEFAULT_MAX_CHANNELS = 1000
+
+
+def digest(text: str) -> int:
+    """Get a case-insensitive 64-bit hash of a message."""
+    return int.from_bytes(
+        hashlib.blake2b(text.lower().encode(), digest_size=8).digest(),
+    )
+
+
+class Streak:
+    """The latest message of a channel and who has sent it in a row."""
+
+    __slots__ = ("author_ids", "digest")
+
+    def __init__(self, digest: int, author_id: int) -> None:
+        """Initialize streak."""
+        self.digest = digest
+        self.author_ids = [author_id]
+
+
+class RepeatDetector:
+    """Tracks the latest message of each channel by its hash.
+
+    Only a hash of the message and the IDs of its authors are kept, for
+    at most max_channels channels; the least recently active channel is
+    forgotten first.
+    """
+
+    __slots__ = ("max_channels", "streak_length", "streaks")
+
+    def __init__(
+        self,
+        streak_length: int = DEFAULT_STREAK_LENGTH,
+        max_channels: int = DEFAULT_MAX_CHANNELS,
+    ) -> None:
+        """Initialize detector."""
+        self.streak_length = streak_length
+        self.max_channels = max_channels
+        self.streaks: OrderedDict[int, Streak] = OrderedDict()
+
+    def observe(self, channel_id: int, author_id: int, text: str) -> bool:
+        """Record a message.
+
+        The same person sending a message again does not extend the
+        streak. Once a streak is complete, the channel starts over.
+
+        Args:
+            channel_id (int): ID of the channel the message was sent in
+            author_id (int): ID of the author
+            text (str): Content of the message
+
+        Returns:
+            bool: Whether streak_length different people have now sent
+                this message in a row
+        """
+        message_digest = digest(text)
+        streak = self.streaks.get(channel_id)
+        if streak is None or streak.digest != message_digest:
+            self.streaks[channel_id] = Streak(message_digest, author_id)
+            self.streaks.move_to_end(channel_id)
+            if len(self.streaks) > self.max_channels:
+                self.streaks.popitem(last=False)
+            return False
+
+        self.streaks.move_to_end(channel_id)
+        if author_id in streak.author_ids:
+            return False
+        streak.author_ids.append(author_id)
+        if len(streak.author_ids) < self.streak_length:
+            return False
+        del self.streaks[channel_id]
+        return True
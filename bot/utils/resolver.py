@@ -0,0 +1,210 @@
+"""Resolution of user IDs to users and members.
+
+Once the guild has been chunked, the gateway cache holds every member
+of the server, so a member missing from it has left and no lookup is
+needed at all. Other lookups run with bounded concurrency, concurrent
+lookups of the same ID share a single request, and IDs that turn out
+not to exist are remembered for a while instead of being looked up
+again. Fetched users are kept for a minute, since the gateway does not
+cache them.
+
+With MEMBER_CHUNKING set to lazy, guilds are not chunked when the bot
+connects. Members are then looked up as they are needed, and the full
+member list is only downloaded when something needs every member, such
+as listing the holders of a role.
+"""
+
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable, Iterable
+from datetime import timedelta
+
+from nextcord import ClientException, Guild, Member, NotFound, User
+
+from domain import Standby
+from utils.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+standby = Standby()
+
+MAX_CONCURRENT_FETCHES = 5
+MISSING_TTL = timedelta(minutes=5)
+FOUND_TTL = timedelta(minutes=1)
+QUERY_BATCH_SIZE = 100
+
+type Key = tuple[str, int, int]
+
+
+class Resolver:
+    """Resolves user IDs from the cache first and REST otherwise."""
+
+    def __init__(self, max_concurrent_fetches: int = MAX_CONCURRENT_FETCHES) -> None:
+        """Initialize resolver."""
+        self.semaphore = asyncio.Semaphore(max_concurrent_fetches)
+        self.in_flight: dict[Key, asyncio.Task] = {}
+        self.missing: TTLCache[Key, bool] = TTLCache(MISSING_TTL, maxsize=4096)
+        self.found: TTLCache[Key, object] = TTLCache(FOUND_TTL, maxsize=1024)
+        self.chunk_lock = asyncio.Lock()
+
+    async def fetch[T](self, key: Key, fetcher: Callable[[], Awaitable[T]]) -> T | None:
+        """Run a REST lookup, sharing it with concurrent identical ones.
+
+        Args:
+            key (Key): Identifies the lookup
+            fetcher (Callable[[], Awaitable[T]]): Performs the lookup
+
+        Returns:
+            T | None: The result, or None if it does not exist
+        """
+        if key in self.missing:
+            return None
+        if (result := self.found.get(key)) is not None:
+            return result
+        task = self.in_flight.get(key)
+        if task is None:
+            task = asyncio.create_task(self.run_fetch(key, fetcher))
+            self.in_flight[key] = task
+            task.add_done_callback(lambda _: self.in_flight.pop(key, None))
+        return await asyncio.shield(task)
+
+    async def run_fetch[T](
+        self,
+        key: Key,
+        fetcher: Callable[[], Awaitable[T]],
+    ) -> T | None:
+        """Perform a REST lookup within the concurrency limit."""
+        async with self.semaphore:
+            try:
+                result = await fetcher()
+            except NotFound:
+                self.missing[key] = True
+                return None
+            self.found[key] = result
+            return result
+
+    async def member(self, user_id: int, guild: Guild | None = None) -> Member | None:
+        """Get a member of a guild.
+
+        Args:
+            user_id (int): ID of the member
+            guild (Guild | None): Guild to look in. Defaults to the
+                bot's guild.
+
+        Returns:
+            Member | None: The member, or None if they are not in the
+                guild
+        """
+        guild = guild or standby.guild
+        member = guild.get_member(user_id)
+        if member is not None or guild.chunked:
+            return member
+        return await self.fetch(
+            ("member", guild.id, user_id),
+            lambda: guild.fetch_member(user_id),
+        )
+
+    async def members(
+        self,
+        user_ids: Iterable[int],
+        guild: Guild | None = None,
+    ) -> dict[int, Member]:
+        """Get several members of a guild.
+
+        Unless the guild has been chunked, members missing from the
+        cache are requested over the gateway in batches of 100, falling
+        back to concurrent REST lookups when the gateway is unavailable.
+
+        Args:
+            user_ids (Iterable[int]): IDs of the members
+            guild (Guild | None): Guild to look in. Defaults to the
+                bot's guild.
+
+        Returns:
+            dict[int, Member]: Members found, by ID
+        """
+        guild = guild or standby.guild
+        found: dict[int, Member] = {}
+        uncached = []
+        for user_id in dict.fromkeys(user_ids):
+            member = guild.get_member(user_id)
+            if member is not None:
+                found[user_id] = member
+            elif (
+                not guild.chunked and ("member", guild.id, user_id) not in self.missing
+            ):
+                uncached.append(user_id)
+
+        for start in range(0, len(uncached), QUERY_BATCH_SIZE):
+            batch = uncached[start : start + QUERY_BATCH_SIZE]
+            try:
+                queried = await guild.query_members(
+                    user_ids=batch,
+                    limit=len(batch),
+                    cache=True,
+                )
+            except (ClientException, RuntimeError, TimeoutError):
+                logger.debug("Could not query members, falling back to REST")
+                results = await asyncio.gather(
+                    *(self.member(user_id, guild) for user_id in batch),
+                )
+                queried = [member for member in results if member is not None]
+            found |= {member.id: member for member in queried}
+            for user_id in batch:
+                if user_id not in found:
+                    self.missing["member", guild.id, user_id] = True
+
+        return found
+
+    async def chunk(self, guild: Guild | None = None) -> None:
+        """Make sure the member cache holds every member of a guild.
+
+        Required before relying on Role.members or a channel's members.
+
+        Args:
+            guild (Guild | None): Guild to chunk. Defaults to the bot's
+                guild.
+        """
+        guild = guild or standby.guild
+        if guild.chunked:
+            return
+        async with self.chunk_lock:
+            if not guild.chunked:
+                logger.info(f"Downloading the member list of {guild}")
+                await guild.chunk()
+
+    async def user(self, user_id: int) -> User | Member | None:
+        """Get a user, whether or not they are in the bot's guild.
+
+        Args:
+            user_id (int): ID of the user
+
+        Returns:
+            User | Member | None: The user, or None if they don't exist
+        """
+        user = standby.bot.get_user(user_id)
+        if user is not None:
+            return user
+        return await self.fetch(
+            ("user", 0, user_id),
+            lambda: standby.bot.fetch_user(user_id),
+        )
+
+    async def users(self, user_ids: Iterable[int]) -> dict[int, User | Member]:
+        """Get several users concurrently.
+
+        Args:
+            user_ids (Iterable[int]): IDs of the users
+
+        Returns:
+            dict[int, User | Member]: Users found, by ID
+        """
+        unique_ids = list(dict.fromkeys(user_ids))
+        results = await asyncio.gather(*(self.user(user_id) for user_id in unique_ids))
+        return {
+            user_id: user
+            for user_id, user in zip(unique_ids, results, strict=True)
+            if user is not None
+        }
+
+
+resolver = Resolver()
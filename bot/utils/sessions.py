@@ -0,0 +1,101 @@
+"""Per-channel session storage for channel games."""
+
+import asyncio
+import time
+from collections.abc import Callable
+from datetime import timedelta
+
+DEFAULT_IDLE_TIMEOUT = timedelta(hours=12)
+
+
+class Session[T]:
+    """A channel's game together with its lock and last activity."""
+
+    __slots__ = ("game", "last_active", "lock")
+
+    def __init__(self) -> None:
+        """Initialize session."""
+        self.game: T | None = None
+        self.lock = asyncio.Lock()
+        self.last_active = time.monotonic()
+
+
+class SessionManager[T]:
+    """Games keyed by the ID of the channel they are played in.
+
+    Each channel gets its own game and lock, so games in different
+    channels run independently of each other. Sessions that have not
+    been touched for longer than the idle timeout are evicted the next
+    time the manager is accessed.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], T],
+        idle_timeout: timedelta = DEFAULT_IDLE_TIMEOUT,
+    ) -> None:
+        """Initialize manager."""
+        self.factory = factory
+        self.idle_timeout = idle_timeout.total_seconds()
+        self.sessions: dict[int, Session[T]] = {}
+
+    def evict_idle(self) -> None:
+        """Drop sessions that have been idle for too long.
+
+        Sessions whose lock is held are in use and never evicted.
+        """
+        cutoff = time.monotonic() - self.idle_timeout
+        for channel_id, session in list(self.sessions.items()):
+            if session.last_active < cutoff and not session.lock.locked():
+                del self.sessions[channel_id]
+
+    def session(self, channel_id: int) -> Session[T]:
+        """Get a channel's session, creating an empty one if needed."""
+        self.evict_idle()
+        session = self.sessions.setdefault(channel_id, Session())
+        session.last_active = time.monotonic()
+        return session
+
+    def get(self, channel_id: int) -> T | None:
+        """Get the game running in a channel, if any.
+
+        Args:
+            channel_id (int): Channel ID
+
+        Returns:
+            T | None: The channel's game, or None if there is none
+        """
+        return self.session(channel_id).game
+
+    def create(self, channel_id: int) -> T:
+        """Start a new game in a channel, replacing any existing one.
+
+        Args:
+            channel_id (int): Channel ID
+
+        Returns:
+            T: The new game
+        """
+        session = self.session(channel_id)
+        session.game = self.factory()
+        return session.game
+
+    def end(self, channel_id: int) -> None:
+        """Remove the game running in a channel.
+
+        Args:
+            channel_id (int): Channel ID
+        """
+        if session := self.sessions.get(channel_id):
+            session.game = None
+
+    def lock(self, channel_id: int) -> asyncio.Lock:
+        """Get the lock serializing game actions in a channel.
+
+        Args:
+            channel_id (int): Channel ID
+
+        Returns:
+            asyncio.Lock: The channel's lock
+        """
+        return self.session(channel_id).lock
@@ -0,0 +1,146 @@
+"""Staged startup with a dependency graph.
+
+Startup work is split into stages that each declare the stages they
+depend on. Every stage starts as soon as its dependencies have finished,
+so independent work such as opening the database pool and importing
+cogs overlaps instead of running one after another. A stage whose
+dependency failed is skipped, and the time spent in each stage is kept
+for a report.
+"""
+
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from enum import StrEnum
+
+logger = logging.getLogger(__name__)
+
+
+class StageStatus(StrEnum):
+    """Outcome of a startup stage."""
+
+    PENDING = "pending"
+    DONE = "done"
+    FAILED = "failed"
+    SKIPPED = "skipped"
+
+
+@dataclass(kw_only=True)
+class Stage:
+    """A step of the startup sequence.
+
+    Attributes:
+        name (str): Name used in dependencies and the report
+        run (Callable[[], Awaitable[None]]): Performs the work
+        after (tuple[str, ...]): Names of the stages that must finish
+            before this one starts
+        status (StageStatus): Outcome of the stage
+        started (float): Seconds after startup began that the stage
+            started
+        finished (float): Seconds after startup began that the stage
+            finished
+    """
+
+    name: str
+    run: Callable[[], Awaitable[None]]
+    after: tuple[str, ...] = ()
+    status: StageStatus = StageStatus.PENDING
+    started: float = 0.0
+    finished: float = 0.0
+
+
+class Startup:
+    """Runs stages concurrently, each after its dependencies."""
+
+    def __init__(self, name: str, stages: list[Stage]) -> None:
+        """Initialize startup.
+
+        Raises:
+            ValueError: A stage depends on an unknown stage, or the
+                dependencies form a cycle
+        """
+        self.name = name
+        self.stages = {stage.name: stage for stage in stages}
+        self.order = self.sort()
+        self.started = False
+        self.duration = 0.0
+
+    def sort(self) -> list[Stage]:
+        """Order the stages so that each follows its dependencies."""
+        order: list[Stage] = []
+        visiting: set[str] = set()
+        visited: set[str] = set()
+
+        def visit(stage: Stage) -> None:
+            if stage.name in visited:
+                return
+            if stage.name in visiting:
+                msg = f"Startup stages depend on each other: {stage.name}"
+                raise ValueError(msg)
+            visiting.add(stage.name)
+            for name in stage.after:
+                if name not in self.stages:
+                    msg = f"Stage {stage.name} depends on unknown stage {name}"
+                    raise ValueError(msg)
+                visit(self.stages[name])
+            visiting.remove(stage.name)
+            visited.add(stage.name)
+            order.append(stage)
+
+        for stage in self.stages.values():
+            visit(stage)
+        return order
+
+    async def run(self) -> bool:
+        """Run all stages.
+
+        Returns:
+            bool: Whether every stage succeeded
+        """
+        self.started = True
+        start = time.perf_counter()
+        tasks: dict[str, asyncio.Task[bool]] = {}
+
+        async def run_stage(stage: Stage) -> bool:
+            dependencies = await asyncio.gather(*(tasks[name] for name in stage.after))
+            if not all(dependencies):
+                stage.status = StageStatus.SKIPPED
+                logger.warning(f"Skipping startup stage {stage.name}")
+                return False
+
+            stage.started = time.perf_counter() - start
+            try:
+                await stage.run()
+            except Exception:
+                stage.status = StageStatus.FAILED
+                logger.exception(f"Startup stage {stage.name} failed")
+            else:
+                stage.status = StageStatus.DONE
+            stage.finished = time.perf_counter() - start
+            logger.debug(
+                f"Startup stage {stage.name} {stage.status} "
+                f"in {stage.finished - stage.started:.2f}s",
+            )
+            return stage.status == StageStatus.DONE
+
+        for stage in self.order:
+            tasks[stage.name] = asyncio.create_task(run_stage(stage))
+        results = await asyncio.gather(*tasks.values())
+        self.duration = time.perf_counter() - start
+        return all(results)
+
+    def report(self) -> str:
+        """Summarize when each stage ran and how long it took."""
+        lines = [f"**{self.name}** took {self.duration:.2f}s"]
+        for stage in self.order:
+            if stage.status == StageStatus.SKIPPED:
+                lines.append(f"`{stage.name}` skipped")
+                continue
+            lines.append(
+                f"`{stage.name}` {stage.status}: "
+                f"{stage.started:.2f}s → {stage.finished:.2f}s "
+                f"({stage.finished - stage.started:.2f}s)",
+            )
+        return "\n".join(lines)
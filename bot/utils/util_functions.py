@@ -1,6 +1,7 @@
 """Miscellaneous support functions used throughout the project."""
 
 import asyncio
+import functools
 import io
 import json
 import logging
@@ -8,7 +9,7 @@ import random
 import re
 from collections.abc import Callable, Sequence
 from datetime import datetime, time, timedelta
-from typing import Literal
+from typing import TYPE_CHECKING, Any, Literal
 
 import nextcord
 import requests
@@ -28,32 +29,45 @@ from nextcord.ext.commands import Cog
 from nextcord.ext.tasks import LF, Loop
 from nextcord.ui import View
 from nextcord.utils import MISSING
-from PIL import Image, ImageDraw, ImageFont
 
 from domain import (
     BOT_TZ,
     EMPTY_STRING,
     URL,
+    ChannelName,
     Color,
     RoleName,
     Standby,
     ValidTextChannel,
 )
+from utils import metrics
+from utils.guild_config import guild_config
+from utils.leader import leader
+from utils.resolver import resolver
+
+if TYPE_CHECKING:
+    from PIL import ImageFont
 
 logger = logging.getLogger(__name__)
 standby = Standby()
 
 
-def get_emoji(name: str) -> Emoji | None:
-    """Wrapper for the built-in get function."""
-    return nextcord.utils.get(standby.guild.emojis, name=name)
+def get_emoji(name: str, guild: Guild | None = None) -> Emoji | None:
+    """Wrapper for the built-in get function.
 
+    Looks in the home guild unless another guild is given.
+    """
+    return nextcord.utils.get((guild or standby.guild).emojis, name=name)
 
-def get_role(name: str) -> Role | None:
-    """Wrapper for the built-in get function."""
+
+def get_role(name: str, guild: Guild | None = None) -> Role | None:
+    """Wrapper for the built-in get function.
+
+    Looks in the home guild unless another guild is given.
+    """
     return nextcord.utils.find(
         lambda r: r.name.lower() == name.lower(),
-        standby.guild.roles,
+        (guild or standby.guild).roles,
     )
 
 
@@ -64,26 +78,31 @@ def get_category(guild: Guild, name: str) -> CategoryChannel | None:
 
 def mention_role(name: str) -> str:
     """Get a mention string for a role."""
-    role = get_role(standby.guild, name)
+    role = get_role(name)
     if role:
         return role.mention
     return "@" + name
 
 
-def get_channel(name: str) -> ValidTextChannel:
-    """Find a channel matching a name or mention string."""
-    match = re.search(r"(\d+)", name)
-    if match:
+def get_channel(name: str, guild: Guild | None = None) -> ValidTextChannel:
+    """Find a channel matching a name or mention string.
+
+    Looks in the home guild unless another guild is given. Special
+    channels given as a ChannelName are looked up under the name the
+    guild has configured for them.
+    """
+    guild = guild or standby.guild
+    if isinstance(name, ChannelName):
+        name = guild_config.get_channel_name(guild.id, name)
+    elif match := re.search(r"(\d+)", name):
         return nextcord.utils.get(
-            standby.guild.text_channels
-            + standby.guild.threads
-            + standby.guild.voice_channels,
+            guild.text_channels + guild.threads + guild.voice_channels,
             id=int(match.group(1)),
         )
     name = name.replace("#", "")
-    channel = nextcord.utils.get(standby.guild.text_channels, name=name)
+    channel = nextcord.utils.get(guild.text_channels, name=name)
     return channel or nextcord.utils.get(
-        standby.guild.threads + standby.guild.voice_channels,
+        guild.threads + guild.voice_channels,
         name=name,
     )
 
@@ -191,33 +210,37 @@ async def get_mentioned_users(text: str) -> list[Member]:
 
     Args:
         text (str): Text to scan
-        guild (Guild): Guild to scan for users.
 
     Returns:
-        list[Member]: List of mentioned users
+        list[Member]: List of mentioned users still in the server
     """
     ids = get_mentioned_ids(text)
-    return [await standby.guild.fetch_member(id_) for id_ in ids]
+    members = await resolver.members(ids)
+    return [members[id_] for id_ in ids if id_ in members]
 
 
-def get_roles_by_type(type_: str) -> list[Role]:
+def get_roles_by_type(type_: str, guild: Guild | None = None) -> list[Role]:
     """Get all roles of.
 
+    Looks in the home guild unless another guild is given.
+
     Args:
         type_ (str): _description_
+        guild (Guild | None): Guild to look in
 
     Returns:
         list[Role]: _description_
     """
+    guild = guild or standby.guild
     try:
         start, stop = [
             i
-            for i in range(len(standby.guild.roles))
-            if standby.guild.roles[i].name.lower() == type_.lower()
+            for i in range(len(guild.roles))
+            if guild.roles[i].name.lower() == type_.lower()
         ][0:2]
     except ValueError:
         return []
-    roles = standby.guild.roles[start + 1 : stop]
+    roles = guild.roles[start + 1 : stop]
     roles.sort(key=lambda role: role.name)
     return roles
 
@@ -265,6 +288,8 @@ def simpsons_error_image(
     Returns:
         File: Discord File object containing the image
     """
+    from PIL import Image, ImageDraw, ImageFont  # noqa: PLC0415
+
     dad_url = dad.display_avatar.url
     son_url = son.display_avatar.url
 
@@ -338,7 +363,7 @@ def simpsons_error_image(
     return File(obj, filename=filename)
 
 
-def get_text_dimensions(text: str, font: ImageFont.FreeTypeFont) -> tuple[int, int]:
+def get_text_dimensions(text: str, font: "ImageFont.FreeTypeFont") -> tuple[int, int]:
     """Get dimensions for the text in the provided font.
 
     Args:
@@ -487,17 +512,32 @@ def delayed_loop(
     count: int | None = None,
     reconnect: bool = True,
     loop: asyncio.AbstractEventLoop = MISSING,
+    leader_only: bool = True,
 ) -> Callable[[LF], Loop[LF]]:
     """Delayed version of the nextcord.ext.tasks.loop decorator.
 
     Nextcord loops start running before all bot functionality has been
     initialized, leading to unexpected behavior. This wrapper delays the
-    beginning of the loops until the bot is ready.
+    beginning of the loops until the bot is ready. The duration of each
+    iteration is recorded in the loop tick metric.
+
+    When several replicas of the bot run, loops with side effects must
+    only run in one of them. Unless leader_only is False, a loop waits
+    until this replica is elected leader before it starts, and skips
+    its iterations while another replica holds leadership. Loops that
+    only maintain state local to the process should pass False.
     """
 
     def decorator(func: LF) -> Loop[LF]:
+        @functools.wraps(func)
+        async def timed(*args: Any, **kwargs: Any) -> Any:  # noqa: ANN401
+            if leader_only and not leader.is_leader:
+                return None
+            with metrics.LOOP_TICK_DURATION.time(func.__qualname__):
+                return await func(*args, **kwargs)
+
         inner_loop = Loop[LF](
-            func,
+            timed,
             seconds=seconds,
             minutes=minutes,
             hours=hours,
@@ -510,6 +550,8 @@ def delayed_loop(
         @inner_loop.before_loop
         async def impr(self: Cog) -> None:
             await self.standby.bot.wait_until_ready()
+            if leader_only:
+                await leader.elected.wait()
 
         return inner_loop
 
@@ -564,41 +606,54 @@ class PersistentView(View):
         """
         self.message_id = message.id
         self.channel_id = message.channel.id
-        params_string = json.dumps(self.params).replace("'", "''")
+        self.guild_id = message.guild.id
 
-        await standby.pg_pool.execute(f"""
+        await standby.pg_pool.execute(
+            f"""
             INSERT INTO
-                {standby.schema}.view (module, class, channel_id, message_id, params)
+                {standby.schema}.view (
+                    module,
+                    class,
+                    guild_id,
+                    channel_id,
+                    message_id,
+                    params
+                )
             VALUES
                 (
                     '{self.__class__.__module__}',
                     '{self.__class__.__name__}',
+                    {self.guild_id},
                     {self.channel_id},
                     {self.message_id},
-                    '{params_string}'
+                    $1
                 )
             ON CONFLICT ON CONSTRAINT view_pkey DO UPDATE
             SET
                 module = '{self.__class__.__module__}',
                 class = '{self.__class__.__name__}',
-                params = '{params_string}'
-            """)
+                params = $1
+            """,
+            self.params,
+        )
 
     async def delete_record(self) -> None:
         """Delete view record from DB."""
-        await delete_view_record(self.message_id)
+        await delete_view_record(self.message_id, self.guild_id)
 
 
-async def delete_view_record(message_id: int) -> None:
+async def delete_view_record(message_id: int, guild_id: int) -> None:
     """Delete a recorded view from the database.
 
     Args:
         message_id (int): ID of the message containing the view.
+        guild_id (int): ID of the guild the message was sent in.
     """
     await standby.pg_pool.execute(f"""
         DELETE FROM {standby.schema}.view
         WHERE
-            message_id = {message_id}
+            guild_id = {guild_id}
+            AND message_id = {message_id}
         """)
 
 
@@ -612,10 +667,10 @@ async def clean_view_table() -> None:
             message = await channel.fetch_message(record["message_id"])
             if len(message.components) == 0:
                 logger.debug("No components in message - deleting record")
-                await delete_view_record(record["message_id"])
+                await delete_view_record(record["message_id"], record["guild_id"])
         except NotFound:
             logger.debug("Channel or message not found - deleting record")
-            await delete_view_record(record["message_id"])
+            await delete_view_record(record["message_id"], record["guild_id"])
 
 
 def get_trivia_question() -> dict[str, str | list[str]]:
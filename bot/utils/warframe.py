@@ -1,11 +1,70 @@
 """Fetch warframe mod data."""
 
-import requests
+import asyncio
+import logging
+import time
+
+import aiohttp
 
 from domain import URL
 
-mod_list = {}
+logger = logging.getLogger(__name__)
+
+RETRY_COOLDOWN = 300.0
+
+
+class ModList:
+    """Mod thumbnails by lowercase mod name.
+
+    The mod data is a sizeable download, so it is only fetched the first
+    time it's needed rather than when the module is imported. A failed
+    download is not retried for RETRY_COOLDOWN seconds.
+    """
+
+    def __init__(self) -> None:
+        """Initialize mod list."""
+        self.thumbnails: dict[str, str] | None = None
+        self.retry_at = 0.0
+        self.lock = asyncio.Lock()
+
+    async def get(self) -> dict[str, str]:
+        """Get the thumbnails, downloading them if needed.
+
+        Returns:
+            dict[str, str]: Thumbnail URLs by lowercase mod name, empty
+                if the download failed recently
+        """
+        async with self.lock:
+            if self.thumbnails is None:
+                if time.monotonic() < self.retry_at:
+                    return {}
+                try:
+                    self.thumbnails = await fetch_thumbnails()
+                # ValueError covers error pages that are not JSON, and
+                # KeyError and TypeError JSON of an unexpected shape
+                except (
+                    aiohttp.ClientError,
+                    TimeoutError,
+                    ValueError,
+                    KeyError,
+                    TypeError,
+                ):
+                    logger.exception("Could not fetch Warframe mods")
+                    self.retry_at = time.monotonic() + RETRY_COOLDOWN
+                    return {}
+        return self.thumbnails
+
+
+async def fetch_thumbnails() -> dict[str, str]:
+    """Download the thumbnail URLs of all mods."""
+    async with aiohttp.ClientSession() as cs, cs.get(URL.WARFRAME_MODS) as r:
+        r.raise_for_status()
+        mods = await r.json(content_type=None)
+    return {
+        mod["name"].lower(): mod["wikiaThumbnail"]
+        for mod in mods
+        if "wikiaThumbnail" in mod
+    }
+
 
-for mod in requests.get(url=URL.WARFRAME_MODS).json():
-    if "wikiaThumbnail" in mod:
-        mod_list[mod["name"].lower()] = mod["wikiaThumbnail"]
+mod_list = ModList()
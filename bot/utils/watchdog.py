@@ -0,0 +1,130 @@
+"""Event loop lag monitoring.
+
+A heartbeat task on the event loop records how late it wakes up. A
+separate thread watches the heartbeat, and when it stops beating for
+longer than the threshold, captures the stack of whatever is blocking
+the loop. Once the loop recovers, the stall is logged and reported to
+the maintenance channel, at most once per cooldown period.
+"""
+
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from dataclasses import dataclass
+from datetime import timedelta
+
+from domain import ID, Standby
+from utils import metrics
+
+logger = logging.getLogger(__name__)
+standby = Standby()
+
+HEARTBEAT_INTERVAL = 0.25
+LAG_THRESHOLD = float(os.getenv("LOOP_LAG_THRESHOLD", default="0.5"))
+ASYNCIO_DEBUG = bool(os.getenv("ASYNCIO_DEBUG"))
+REPORT_COOLDOWN = timedelta(minutes=10)
+MAX_STACK_LENGTH = 1800
+
+
+@dataclass(kw_only=True)
+class Stall:
+    """Stack captured while the event loop was blocked."""
+
+    stack: str
+    lag: float = 0.0
+
+
+class LoopWatchdog:
+    """Detects and reports event loop stalls."""
+
+    def __init__(self, threshold: float = LAG_THRESHOLD) -> None:
+        """Initialize watchdog."""
+        self.threshold = threshold
+        self.last_beat = time.monotonic()
+        self.loop_thread_id: int | None = None
+        self.captured = False
+        self.stalls: list[Stall] = []
+        self.last_report: float | None = None
+        self.suppressed = 0
+        self.stopped = threading.Event()
+        self.heartbeat_task: asyncio.Task | None = None
+        self.report_task: asyncio.Task | None = None
+
+    def start(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Start monitoring a loop.
+
+        Also applies the threshold to asyncio's own slow callback
+        reporting, which logs any callback running for longer than it
+        when the ASYNCIO_DEBUG environment variable is set.
+
+        Args:
+            loop (asyncio.AbstractEventLoop): Loop to monitor
+        """
+        loop.slow_callback_duration = self.threshold
+        if ASYNCIO_DEBUG:
+            loop.set_debug(enabled=True)
+        self.heartbeat_task = loop.create_task(self.heartbeat())
+        threading.Thread(target=self.watch, name="loop-watchdog", daemon=True).start()
+        logger.info(f"Watching event loop with a {self.threshold}s lag threshold")
+
+    async def heartbeat(self) -> None:
+        """Measure how late the loop wakes up from a short sleep."""
+        self.loop_thread_id = threading.get_ident()
+        while True:
+            self.last_beat = time.monotonic()
+            await asyncio.sleep(HEARTBEAT_INTERVAL)
+            lag = max(time.monotonic() - self.last_beat - HEARTBEAT_INTERVAL, 0)
+            metrics.LOOP_LAG.observe(value=lag)
+            if self.stalls:
+                self.stalls[-1].lag = max(self.stalls[-1].lag, lag)
+                self.report()
+            self.captured = False
+
+    def watch(self) -> None:
+        """Capture the loop thread's stack when the heartbeat stalls.
+
+        Runs in its own thread, so it keeps running while the loop is
+        blocked. Only one stack is captured per stall.
+        """
+        while not self.stopped.wait(HEARTBEAT_INTERVAL):
+            overdue = time.monotonic() - self.last_beat - HEARTBEAT_INTERVAL
+            if overdue < self.threshold or self.captured or not self.loop_thread_id:
+                continue
+            frame = sys._current_frames().get(self.loop_thread_id)  # noqa: SLF001
+            if frame is None:
+                continue
+            self.captured = True
+            self.stalls.append(Stall(stack="".join(traceback.format_stack(frame))))
+
+    def report(self) -> None:
+        """Log captured stalls and send a rate limited report."""
+        stalls, self.stalls = self.stalls, []
+        for stall in stalls:
+            logger.warning(
+                f"Event loop blocked for {stall.lag:.2f}s at:\n{stall.stack}",
+            )
+
+        now = time.monotonic()
+        if (
+            self.last_report is not None
+            and now - self.last_report < REPORT_COOLDOWN.total_seconds()
+        ):
+            self.suppressed += len(stalls)
+            return
+        self.last_report = now
+
+        channel = standby.bot.get_channel(ID.ERROR_CHANNEL)
+        if channel is None:
+            return
+        worst = max(stalls, key=lambda stall: stall.lag)
+        text = (
+            f"Event loop blocked for {worst.lag:.2f}s "
+            f"({len(stalls) + self.suppressed - 1} other stalls since the last "
+            f"report). Blocking call:\n```py\n{worst.stack[-MAX_STACK_LENGTH:]}```"
+        )
+        self.suppressed = 0
+        self.report_task = asyncio.create_task(channel.send(text))